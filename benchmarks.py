@@ -0,0 +1,415 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Module
+
+This module generates synthetic content files and times the game_data
+loaders on them, along with the block parsers (against the if/elif
+parsers they replaced) and the text and binary character save formats.
+With memory measurement on, it also reports how much memory the loaded
+catalogs hold as dictionaries and as compact records.
+Results are printed (or written) as JSON so runs from different releases
+can be compared.
+
+Usage:
+    python benchmarks.py --quests 100000 --items 50000 --chain-depth 20
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+
+import game_data
+import quest_handler
+import character_manager
+from custom_exceptions import InvalidDataFormatError
+
+# Share of each item type in generated item files
+ITEM_TYPE_MIX = (("weapon", 0.30), ("armor", 0.25), ("consumable", 0.45))
+
+ITEM_STATS = {
+    "weapon": ("strength", "magic"),
+    "armor": ("max_health",),
+    "consumable": ("health",)
+}
+
+# ============================================================================
+# CONTENT GENERATORS
+# ============================================================================
+
+def generate_quests_file(filename, count, chain_depth=5, seed=0):
+    """
+    Write a synthetic quests file
+
+    Quests are laid out in prerequisite chains of chain_depth quests: the
+    first quest of each chain has no prerequisite and every later one
+    requires the quest before it. Required level rises along each chain.
+
+    Returns: Number of quests written
+    """
+    rng = random.Random(seed)
+    chain_depth = max(1, int(chain_depth))
+
+    with open(filename, "w", encoding="utf-8") as f:
+        for i in range(count):
+            position = i % chain_depth
+            prereq = "NONE" if position == 0 else f"quest_{i - 1}"
+            f.write(
+                f"QUEST_ID: quest_{i}\n"
+                f"TITLE: Generated Quest {i}\n"
+                f"DESCRIPTION: Synthetic quest {i}, step {position + 1} of its chain.\n"
+                f"REWARD_XP: {rng.randint(10, 500)}\n"
+                f"REWARD_GOLD: {rng.randint(5, 300)}\n"
+                f"REQUIRED_LEVEL: {1 + position}\n"
+                f"PREREQUISITE: {prereq}\n\n"
+            )
+
+    return count
+
+def generate_items_file(filename, count, seed=0):
+    """
+    Write a synthetic items file using the ITEM_TYPE_MIX proportions
+
+    Returns: Number of items written
+    """
+    rng = random.Random(seed)
+    types = [t for t, _ in ITEM_TYPE_MIX]
+    weights = [w for _, w in ITEM_TYPE_MIX]
+
+    with open(filename, "w", encoding="utf-8") as f:
+        for i in range(count):
+            item_type = rng.choices(types, weights)[0]
+            stat = rng.choice(ITEM_STATS[item_type])
+            f.write(
+                f"ITEM_ID: item_{i}\n"
+                f"NAME: Generated {item_type.capitalize()} {i}\n"
+                f"TYPE: {item_type}\n"
+                f"EFFECT: {stat}:{rng.randint(1, 50)}\n"
+                f"COST: {rng.randint(5, 1000)}\n"
+                f"DESCRIPTION: Synthetic {item_type} number {i}.\n\n"
+            )
+
+    return count
+
+def generate_characters(count, quest_count, item_count, seed=0):
+    """
+    Build synthetic characters with inventories and quest logs
+
+    Returns: List of character dictionaries
+    """
+    rng = random.Random(seed)
+    classes = ("Warrior", "Mage", "Rogue", "Cleric")
+    characters = []
+
+    for i in range(count):
+        character = character_manager.create_character(f"hero_{i}", rng.choice(classes))
+        character["level"] = rng.randint(1, 50)
+        character["experience"] = rng.randint(0, 100000)
+        character["gold"] = rng.randint(0, 100000)
+        character["inventory"] = [f"item_{rng.randrange(max(1, item_count))}"
+                                  for _ in range(rng.randint(0, 30))]
+        quests = rng.sample(range(max(1, quest_count)), min(quest_count, rng.randint(0, 40)))
+        character["completed_quests"].extend(f"quest_{q}" for q in quests[3:])
+        character["active_quests"].extend(f"quest_{q}" for q in quests[:3])
+        characters.append(character)
+
+    return characters
+
+def read_blocks(filename):
+    """
+    Split a data file into blocks of stripped, non-blank lines
+
+    Returns: List of line lists, ready for the block parsers
+    """
+    with open(filename, "r", encoding="utf-8") as f:
+        blocks = f.read().split("\n\n")
+    return [lines for lines in ([line.strip() for line in block.split("\n") if line.strip()]
+                                for block in blocks) if lines]
+
+# ============================================================================
+# REFERENCE PARSERS
+# ============================================================================
+
+# The if/elif block parsers game_data used before the table-driven ones,
+# kept so the benchmarks can compare the two on the same blocks
+
+def reference_parse_quest_block(lines):
+    """Previous game_data.parse_quest_block"""
+    quest = {}
+
+    try:
+        for line in lines:
+            if ": " not in line:
+                raise InvalidDataFormatError("Quest line missing ':' separator")
+
+            key, value = line.split(": ", 1)
+            key = key.strip()
+            value = value.strip()
+
+            if key == "QUEST_ID":
+                quest["quest_id"] = value
+            elif key == "TITLE":
+                quest["title"] = value
+            elif key == "DESCRIPTION":
+                quest["description"] = value
+            elif key == "REWARD_XP":
+                quest["reward_xp"] = int(value)
+            elif key == "REWARD_GOLD":
+                quest["reward_gold"] = int(value)
+            elif key == "REQUIRED_LEVEL":
+                quest["required_level"] = int(value)
+            elif key == "PREREQUISITE":
+                quest["prerequisite"] = value
+            else:
+                raise InvalidDataFormatError(f"Unknown quest field: {key}")
+
+    except ValueError:
+        raise InvalidDataFormatError("Invalid number in quest block")
+
+    return quest
+
+def reference_parse_item_block(lines):
+    """Previous game_data.parse_item_block"""
+    item = {}
+
+    try:
+        for line in lines:
+            if ": " not in line:
+                raise InvalidDataFormatError("Item line missing ':' separator")
+
+            key, value = line.split(": ", 1)
+            key = key.strip()
+            value = value.strip()
+
+            if key == "ITEM_ID":
+                item["item_id"] = value
+            elif key == "NAME":
+                item["name"] = value
+            elif key == "TYPE":
+                item["type"] = value
+            elif key == "EFFECT":
+                if ":" not in value:
+                    raise InvalidDataFormatError("Invalid item effect format")
+                stat, amount = value.split(":", 1)
+                item["effect"] = {stat: int(amount)}
+            elif key == "COST":
+                item["cost"] = int(value)
+            elif key == "DESCRIPTION":
+                item["description"] = value
+            else:
+                raise InvalidDataFormatError(f"Unknown item field: {key}")
+
+    except ValueError:
+        raise InvalidDataFormatError("Invalid number in item block")
+
+    return item
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(func, repeat=3, measure_memory=True):
+    """
+    Time a call and optionally record its peak memory
+
+    Timing runs are made without tracemalloc (it slows Python down a lot);
+    peak memory comes from one extra traced run.
+
+    Returns: Dictionary with 'best_seconds', 'mean_seconds' and, if
+             measured, 'peak_bytes'
+    """
+    times = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    result = {
+        "best_seconds": round(min(times), 6),
+        "mean_seconds": round(sum(times) / len(times), 6)
+    }
+
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_bytes"] = peak
+
+    return result
+
+def retained_bytes(func):
+    """
+    Measure the memory held by what func returns
+
+    Returns: Bytes allocated during the call that are still alive while
+             its result is (the size of a loaded catalog, not the peak)
+    """
+    tracemalloc.start()
+    try:
+        result = func()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current
+
+def run_benchmarks(quest_count=10000, item_count=10000, chain_depth=5,
+                   repeat=3, measure_memory=True, workdir=None, character_count=1000):
+    """
+    Generate content and time the game_data loaders on it, the block
+    parsers against the reference parsers, then serialising and parsing
+    character_count saves in each save format
+
+    Returns: Dictionary ready to be written as JSON
+    """
+    own_dir = workdir is None
+    if own_dir:
+        workdir = tempfile.mkdtemp(prefix="quest_bench_")
+
+    quest_file = os.path.join(workdir, "quests.txt")
+    item_file = os.path.join(workdir, "items.txt")
+
+    try:
+        generate_quests_file(quest_file, quest_count, chain_depth)
+        generate_items_file(item_file, item_count)
+
+        quests = game_data.load_quests(quest_file, use_cache=False)
+
+        results = {
+            "load_quests": measure(
+                lambda: game_data.load_quests(quest_file, use_cache=False),
+                repeat, measure_memory),
+            "load_items": measure(
+                lambda: game_data.load_items(item_file, use_cache=False),
+                repeat, measure_memory),
+            "validate_quest_prerequisites": measure(
+                lambda: quest_handler.validate_quest_prerequisites(quests),
+                repeat, measure_memory)
+        }
+
+        # Parse only, on blocks already read into memory
+        quest_blocks = read_blocks(quest_file)
+        item_blocks = read_blocks(item_file)
+        results.update({
+            "parse_quest_blocks": measure(
+                lambda: [game_data.parse_quest_block(lines) for lines in quest_blocks],
+                repeat, measure_memory),
+            "parse_quest_blocks_reference": measure(
+                lambda: [reference_parse_quest_block(lines) for lines in quest_blocks],
+                repeat, measure_memory),
+            "parse_item_blocks": measure(
+                lambda: [game_data.parse_item_block(lines) for lines in item_blocks],
+                repeat, measure_memory),
+            "parse_item_blocks_reference": measure(
+                lambda: [reference_parse_item_block(lines) for lines in item_blocks],
+                repeat, measure_memory)
+        })
+        del quest_blocks, item_blocks
+
+        # Prime the compiled cache, then time the warm path
+        game_data.load_quests(quest_file)
+        game_data.load_items(item_file)
+        results["load_quests_cached"] = measure(
+            lambda: game_data.load_quests(quest_file), repeat, measure_memory)
+        results["load_items_cached"] = measure(
+            lambda: game_data.load_items(item_file), repeat, measure_memory)
+
+        characters = generate_characters(character_count, quest_count, item_count)
+        text_saves = [character_manager.format_save_data(c).encode("utf-8") for c in characters]
+        binary_saves = [character_manager.encode_binary_save(c) for c in characters]
+        results.update({
+            "save_text_serialize": measure(
+                lambda: [character_manager.format_save_data(c).encode("utf-8")
+                         for c in characters],
+                repeat, measure_memory),
+            "save_binary_serialize": measure(
+                lambda: [character_manager.encode_binary_save(c) for c in characters],
+                repeat, measure_memory),
+            "save_text_parse": measure(
+                lambda: [character_manager.parse_save_data(data) for data in text_saves],
+                repeat, measure_memory),
+            "save_binary_parse": measure(
+                lambda: [character_manager.parse_save_data(data) for data in binary_saves],
+                repeat, measure_memory)
+        })
+
+        # Catalog size as plain dictionaries vs QuestRecord/ItemRecord
+        memory = {}
+        if measure_memory:
+            for name, loader, filename in (("quests", game_data.load_quests, quest_file),
+                                           ("items", game_data.load_items, item_file)):
+                for compact in (False, True):
+                    key = f"{name}_{'compact' if compact else 'dict'}_bytes"
+                    memory[key] = retained_bytes(
+                        lambda: loader(filename, use_cache=False, compact=compact))
+
+        sizes = {
+            "quest_file_bytes": os.path.getsize(quest_file),
+            "item_file_bytes": os.path.getsize(item_file),
+            "text_save_bytes": sum(map(len, text_saves)),
+            "binary_save_bytes": sum(map(len, binary_saves))
+        }
+    finally:
+        if own_dir:
+            for name in os.listdir(workdir):
+                os.remove(os.path.join(workdir, name))
+            os.rmdir(workdir)
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "quests": quest_count,
+            "items": item_count,
+            "chain_depth": chain_depth,
+            "characters": character_count,
+            "repeat": repeat
+        },
+        "files": sizes,
+        "memory": memory,
+        "results": results
+    }
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    """Parse command line options, run the benchmarks and emit JSON"""
+    parser = argparse.ArgumentParser(description="Benchmark game_data loading")
+    parser.add_argument("--quests", type=int, default=10000, help="quests to generate")
+    parser.add_argument("--items", type=int, default=10000, help="items to generate")
+    parser.add_argument("--chain-depth", type=int, default=5,
+                        help="length of each prerequisite chain")
+    parser.add_argument("--characters", type=int, default=1000,
+                        help="characters for the save format benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc peak memory run")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.quests, args.items, args.chain_depth,
+                            args.repeat, not args.no_memory,
+                            character_count=args.characters)
+    text = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
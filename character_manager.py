@@ -8,9 +8,28 @@ AI Usage: This file was completed with assistance from ChatGPT to implement char
 with project requirements and custom exception usage.
 
 This module handles character creation, loading, and saving.
+
+Save files are always named {name}_save.txt, whether they hold the text
+format (see save_character) or the binary format (see encode_binary_save).
+The extension does not mean text: load_character, the manifest and the
+save tools tell the formats apart by the first four bytes, BINARY_MAGIC,
+which no text save starts with (text saves start with "NAME: "). One name
+per character means switching formats replaces the save rather than
+leaving a second file behind. The binary format is smaller and quicker to
+parse; writing it is slower than writing text.
 """
 
 import os
+import sys
+import json
+import time
+import zlib
+import struct
+import operator
+import itertools
+from array import array
+from collections import Counter
+from math import isqrt
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -19,6 +38,110 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+try:
+    import fcntl
+except ImportError:
+    # Windows: manifest rewrites fall back to an unlocked size check
+    fcntl = None
+
+# ============================================================================
+# QUEST LOG
+# ============================================================================
+
+class QuestLog:
+    """
+    Ordered set of quest ids used for active_quests and completed_quests
+
+    Behaves like the list it replaces (append, remove, in, len, iteration,
+    indexing, == against a list, ",".join) but membership tests and removal
+    are O(1). Ids keep the order they were added in, so saves and quest
+    lists print the same as before. Adding an id that is already present
+    does nothing.
+
+    version goes up by one on every call that may change the log, so
+    caches such as quest_catalog.QuestTracker can tell whether the log was
+    edited since they last looked.
+    """
+
+    __slots__ = ("_ids", "_version")
+
+    def __init__(self, quest_ids=()):
+        self._ids = dict.fromkeys(quest_ids)
+        self._version = 0
+
+    @property
+    def version(self):
+        """Number of mutating calls made on this log"""
+        return self._version
+
+    def append(self, quest_id):
+        """Add quest_id at the end (no-op if already present)"""
+        self._version += 1
+        self._ids[quest_id] = None
+
+    def extend(self, quest_ids):
+        """Add each of quest_ids in order"""
+        self._version += 1
+        for quest_id in quest_ids:
+            self._ids[quest_id] = None
+
+    def remove(self, quest_id):
+        """Remove quest_id; raises ValueError if missing, like list.remove"""
+        self._version += 1
+        try:
+            del self._ids[quest_id]
+        except KeyError:
+            raise ValueError(f"{quest_id!r} not in quest log") from None
+
+    def discard(self, quest_id):
+        """Remove quest_id if present"""
+        self._version += 1
+        self._ids.pop(quest_id, None)
+
+    def clear(self):
+        self._version += 1
+        self._ids.clear()
+
+    def copy(self):
+        return QuestLog(self._ids)
+
+    def index(self, quest_id):
+        for position, current in enumerate(self._ids):
+            if current == quest_id:
+                return position
+        raise ValueError(f"{quest_id!r} not in quest log")
+
+    def count(self, quest_id):
+        return 1 if quest_id in self._ids else 0
+
+    def __contains__(self, quest_id):
+        return quest_id in self._ids
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __reversed__(self):
+        return reversed(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, position):
+        # The last id is the common case (most recent quest), so skip the copy
+        if position == -1 and self._ids:
+            return next(reversed(self._ids))
+        return list(self._ids)[position]
+
+    def __eq__(self, other):
+        if isinstance(other, QuestLog):
+            return list(self._ids) == list(other._ids)
+        if isinstance(other, (list, tuple)):
+            return list(self._ids) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"QuestLog({list(self._ids)!r})"
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -74,18 +197,24 @@ def create_character(name, character_class):
         "experience": 0,
         "gold": 100,
         "inventory": [],
-        "active_quests": [],
-        "completed_quests": []
+        "active_quests": QuestLog(),
+        "completed_quests": QuestLog()
     }
 
     return character
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", fsync=True, backend=None,
+                   binary=False):
     """
     Save character to file
     
     Filename format: {character_name}_save.txt
     
+    The save is built in memory, written to a temp file in the same
+    directory with one write, flushed to disk (unless fsync is False) and
+    renamed over the old save, so a crash leaves either the old save or
+    the new one, never a truncated file.
+    
     File format:
     NAME: character_name
     CLASS: class_name
@@ -100,8 +229,15 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
+    With binary=True the same fields are written in the compact binary
+    format instead (see encode_binary_save); load_character detects either.
+    
+    If backend is given (see save_storage), the save goes there instead
+    and save_directory / fsync / binary are ignored.
+    
     Returns: True if successful
-    Raises: PermissionError, IOError (let them propagate or handle)
+    Raises: PermissionError, IOError (let them propagate or handle),
+            InvalidSaveDataError if a binary save cannot hold the values
     """
     # TODO: Implement save functionality
     # Create save_directory if it doesn't exist
@@ -109,47 +245,118 @@ def save_character(character, save_directory="data/save_games"):
     # Lists should be saved as comma-separated values
     
 
-    if not os.path.exists(save_directory):
-        try:
-            os.makedirs(save_directory)
-        except Exception as e:
-            # Let permission errors or other I/O errors surface to caller
-            raise
+    if backend is not None:
+        return backend.save(character)
 
-    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    # Let IO/Permission errors propagate as documented
+    data = encode_binary_save(character) if binary else format_save_data(character)
+    write_save_data(character["name"], data, save_directory, fsync)
 
-    # Prepare comma-separated strings for lists
-    inv_str = ",".join(character.get("inventory", []))
-    active_str = ",".join(character.get("active_quests", []))
-    comp_str = ",".join(character.get("completed_quests", []))
+    return True
 
-    try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"NAME: {character['name']}\n")
-            f.write(f"CLASS: {character['class']}\n")
-            f.write(f"LEVEL: {int(character['level'])}\n")
-            f.write(f"HEALTH: {int(character['health'])}\n")
-            f.write(f"MAX_HEALTH: {int(character['max_health'])}\n")
-            f.write(f"STRENGTH: {int(character['strength'])}\n")
-            f.write(f"MAGIC: {int(character['magic'])}\n")
-            f.write(f"EXPERIENCE: {int(character['experience'])}\n")
-            f.write(f"GOLD: {int(character['gold'])}\n")
-            f.write(f"INVENTORY: {inv_str}\n")
-            f.write(f"ACTIVE_QUESTS: {active_str}\n")
-            f.write(f"COMPLETED_QUESTS: {comp_str}\n")
-    except Exception:
-        # Let IO/Permission errors propagate as documented
-        raise
+def write_save_data(character_name, text, save_directory="data/save_games", fsync=True):
+    """
+    Atomically write save text built by format_save_data (or bytes from
+    encode_binary_save)
+    
+    Same temp file / fsync / rename steps as save_character, for callers
+    that snapshot the text first (see save_scheduler).
+    
+    Returns: Number of bytes written
+    Raises: PermissionError, IOError
+    """
+    os.makedirs(save_directory, exist_ok=True)
 
-    return True
+    filename = os.path.join(save_directory, f"{character_name}_save.txt")
+    size = _write_atomic(filename, text, fsync)
+    _forget_journal(filename)
+    _manifest_saved(save_directory, character_name, *_save_summary(text), size)
+    if fsync:
+        _fsync_directory(save_directory)
+
+    return size
+
+def save_characters(characters, save_directory="data/save_games", fsync=True, backend=None,
+                    binary=False):
+    """
+    Save several characters with one group fsync
+
+    Every save is written to its temp file first, then all temp files are
+    flushed to disk, then each is renamed into place and the directory is
+    flushed once. Each save file is still replaced atomically; if a write
+    fails, saves already renamed stay in place and the rest are untouched.
+
+    With a backend, the characters are handed to its save_many instead
+    (one transaction for SQLite).
+
+    Returns: Number of characters saved
+    Raises: PermissionError, IOError (temp files are cleaned up)
+    """
+    if backend is not None:
+        return backend.save_many(characters)
+
+    os.makedirs(save_directory, exist_ok=True)
+
+    pending = []
+    renamed = 0
+    try:
+        for character in characters:
+            filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+            data = (encode_binary_save(character) if binary
+                    else format_save_data(character).encode("utf-8"))
+            pending.append((_write_temp(filename, data, False), filename, character, len(data)))
+
+        if fsync:
+            for temp_name, *_ in pending:
+                _fsync_file(temp_name)
+
+        for temp_name, filename, character, size in pending:
+            os.replace(temp_name, filename)
+            _forget_journal(filename)
+            _manifest_saved(save_directory, character["name"], character["class"],
+                            int(character["level"]), size)
+            renamed += 1
+    finally:
+        for temp_name, *_ in pending[renamed:]:
+            _remove_quietly(temp_name)
+
+    if fsync:
+        _fsync_directory(save_directory)
+
+    return renamed
+
+def format_save_data(character):
+    """
+    Build the text of a save file (see save_character for the format)
 
-def load_character(character_name, save_directory="data/save_games"):
+    Returns: String with one "KEY: value" line per field
+    """
+    # Lists are saved as comma-separated strings
+    return (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {int(character['level'])}\n"
+        f"HEALTH: {int(character['health'])}\n"
+        f"MAX_HEALTH: {int(character['max_health'])}\n"
+        f"STRENGTH: {int(character['strength'])}\n"
+        f"MAGIC: {int(character['magic'])}\n"
+        f"EXPERIENCE: {int(character['experience'])}\n"
+        f"GOLD: {int(character['gold'])}\n"
+        f"INVENTORY: {','.join(character.get('inventory', []))}\n"
+        f"ACTIVE_QUESTS: {','.join(character.get('active_quests', []))}\n"
+        f"COMPLETED_QUESTS: {','.join(character.get('completed_quests', []))}\n"
+    )
+
+def load_character(character_name, save_directory="data/save_games", backend=None):
     """
     Load character from save file
     
     Args:
         character_name: Name of character to load
         save_directory: Directory containing save files
+        backend: Storage backend to load from instead (see save_storage)
+    
+    Text and binary saves are both accepted (see parse_save_data).
     
     Returns: Character dictionary
     Raises: 
@@ -164,24 +371,55 @@ def load_character(character_name, save_directory="data/save_games"):
     # Parse comma-separated lists back into Python lists
     
 
+    if backend is not None:
+        return backend.load(character_name)
+
     filename = os.path.join(save_directory, f"{character_name}_save.txt")
 
     if not os.path.exists(filename):
         raise CharacterNotFoundError(f"No save for: {character_name}")
 
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
+        with open(filename, "rb") as f:
+            raw = f.read()
     except Exception:
         raise SaveFileCorruptedError(f"Could not read save file for: {character_name}")
 
+    # Changes saved by journal_character since the last full save
+    return _replay_journal(parse_save_data(raw, character_name), raw, filename)
+
+def parse_save_data(raw, character_name=""):
+    """
+    Parse the contents of a save file in either format
+
+    Binary saves are recognised by their magic bytes; anything else is
+    read as the text format.
+
+    Args:
+        raw: File contents (bytes) or save text (str)
+        character_name: Used in error messages
+
+    Returns: Validated character dictionary
+    Raises: SaveFileCorruptedError if the text is not valid UTF-8,
+            InvalidSaveDataError if data format is wrong
+    """
+    if isinstance(raw, bytes):
+        if raw.startswith(BINARY_MAGIC):
+            return decode_binary_save(raw)
+        try:
+            raw = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            raise SaveFileCorruptedError(f"Could not read save file for: {character_name}")
+
+    lines = [line.strip() for line in raw.splitlines() if line.strip()]
+
     data = {}
     for line in lines:
         if ": " not in line:
         # For empty lists, allow lines like "INVENTORY:"
             if any(line.startswith(k) for k in ("INVENTORY", "ACTIVE_QUESTS", "COMPLETED_QUESTS")):
-                key = line.strip(":")
-                data[key.lower()] = []
+                key = line.strip(":").lower()
+                data[key] = [] if key == "inventory" else QuestLog()
                 continue
             raise InvalidSaveDataError(f"Malformed line in save file: '{line}'")
         key, value = line.split(": ", 1)
@@ -230,9 +468,9 @@ def load_character(character_name, save_directory="data/save_games"):
             # Empty -> empty list
             data["inventory"] = [x for x in value.split(",") if x] if value else []
         elif key == "ACTIVE_QUESTS":
-            data["active_quests"] = [x for x in value.split(",") if x] if value else []
+            data["active_quests"] = QuestLog(x for x in value.split(",") if x)
         elif key == "COMPLETED_QUESTS":
-            data["completed_quests"] = [x for x in value.split(",") if x] if value else []
+            data["completed_quests"] = QuestLog(x for x in value.split(",") if x)
         else:
             # Unknown keys are treated as format errors to be strict for tests
             raise InvalidSaveDataError(f"Unknown save key: {key}")
@@ -245,17 +483,93 @@ def load_character(character_name, save_directory="data/save_games"):
 
     return data
 
-def list_saved_characters(save_directory="data/save_games"):
+def list_saved_characters(save_directory="data/save_games", backend=None):
     """
     Get list of all saved character names
     
-    Returns: List of character names (without _save.txt extension)
+    Names come from the save directory's manifest (see
+    list_character_summaries), not from listing the directory.
+    
+    Returns: List of character names (without _save.txt extension), or
+             the backend's names if backend is given
     """
     # TODO: Implement this function
     # Return empty list if directory doesn't exist
     # Extract character names from filenames
     
 
+    if backend is not None:
+        return backend.list_names()
+
+    try:
+        return list(_read_manifest(save_directory))
+    except OSError:
+        return _scan_save_names(save_directory)
+
+def list_character_summaries(save_directory="data/save_games", sort_by="name",
+                             reverse=False, offset=0, limit=None, backend=None):
+    """
+    Get name, class, level, last save time and save size of saved characters
+
+    Read from the save directory's manifest, which every save and delete
+    keeps up to date, so neither the directory nor the saves are opened.
+    class and level are None for saves that could not be read when the
+    manifest was rebuilt, and for every save if the manifest can be
+    neither read nor rebuilt (e.g. a read-only directory without one), in
+    which case the directory is listed instead.
+
+    Args:
+        sort_by: "name", "class", "level", "modified" or "size"
+        reverse: Sort in descending order
+        offset, limit: Page of results to return (limit None = all)
+        backend: Storage backend to list instead (see save_storage)
+
+    Returns: List of dictionaries with keys name, class, level, modified
+             (seconds since the epoch) and size (bytes)
+    Raises: ValueError for an unknown sort_by
+    """
+    if sort_by not in ("name", "class", "level", "modified", "size"):
+        raise ValueError(f"Cannot sort characters by: {sort_by}")
+
+    if backend is not None:
+        summaries = backend.list_summaries()
+    else:
+        try:
+            entries = _read_manifest(save_directory)
+        except OSError:
+            entries = _scan_save_entries(save_directory)
+        summaries = [
+            {"name": name, "class": entry[0], "level": entry[1],
+             "modified": entry[2], "size": entry[3]}
+            for name, entry in entries.items()
+        ]
+
+    # Unknown values go last either way
+    known = [summary for summary in summaries if summary[sort_by] is not None]
+    known.sort(key=operator.itemgetter(sort_by), reverse=reverse)
+    summaries = known + [summary for summary in summaries if summary[sort_by] is None]
+
+    end = None if limit is None else offset + limit
+    return summaries[offset:end]
+
+def _scan_save_entries(save_directory):
+    """
+    Manifest-style entries from listing save_directory, without class or
+    level (the saves are not opened)
+
+    Returns: Dictionary of name -> (None, None, modified, size)
+    """
+    entries = {}
+    for name in _scan_save_names(save_directory):
+        try:
+            st = os.stat(os.path.join(save_directory, f"{name}_save.txt"))
+        except OSError:
+            continue
+        entries[name] = (None, None, round(st.st_mtime, 3), st.st_size)
+    return entries
+
+def _scan_save_names(save_directory):
+    """Character names from the save file names in save_directory"""
     if not os.path.exists(save_directory):
         return []
 
@@ -272,17 +586,20 @@ def list_saved_characters(save_directory="data/save_games"):
 
     return files
 
-def delete_character(character_name, save_directory="data/save_games"):
+def delete_character(character_name, save_directory="data/save_games", backend=None):
     """
-    Delete a character's save file
+    Delete a character's save file (and its journal, if any)
     
-    Returns: True if deleted successfully
+    Returns: True if deleted successfully (from backend, if given)
     Raises: CharacterNotFoundError if character doesn't exist
     """
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
     
 
+    if backend is not None:
+        return backend.delete(character_name)
+
     filename = os.path.join(save_directory, f"{character_name}_save.txt")
     if not os.path.exists(filename):
         raise CharacterNotFoundError(f"No save found for: {character_name}")
@@ -292,9 +609,687 @@ def delete_character(character_name, save_directory="data/save_games"):
     except Exception:
         # Propagate unexpected OS errors
         raise
+    _forget_journal(filename)
+    _manifest_append(save_directory, ["D", character_name])
 
     return True
 
+# ============================================================================
+# SAVE FILE HELPERS
+# ============================================================================
+
+_temp_counter = itertools.count()
+
+def _write_atomic(filename, text, fsync=True):
+    """
+    Replace filename with text (str or bytes) via a temp file in the same
+    directory
+
+    Returns: Number of bytes written
+    """
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    temp_name = _write_temp(filename, data, fsync)
+    try:
+        os.replace(temp_name, filename)
+    except BaseException:
+        _remove_quietly(temp_name)
+        raise
+    return len(data)
+
+def _write_temp(filename, data, fsync):
+    """
+    Write bytes to a new temp file next to filename
+
+    Returns: Temp file name (removed again if writing fails)
+    """
+    directory, base = os.path.split(filename)
+    temp_name = os.path.join(
+        directory, f".{base}.{os.getpid()}.{next(_temp_counter)}.tmp")
+
+    fd = os.open(temp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                 0o666)
+    try:
+        # One write for the whole save; loop only if the OS takes less
+        written = os.write(fd, data)
+        while written < len(data):
+            written += os.write(fd, data[written:])
+        if fsync:
+            os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        _remove_quietly(temp_name)
+        raise
+    os.close(fd)
+
+    return temp_name
+
+def _fsync_file(filename):
+    """Flush an already written file to disk"""
+    fd = os.open(filename, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _fsync_directory(directory):
+    """Flush a directory entry change (rename) to disk where supported"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on some platforms (Windows)
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _remove_quietly(filename):
+    """Delete a temp file, ignoring errors"""
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+# ============================================================================
+# BINARY SAVE FORMAT
+# ============================================================================
+
+# File layout (little-endian), version 1:
+#   header   magic, version, the seven stats as int32, list lengths
+#            (inventory, active, completed), string count, string table
+#            byte length, and the width of each reference (0, 1 or 2 bytes)
+#   refs     string table index of name, class, then every list entry
+#   strings  the distinct strings, UTF-8, separated by NUL bytes
+# When the inventory repeats an item, each distinct string is stored once
+# and a repeat costs one or two bytes. Otherwise (the usual case) the width
+# is 0, refs are left out and entry i is string i; quest lists never repeat,
+# so the encoder does not look for repeats outside the inventory. The table
+# is decoded and split in one pass rather than string by string.
+BINARY_MAGIC = b"QCSB"
+BINARY_VERSION = 1
+_BINARY_HEADER = struct.Struct("<4sH7iHHHHIB")
+_BINARY_STATS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+_BINARY_LISTS = ("inventory", "active_quests", "completed_quests")
+_REF_TYPES = {0: None, 1: "B", 2: "H"}
+_SWAP_BYTES = sys.byteorder != "little"
+
+def encode_binary_save(character):
+    """
+    Build the binary form of a save file
+
+    Returns: bytes
+    Raises: InvalidSaveDataError if a value does not fit the format
+    """
+    lists = [character.get(field, []) for field in _BINARY_LISTS]
+    # Lengths once: QuestLog's len() is a Python-level call
+    lengths = list(map(len, lists))
+
+    if len(set(lists[0])) == lengths[0]:
+        # Join each list in one call instead of building a list of entries
+        width = 0
+        refs = b""
+        parts = [character["name"], character["class"]]
+        for strings, length in zip(lists, lengths):
+            if length:
+                parts.append("\0".join(strings))
+        table_size = 2 + lengths[0] + lengths[1] + lengths[2]
+        blob = "\0".join(parts).encode("utf-8")
+    else:
+        values = [character["name"], character["class"], *itertools.chain(*lists)]
+        table = dict.fromkeys(values)
+        width = 1 if len(table) <= 0x100 else 2
+        table_size = len(table)
+        blob = "\0".join(table).encode("utf-8")
+    if blob.count(b"\0") != table_size - 1:
+        raise InvalidSaveDataError("Save strings must not contain NUL characters")
+
+    try:
+        if width:
+            index = dict(zip(table, range(len(table))))
+            refs = array(_REF_TYPES[width], map(index.__getitem__, values))
+            if _SWAP_BYTES and width > 1:
+                refs.byteswap()
+            refs = refs.tobytes()
+        header = _BINARY_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION,
+            int(character["level"]), int(character["health"]),
+            int(character["max_health"]), int(character["strength"]),
+            int(character["magic"]), int(character["experience"]),
+            int(character["gold"]),
+            *lengths, table_size, len(blob), width)
+    except (OverflowError, struct.error) as e:
+        raise InvalidSaveDataError(f"Character does not fit the binary save format: {e}")
+
+    return b"".join((header, refs, blob))
+
+def decode_binary_save(data):
+    """
+    Parse a binary save built by encode_binary_save
+
+    Strings are interned, so ids shared by many loaded characters are
+    kept in memory once.
+
+    Returns: Character dictionary (checked like validate_character_data)
+    Raises: InvalidSaveDataError if the data is truncated, malformed or
+            from another format version
+    """
+    try:
+        magic, version, *fields = _BINARY_HEADER.unpack_from(data)
+    except struct.error:
+        raise InvalidSaveDataError("Truncated binary save header")
+    if magic != BINARY_MAGIC:
+        raise InvalidSaveDataError("Not a binary save file")
+    if version != BINARY_VERSION:
+        raise InvalidSaveDataError(f"Unsupported binary save version: {version}")
+
+    stat_count = len(_BINARY_STATS)
+    list_lengths = fields[stat_count:stat_count + 3]
+    string_count, blob_size, width = fields[stat_count + 3:]
+    ref_count = 2 + sum(list_lengths) if width else 0
+
+    offset = _BINARY_HEADER.size
+    if width not in _REF_TYPES or len(data) != offset + width * ref_count + blob_size:
+        raise InvalidSaveDataError("Malformed binary save: wrong length")
+
+    try:
+        strings = data[offset + width * ref_count:].decode("utf-8").split("\0")
+    except UnicodeDecodeError:
+        raise InvalidSaveDataError("Malformed binary save string table")
+    if len(strings) != string_count:
+        raise InvalidSaveDataError("Malformed binary save string table")
+    values = list(map(sys.intern, strings))
+
+    if width:
+        refs = array(_REF_TYPES[width], data[offset:offset + width * ref_count])
+        if _SWAP_BYTES and width > 1:
+            refs.byteswap()
+        if max(refs) >= string_count:
+            raise InvalidSaveDataError("Malformed binary save string table")
+        values = operator.itemgetter(*refs)(values)
+    elif string_count != 2 + sum(list_lengths):
+        raise InvalidSaveDataError("Malformed binary save string table")
+
+    level, health, max_health, strength, magic, experience, gold = fields[:stat_count]
+    active_start = 2 + list_lengths[0]
+    completed_start = active_start + list_lengths[1]
+    character = {
+        "name": values[0],
+        "class": values[1],
+        "level": level,
+        "health": health,
+        "max_health": max_health,
+        "strength": strength,
+        "magic": magic,
+        "experience": experience,
+        "gold": gold,
+        "inventory": list(values[2:active_start]),
+        "active_quests": QuestLog(values[active_start:completed_start]),
+        "completed_quests": QuestLog(values[completed_start:])
+    }
+
+    # Types are fixed by the layout; only the class can still be wrong
+    if character["class"] not in ("Warrior", "Mage", "Rogue", "Cleric"):
+        raise InvalidSaveDataError(f"Invalid character class: {character['class']}")
+    return character
+
+# ============================================================================
+# SAVE JOURNAL
+# ============================================================================
+
+# A journal ({name}_journal.txt) holds the changes made since the save
+# file was last written in full:
+#   BASE: <crc32>-<size>      of the save file the changes apply to
+#   GOLD: 250                 new value of a stat (any numeric save key)
+#   ITEM_ADDED: sword         list changes, see _JOURNAL_LIST_KEYS
+#   INVENTORY: a,b            a whole list, when the change is not a
+#                             plain append / remove
+#   COMMIT: 3                 end of one save; later lines are ignored
+# A journal whose BASE does not match the save file is stale (the save
+# was rewritten after it) and is ignored.
+JOURNAL_COMPACT_BATCHES = 100
+
+_JOURNAL_STATS = {
+    "LEVEL": "level", "HEALTH": "health", "MAX_HEALTH": "max_health",
+    "STRENGTH": "strength", "MAGIC": "magic", "EXPERIENCE": "experience",
+    "GOLD": "gold"
+}
+# list field -> (save key, added key, removed key)
+_JOURNAL_LIST_KEYS = {
+    "inventory": ("INVENTORY", "ITEM_ADDED", "ITEM_REMOVED"),
+    "active_quests": ("ACTIVE_QUESTS", "QUEST_ACCEPTED", "QUEST_CLOSED"),
+    "completed_quests": ("COMPLETED_QUESTS", "QUEST_COMPLETED", "COMPLETED_REMOVED")
+}
+
+# Save filename -> what its journal was last brought up to
+_journals = {}
+
+def journal_character(character, save_directory="data/save_games", fsync=True,
+                      compact_after=JOURNAL_COMPACT_BATCHES):
+    """
+    Save a character by appending what changed since its last save
+
+    The first save in a session, and every compact_after-th one, writes
+    the full save file (see compact_journal); the rest append one small
+    batch to the journal, so a save costs the size of the change rather
+    than the size of the character. load_character replays the journal.
+
+    Returns: Number of bytes written
+    Raises: PermissionError, IOError
+    """
+    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    state = _journals.get(filename)
+    if state is None or state["batches"] >= compact_after or state["stamp"] != _file_stamp(filename):
+        return compact_journal(character, save_directory, fsync)
+
+    lines = []
+    baseline = state["baseline"]
+    for key, field in _JOURNAL_STATS.items():
+        value = int(character[field])
+        if value != baseline[field]:
+            lines.append(f"{key}: {value}\n")
+            baseline[field] = value
+
+    for field, (key, added_key, removed_key) in _JOURNAL_LIST_KEYS.items():
+        current = list(character.get(field, []))
+        if current == baseline[field]:
+            continue
+        delta = _list_delta(baseline[field], current)
+        if delta is None:
+            lines.append(f"{key}: {','.join(current)}\n")
+        else:
+            lines.extend(f"{removed_key}: {value}\n" for value in delta[0])
+            lines.extend(f"{added_key}: {value}\n" for value in delta[1])
+        baseline[field] = current
+
+    if not lines:
+        return 0
+
+    state["batches"] += 1
+    lines.append(f"COMMIT: {state['batches']}\n")
+    data = "".join(lines).encode("utf-8")
+
+    fd = os.open(state["journal"], os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+    try:
+        written = os.write(fd, data)
+        while written < len(data):
+            written += os.write(fd, data[written:])
+        if fsync:
+            os.fsync(fd)
+    except BaseException:
+        # The baseline may no longer match the file; start over next time
+        _journals.pop(filename, None)
+        raise
+    finally:
+        os.close(fd)
+    _manifest_saved(save_directory, character["name"], character["class"],
+                    baseline["level"], state["stamp"][1])
+
+    return len(data)
+
+def compact_journal(character, save_directory="data/save_games", fsync=True):
+    """
+    Write the full save file and start an empty journal on top of it
+
+    Returns: Number of bytes written
+    Raises: PermissionError, IOError
+    """
+    os.makedirs(save_directory, exist_ok=True)
+    filename = os.path.join(save_directory, f"{character['name']}_save.txt")
+    journal = _journal_filename(filename)
+    _journals.pop(filename, None)
+
+    data = format_save_data(character).encode("utf-8")
+    size = _write_atomic(filename, data, fsync)
+    # A crash here leaves the old journal, whose BASE no longer matches
+    size += _write_atomic(journal, f"BASE: {_journal_base(data)}\n", fsync)
+    if fsync:
+        _fsync_directory(save_directory)
+    _manifest_saved(save_directory, character["name"], character["class"],
+                    int(character["level"]), len(data))
+
+    _journals[filename] = {
+        "journal": journal,
+        "stamp": _file_stamp(filename),
+        "batches": 0,
+        "baseline": dict(
+            {field: int(character[field]) for field in _JOURNAL_STATS.values()},
+            **{field: list(character.get(field, [])) for field in _JOURNAL_LIST_KEYS})
+    }
+    return size
+
+def _journal_filename(filename):
+    """{name}_save.txt -> {name}_journal.txt"""
+    return filename[:-len("_save.txt")] + "_journal.txt"
+
+def _journal_base(data):
+    """Identify the save file contents a journal applies to"""
+    return f"{zlib.crc32(data):08x}-{len(data)}"
+
+def _file_stamp(filename):
+    """Inode, size and mtime of a file (None if missing)"""
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+def _forget_journal(filename):
+    """Drop the journal of a save file that was just rewritten in full"""
+    _journals.pop(filename, None)
+    _remove_quietly(_journal_filename(filename))
+
+def _list_delta(old, new):
+    """
+    Express new as removals from and appends to old
+
+    Removals take the first matching entry, like list.remove.
+
+    Returns: (removed, added) lists, or None if new is not reachable that way
+    """
+    if new[:len(old)] == old:
+        return [], new[len(old):]
+
+    remaining = list(old)
+    removed = []
+    for value, count in (Counter(old) - Counter(new)).items():
+        for _ in range(count):
+            remaining.remove(value)
+            removed.append(value)
+
+    added = new[len(remaining):]
+    if remaining + added != new:
+        return None
+    return removed, added
+
+def _replay_journal(character, raw, filename):
+    """
+    Apply the committed part of a save file's journal to the loaded character
+
+    Raises: SaveFileCorruptedError if the journal cannot be read,
+            InvalidSaveDataError if a committed line is malformed
+    """
+    try:
+        with open(_journal_filename(filename), "rb") as f:
+            text = f.read().decode("utf-8")
+    except FileNotFoundError:
+        return character
+    except (OSError, UnicodeDecodeError):
+        raise SaveFileCorruptedError(f"Could not read save journal for: {character['name']}")
+
+    lines = text.split("\n")
+    if lines[0] != f"BASE: {_journal_base(raw)}":
+        # Written against an older save file
+        return character
+
+    # Lines after the last COMMIT are an unfinished save and are skipped
+    batch = []
+    for line in lines[1:]:
+        if not line.startswith("COMMIT: "):
+            batch.append(line)
+            continue
+        for entry in batch:
+            key, sep, value = entry.partition(": ")
+            if not sep:
+                raise InvalidSaveDataError(f"Malformed line in save journal: '{entry}'")
+            _apply_journal_entry(character, key, value)
+        batch = []
+
+    validate_character_data(character)
+    return character
+
+def _apply_journal_entry(character, key, value):
+    """Apply one journal line to a character"""
+    if key in _JOURNAL_STATS:
+        try:
+            character[_JOURNAL_STATS[key]] = int(value)
+        except ValueError:
+            raise InvalidSaveDataError(f"Invalid {key} value in save journal")
+        return
+
+    for field, (list_key, added_key, removed_key) in _JOURNAL_LIST_KEYS.items():
+        if key == list_key:
+            values = [x for x in value.split(",") if x]
+            character[field] = values if field == "inventory" else QuestLog(values)
+        elif key == added_key:
+            character[field].append(value)
+        elif key == removed_key:
+            try:
+                character[field].remove(value)
+            except ValueError:
+                raise InvalidSaveDataError(f"Save journal removes missing entry: {value}")
+        else:
+            continue
+        return
+
+    raise InvalidSaveDataError(f"Unknown save journal key: {key}")
+
+# ============================================================================
+# SAVE MANIFEST
+# ============================================================================
+
+# Each save directory has a manifest.jsonl with one JSON array per line:
+#   ["MANIFEST", 1]                                   header (format version)
+#   ["S", name, class, level, modified, size]         character saved
+#   ["D", name]                                       character deleted
+# Later lines override earlier ones. Saves and deletes only append; the
+# file is rewritten once most of it is overridden lines. That is checked
+# when it is read and after every MANIFEST_CHECK_APPENDS appends, since
+# journal saves append on every flush without listing the directory. It
+# is only a cache of the directory, so it is not fsynced, and a missing
+# manifest is rebuilt from the save files (see rebuild_manifest).
+# Appends hold a shared flock on the save directory and rewrites an
+# exclusive one, so no append can land in a manifest being replaced.
+MANIFEST_NAME = "manifest.jsonl"
+MANIFEST_VERSION = 1
+MANIFEST_CHECK_APPENDS = 256
+
+# Save directory -> manifest contents read so far
+_manifests = {}
+
+# Save directory -> appends since the manifest was last checked
+_manifest_appends = {}
+
+def rebuild_manifest(save_directory="data/save_games"):
+    """
+    Recreate a save directory's manifest from the save files in it
+
+    Every save is loaded once to read its class and level. The manifest
+    stays locked meanwhile, so saves made during the scan are appended to
+    the new manifest rather than lost.
+
+    Returns: Number of characters in the new manifest
+    Raises: OSError if the manifest cannot be written
+    """
+    lock = _lock_manifest(save_directory, exclusive=True)
+    try:
+        entries = {}
+        for name in _scan_save_names(save_directory):
+            filename = os.path.join(save_directory, f"{name}_save.txt")
+            try:
+                st = os.stat(filename)
+            except OSError:
+                continue
+            try:
+                character = load_character(name, save_directory)
+                summary = (character["class"], int(character["level"]))
+            except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+                summary = (None, None)
+            entries[name] = summary + (round(st.st_mtime, 3), st.st_size)
+
+        _write_manifest(save_directory, entries)
+    finally:
+        _unlock_manifest(lock)
+    return len(entries)
+
+def _read_manifest(save_directory):
+    """
+    Bring the cached manifest up to date and return its entries
+
+    Only the part of the file appended since the last call is read.
+
+    Returns: Dictionary of name -> (class, level, modified, size)
+    Raises: OSError if the manifest cannot be read or rebuilt
+    """
+    path = os.path.join(save_directory, MANIFEST_NAME)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        if not os.path.isdir(save_directory):
+            return {}
+        rebuild_manifest(save_directory)
+        st = os.stat(path)
+
+    cache = _manifests.get(save_directory)
+    if cache is None or cache["ino"] != st.st_ino or cache["offset"] > st.st_size:
+        cache = _manifests[save_directory] = {
+            "ino": st.st_ino, "offset": 0, "records": 0, "entries": {}}
+
+    if st.st_size > cache["offset"]:
+        with open(path, "rb") as f:
+            f.seek(cache["offset"])
+            data = f.read()
+        # Leave a line that is still being appended for next time
+        data = data[:data.rfind(b"\n") + 1]
+        if cache["offset"] == 0 and not data.startswith(b'["MANIFEST",%d]\n' % MANIFEST_VERSION):
+            # Written by another version of the game
+            _manifests.pop(save_directory, None)
+            rebuild_manifest(save_directory)
+            return _read_manifest(save_directory)
+        cache["offset"] += len(data)
+        _apply_manifest_lines(cache, data)
+
+        if cache["records"] > 2 * len(cache["entries"]) + 64:
+            lock = _lock_manifest(save_directory, exclusive=True)
+            try:
+                _write_manifest(save_directory, cache["entries"], cache["offset"])
+            finally:
+                _unlock_manifest(lock)
+
+    return cache["entries"]
+
+def _apply_manifest_lines(cache, data):
+    """Apply manifest records to the cached entries"""
+    entries = cache["entries"]
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+            if record[0] == "S":
+                entries[record[1]] = tuple(record[2:6])
+            elif record[0] == "D":
+                entries.pop(record[1], None)
+            else:
+                continue
+        except (ValueError, TypeError, IndexError, KeyError):
+            # A torn record from a crash; rebuild_manifest repairs the entry
+            continue
+        cache["records"] += 1
+
+def _write_manifest(save_directory, entries, expected_size=None):
+    """
+    Replace the manifest with one record per entry
+
+    The caller holds the exclusive manifest lock. With expected_size, the
+    rewrite is skipped if the manifest has changed size since it was read,
+    so records appended meanwhile are not lost.
+    """
+    path = os.path.join(save_directory, MANIFEST_NAME)
+    lines = [json.dumps(["MANIFEST", MANIFEST_VERSION], separators=(",", ":"))]
+    lines.extend(json.dumps(["S", name, *entry], separators=(",", ":"))
+                 for name, entry in entries.items())
+    if expected_size is not None and (_file_stamp(path) or (0, None))[1] != expected_size:
+        return
+    _write_atomic(path, "\n".join(lines) + "\n", fsync=False)
+    _manifests.pop(save_directory, None)
+
+def _manifest_saved(save_directory, name, character_class, level, size):
+    """Record a save in the manifest"""
+    _manifest_append(save_directory, ["S", name, character_class, level,
+                                      round(time.time(), 3), size])
+
+def _manifest_append(save_directory, record):
+    """
+    Append one record to an existing manifest
+
+    Without a manifest nothing is written: the first listing rebuilds it
+    from the directory, which includes this change.
+    """
+    line = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+    lock = _lock_manifest(save_directory, exclusive=False)
+    try:
+        # Opened under the lock, so a rewrite cannot swap the file between
+        # this open and the write
+        try:
+            fd = os.open(os.path.join(save_directory, MANIFEST_NAME),
+                         os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            return
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    finally:
+        _unlock_manifest(lock)
+
+    # Reading the new lines compacts the manifest if it has grown stale
+    appends = _manifest_appends.get(save_directory, 0) + 1
+    if appends >= MANIFEST_CHECK_APPENDS:
+        appends = 0
+        try:
+            _read_manifest(save_directory)
+        except OSError:
+            pass
+    _manifest_appends[save_directory] = appends
+
+def _lock_manifest(save_directory, exclusive):
+    """
+    Take the save directory's manifest lock (shared or exclusive)
+
+    The lock is a flock on the directory itself, so no lock file is left
+    behind and read-only directories can be locked too. It is not
+    re-entrant: do not append to the manifest while holding it.
+
+    Returns: Lock handle for _unlock_manifest (None without fcntl)
+    Raises: OSError if the directory cannot be opened
+    """
+    if fcntl is None:
+        return None
+    fd = os.open(save_directory, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+def _unlock_manifest(lock):
+    """Release a lock from _lock_manifest"""
+    if lock is not None:
+        # Closing the descriptor releases the flock
+        os.close(lock)
+
+def _save_summary(data):
+    """
+    Class and level from the contents of a save file
+
+    Returns: (class, level), with None for anything that cannot be read
+    """
+    try:
+        if isinstance(data, bytes):
+            if data.startswith(BINARY_MAGIC):
+                character = decode_binary_save(data)
+                return character["class"], character["level"]
+            data = data.decode("utf-8")
+        fields = {}
+        for line in data.splitlines():
+            key, _, value = line.partition(": ")
+            if key == "CLASS" or key == "LEVEL":
+                fields[key] = value
+        return fields.get("CLASS"), int(fields["LEVEL"]) if "LEVEL" in fields else None
+    except (InvalidSaveDataError, UnicodeDecodeError, ValueError):
+        return None, None
+
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
@@ -330,20 +1325,43 @@ def gain_experience(character, xp_amount):
 
     character["experience"] = character.get("experience", 0) + xp_amount
 
-    # Handle multiple level-ups if enough XP
-    while character["experience"] >= character["level"] * 100:
-        required = character["level"] * 100
-        character["experience"] -= required
-        character["level"] += 1
-        # Stat increases on level up
-        character["max_health"] = int(character.get("max_health", 0) + 10)
-        character["strength"] = int(character.get("strength", 0) + 2)
-        character["magic"] = int(character.get("magic", 0) + 2)
-        # Restore health to the new max
-        character["health"] = int(character["max_health"])
+    level = character["level"]
+    experience = character["experience"]
+    if not (isinstance(level, int) and isinstance(experience, int) and level >= 1):
+        # Unusual values: fall back to one level at a time
+        while character["experience"] >= character["level"] * 100:
+            _apply_level_ups(character, 1, character["level"] * 100)
+        return character
+
+    # Going from level L up k levels costs 100 * (L + ... + L+k-1) XP,
+    # i.e. 50k^2 + (100L - 50)k. Solve for the largest affordable k.
+    b = 2 * level - 1
+    levels = (isqrt(b * b + 4 * max(experience, 0) // 50) - b) // 2
+    while _level_up_cost(level, levels + 1) <= experience:
+        levels += 1
+    while levels and _level_up_cost(level, levels) > experience:
+        levels -= 1
+
+    if levels:
+        _apply_level_ups(character, levels, _level_up_cost(level, levels))
 
     return character
 
+def _level_up_cost(level, levels):
+    """XP needed to gain `levels` levels starting at `level`"""
+    return 50 * levels * levels + (100 * level - 50) * levels
+
+def _apply_level_ups(character, levels, cost):
+    """Spend cost XP on `levels` level-ups and raise stats to match"""
+    character["experience"] -= cost
+    character["level"] += levels
+    # Stat increases on level up
+    character["max_health"] = int(character.get("max_health", 0) + 10 * levels)
+    character["strength"] = int(character.get("strength", 0) + 2 * levels)
+    character["magic"] = int(character.get("magic", 0) + 2 * levels)
+    # Restore health to the new max
+    character["health"] = int(character["max_health"])
+
 
 def add_gold(character, amount):
     """
@@ -475,9 +1493,11 @@ def validate_character_data(character):
         except Exception:
             raise InvalidSaveDataError(f"Invalid numeric field: {num_key}")
 
-    # List checks
-    for list_key in ("inventory", "active_quests", "completed_quests"):
-        if not isinstance(character[list_key], list):
+    # List checks (quest lists may also be QuestLogs)
+    if not isinstance(character["inventory"], list):
+        raise InvalidSaveDataError("Invalid list field: inventory")
+    for list_key in ("active_quests", "completed_quests"):
+        if not isinstance(character[list_key], (list, QuestLog)):
             raise InvalidSaveDataError(f"Invalid list field: {list_key}")
 
     # Class validation
@@ -11,17 +11,35 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import re
+import glob
+import mmap
+import time
+import threading
+import hashlib
+import pickle
+from sys import intern
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from custom_exceptions import (
+    DataError,
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Parsed catalogs are cached next to their source file as "<file>.cache".
+# Bump CACHE_VERSION whenever the parsed record layout changes.
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache"
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=True, collect_errors=False,
+                compact=False):
     """
     Load quest data from file
     
@@ -34,7 +52,20 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
-    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    If use_cache is True, a fresh compiled cache (see load_cached_catalog)
+    is used instead of re-parsing the file, and a new cache is written
+    after a successful parse.
+    
+    If collect_errors is True, bad blocks are skipped instead of raising
+    and the whole file is still parsed in a single pass.
+    
+    If compact is True, quests are QuestRecord objects instead of
+    dictionaries. They support the same quest["field"] access but use
+    much less memory.
+    
+    Returns: Dictionary of quests {quest_id: quest_data_dict}, or a tuple
+             (quests, errors) when collect_errors is True. Each error is a
+             dictionary with 'file', 'block', 'line', 'field' and 'reason'.
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
@@ -44,30 +75,33 @@ def load_quests(filename="data/quests.txt"):
     # - Corrupted/unreadable data → raise CorruptedDataError
     
 
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Missing quest file: {filename}")
-
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-    except Exception:
-        raise CorruptedDataError("Could not read quests file")
+    cache_kind = "quest_compact" if compact else "quest"
+    key = None
+    if use_cache:
+        key = _source_key(filename)
+        cached = load_cached_catalog(filename, cache_kind, key)
+        if cached is not None:
+            return (cached, []) if collect_errors else cached
 
-    if not content:
-        raise InvalidDataFormatError("Quest file is empty")
+    if collect_errors:
+        quests, errors = _collect_catalog(filename, "quest")
+        if compact:
+            quests = {k: QuestRecord.from_dict(v) for k, v in quests.items()}
+        if key is not None and not errors:
+            save_cached_catalog(filename, cache_kind, key, quests)
+        return quests, errors
 
     quests = {}
-    blocks = content.split("\n\n")  # Split quests by blank lines
-
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip()]
-        quest = parse_quest_block(lines)
-        validate_quest_data(quest)
+    for quest in iter_quests(filename, compact):
         quests[quest["quest_id"]] = quest
 
+    if key is not None:
+        save_cached_catalog(filename, cache_kind, key, quests)
+
     return quests
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=True, collect_errors=False,
+               compact=False):
     """
     Load item data from file
     
@@ -79,35 +113,361 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
-    Returns: Dictionary of items {item_id: item_data_dict}
+    Uses the compiled cache, collect_errors and compact (ItemRecord) the
+    same way as load_quests.
+    
+    Returns: Dictionary of items {item_id: item_data_dict}, or a tuple
+             (items, errors) when collect_errors is True
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
     # Must handle same exceptions as load_quests
     
 
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Missing item file: {filename}")
+    cache_kind = "item_compact" if compact else "item"
+    key = None
+    if use_cache:
+        key = _source_key(filename)
+        cached = load_cached_catalog(filename, cache_kind, key)
+        if cached is not None:
+            return (cached, []) if collect_errors else cached
+
+    if collect_errors:
+        items, errors = _collect_catalog(filename, "item")
+        if compact:
+            items = {k: ItemRecord.from_dict(v) for k, v in items.items()}
+        if key is not None and not errors:
+            save_cached_catalog(filename, cache_kind, key, items)
+        return items, errors
+
+    items = {}
+    for item in iter_items(filename, compact):
+        items[item["item_id"]] = item
+
+    if key is not None:
+        save_cached_catalog(filename, cache_kind, key, items)
+
+    return items
+
+def load_quest_shards(source="data", max_workers=None):
+    """
+    Load quests split across several shard files
+    
+    Args:
+        source: Directory containing quests_*.txt files, or a glob pattern
+        max_workers: Worker processes to use (None = one per CPU)
+    
+    Shards are parsed in parallel with a process pool and merged.
+    
+    Returns: Dictionary of quests {quest_id: quest_data_dict}
+    Raises: MissingDataFileError if no shards match,
+            InvalidDataFormatError if a quest_id appears in more than one shard,
+            plus anything load_quests raises for an individual shard
+    """
+    files = _find_shards(source, "quests_*.txt", "quest")
+    return _load_shards(files, load_quests, "quest_id", max_workers)
+
+def load_item_shards(source="data", max_workers=None):
+    """
+    Load items split across several shard files
+    
+    Args:
+        source: Directory containing items_*.txt files, or a glob pattern
+        max_workers: Worker processes to use (None = one per CPU)
+    
+    Returns: Dictionary of items {item_id: item_data_dict}
+    Raises: MissingDataFileError if no shards match,
+            InvalidDataFormatError if an item_id appears in more than one shard,
+            plus anything load_items raises for an individual shard
+    """
+    files = _find_shards(source, "items_*.txt", "item")
+    return _load_shards(files, load_items, "item_id", max_workers)
+
+def iter_quests(filename="data/quests.txt", compact=False):
+    """
+    Stream quests from file one block at a time
+
+    Reads the file line by line, so only the block currently being parsed
+    is held in memory. Each yielded quest has already been validated.
+
+    Yields: Quest dictionaries (QuestRecord objects if compact) in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for block_number, first_line, lines in _iter_blocks(filename, "quest"):
+        quest = parse_quest_block(lines, block_number, first_line)
+        try:
+            validate_quest_data(quest)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{e}{_location(block_number, first_line)}")
+        yield QuestRecord.from_dict(quest) if compact else quest
+
+def iter_items(filename="data/items.txt", compact=False):
+    """
+    Stream items from file one block at a time
+
+    Yields: Item dictionaries (ItemRecord objects if compact) in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    for block_number, first_line, lines in _iter_blocks(filename, "item"):
+        item = parse_item_block(lines, block_number, first_line)
+        try:
+            validate_item_data(item)
+        except InvalidDataFormatError as e:
+            raise InvalidDataFormatError(f"{e}{_location(block_number, first_line)}")
+        yield ItemRecord.from_dict(item) if compact else item
+
+def load_cached_catalog(filename, kind, key):
+    """
+    Return the cached catalog for filename if it is still fresh
+    
+    Args:
+        filename: Source data file the cache was built from
+        kind: "quest" or "item"
+        key: Current source key from _source_key(filename)
+    
+    The cache is fresh only if its format version, kind, and the source
+    file's mtime, size and content hash all match.
+    
+    Returns: Catalog dictionary, or None if there is no usable cache
+    """
+    if key is None:
+        return None
 
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            content = f.read().strip()
+        with open(_cache_file(filename, kind), "rb") as f:
+            cache = pickle.load(f)
     except Exception:
-        raise CorruptedDataError("Could not read items file")
+        # Missing or unreadable cache just means we parse the source
+        return None
 
-    if not content:
-        raise InvalidDataFormatError("Item file is empty")
+    if not isinstance(cache, dict):
+        return None
+    if cache.get("version") != CACHE_VERSION or cache.get("kind") != kind:
+        return None
+    if cache.get("key") != key:
+        return None
 
-    items = {}
-    blocks = content.split("\n\n")  # Split items by blank lines
+    return cache.get("records")
+
+def save_cached_catalog(filename, kind, key, records):
+    """
+    Write a compiled cache for a parsed catalog next to its source file
+    
+    The cache is written to a temporary file and moved into place so a
+    crash never leaves a half-written cache behind.
+    
+    Returns: True if the cache was written, False otherwise
+    """
+    cache = {
+        "version": CACHE_VERSION,
+        "kind": kind,
+        "key": key,
+        "records": records
+    }
+    cache_file = _cache_file(filename, kind)
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+
+    try:
+        with open(tmp_file, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except Exception:
+        # A read-only data directory should not stop the game from loading
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        return False
+
+    return True
+
+class _Record(Mapping):
+    """
+    Base for compact, read-only records with dictionary-style access
+    
+    Subclasses list their keys in _fields and store them in __slots__,
+    so a record has no per-instance __dict__. record["key"], "key" in
+    record, .get(), .keys(), .items() and == against a dict all behave
+    like the dictionary the record replaces.
+    """
+
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def to_dict(self):
+        """Return a plain dictionary copy of the record"""
+        return dict(self.items())
+
+class QuestRecord(_Record):
+    """Compact quest record (see load_quests(compact=True))"""
+
+    __slots__ = ("quest_id", "title", "description", "reward_xp",
+                 "reward_gold", "required_level", "prerequisite")
+    _fields = __slots__
+
+    def __init__(self, quest_id, title, description, reward_xp, reward_gold,
+                 required_level, prerequisite):
+        self.quest_id = quest_id
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        self.prerequisite = prerequisite
+
+    @classmethod
+    def from_dict(cls, quest):
+        """Build a record from a validated quest dictionary"""
+        return cls(quest["quest_id"], quest["title"], quest["description"],
+                   quest["reward_xp"], quest["reward_gold"],
+                   quest["required_level"], quest["prerequisite"])
+
+    def __reduce__(self):
+        return (QuestRecord, tuple(getattr(self, f) for f in self.__slots__))
+
+class ItemRecord(_Record):
+    """
+    Compact item record (see load_items(compact=True))
+    
+    The single-stat effect is stored as two slots instead of a nested
+    dictionary; item["effect"] still returns {stat: value}.
+    """
+
+    __slots__ = ("item_id", "name", "type", "effect_stat", "effect_value",
+                 "cost", "description")
+    _fields = ("item_id", "name", "type", "effect", "cost", "description")
+
+    def __init__(self, item_id, name, type, effect_stat, effect_value, cost,
+                 description):
+        self.item_id = item_id
+        self.name = name
+        self.type = type
+        self.effect_stat = effect_stat
+        self.effect_value = effect_value
+        self.cost = cost
+        self.description = description
+
+    @property
+    def effect(self):
+        return {self.effect_stat: self.effect_value}
+
+    @classmethod
+    def from_dict(cls, item):
+        """Build a record from a validated item dictionary"""
+        ((stat, value),) = item["effect"].items()
+        return cls(item["item_id"], item["name"], item["type"], stat, value,
+                   item["cost"], item["description"])
+
+    def __reduce__(self):
+        return (ItemRecord, tuple(getattr(self, f) for f in self.__slots__))
+
+class ItemCatalog(Mapping):
+    """
+    Lazy, read-only {item_id: item_data_dict} mapping over an items file
+    
+    The file is memory-mapped and scanned once to build an offset index
+    (item_id -> byte range of its block). Blocks are only decoded and run
+    through parse_item_block / validate_item_data when an item is actually
+    looked up, and the most recently used parsed items are kept in a
+    bounded LRU cache.
+    
+    Can be used anywhere a dictionary from load_items() is expected.
+    """
+
+    # A block is a run of non-blank lines
+    _BLOCK_RE = re.compile(rb"(?:^[ \t\r]*\S[^\n]*(?:\n|\Z))+", re.MULTILINE)
+    _ITEM_ID_RE = re.compile(rb"^[ \t]*ITEM_ID: *(\S.*?)\s*$", re.MULTILINE)
+
+    def __init__(self, filename="data/items.txt", max_cached=256):
+        """
+        Map the file and build the offset index
+        
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Missing item file: {filename}")
+
+        self.filename = filename
+        self.max_cached = max(1, int(max_cached))
+        self._cache = OrderedDict()
+        self._offsets = {}
+
+        try:
+            with open(filename, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses zero-length files
+            raise InvalidDataFormatError("Item file is empty")
+        except Exception:
+            raise CorruptedDataError("Could not read items file")
+
+        for match in self._BLOCK_RE.finditer(self._map):
+            start, end = match.span()
+            id_match = self._ITEM_ID_RE.search(self._map, start, end)
+            if id_match is None:
+                raise InvalidDataFormatError("Missing item field: item_id")
+            try:
+                item_id = id_match.group(1).decode("utf-8")
+            except UnicodeDecodeError:
+                raise CorruptedDataError("Could not read items file")
+            self._offsets[item_id] = (start, end)
 
-    for block in blocks:
-        lines = [line.strip() for line in block.split("\n") if line.strip()]
+        if not self._offsets:
+            raise InvalidDataFormatError("Item file is empty")
+
+    def __getitem__(self, item_id):
+        if item_id in self._cache:
+            self._cache.move_to_end(item_id)
+            return self._cache[item_id]
+
+        start, end = self._offsets[item_id]
+        try:
+            text = self._map[start:end].decode("utf-8")
+        except UnicodeDecodeError:
+            raise CorruptedDataError("Could not read items file")
+
+        lines = [line.strip() for line in text.split("\n") if line.strip()]
         item = parse_item_block(lines)
         validate_item_data(item)
-        items[item["item_id"]] = item
 
-    return items
+        self._cache[item_id] = item
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return item
+
+    def __contains__(self, item_id):
+        return item_id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        """Release the memory map and drop all cached items"""
+        self._cache.clear()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 def validate_quest_data(quest_dict):
     """
@@ -124,24 +484,9 @@ def validate_quest_data(quest_dict):
     # Check that numeric values are actually numbers
     
 
-    required = [
-        "quest_id",
-        "title",
-        "description",
-        "reward_xp",
-        "reward_gold",
-        "required_level",
-        "prerequisite"
-    ]
-
-    for field in required:
-        if field not in quest_dict:
-            raise InvalidDataFormatError(f"Missing quest field: {field}")
-
-    # Check number fields
-    for num_field in ["reward_xp", "reward_gold", "required_level"]:
-        if not isinstance(quest_dict[num_field], int):
-            raise InvalidDataFormatError(f"Invalid number for {num_field}")
+    problems = _quest_problems(quest_dict)
+    if problems:
+        raise InvalidDataFormatError(problems[0][1])
 
     return True
 
@@ -158,26 +503,9 @@ def validate_item_data(item_dict):
     # TODO: Implement validation
     
 
-    required = [
-        "item_id",
-        "name",
-        "type",
-        "effect",
-        "cost",
-        "description"
-    ]
-
-    for field in required:
-        if field not in item_dict:
-            raise InvalidDataFormatError(f"Missing item field: {field}")
-
-    # Valid types
-    if item_dict["type"] not in ("weapon", "armor", "consumable"):
-        raise InvalidDataFormatError("Invalid item type")
-
-    # Cost must be integer
-    if not isinstance(item_dict["cost"], int):
-        raise InvalidDataFormatError("Invalid item cost")
+    problems = _item_problems(item_dict)
+    if problems:
+        raise InvalidDataFormatError(problems[0][1])
 
     return True
 
@@ -226,65 +554,582 @@ def create_default_data_files():
             raise CorruptedDataError("Could not create items file")
 
 
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+class ContentReloader:
+    """
+    Keeps quest and item catalogs up to date while the game is running
+    
+    poll() stats the data files and, when one has changed, re-reads it.
+    Each block is identified by a hash of its text, so only blocks whose
+    text changed are parsed again; unchanged blocks reuse the record from
+    the previous version.
+    
+    A new version is built completely before it replaces the old one, and
+    old catalog dictionaries are never modified. Code that takes a
+    snapshot() and passes its dictionaries along (quest calls, shops,
+    battles) keeps seeing one consistent version even if a reload happens
+    in the meantime.
+    """
+
+    def __init__(self, quest_file="data/quests.txt", item_file="data/items.txt",
+                 poll_interval=2.0):
+        self.files = {"quest": quest_file, "item": item_file}
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._stats = {"quest": None, "item": None}
+        self._blocks = {"quest": {}, "item": {}}
+        self._last_poll = 0.0
+        self._snapshot = {"version": 0, "quests": {}, "items": {}}
+
+    def load(self):
+        """
+        Load both catalogs and publish them as the first version
+        
+        Uses load_quests / load_items so the compiled cache still speeds
+        up startup. Block hashes are filled in by the first reload, which
+        still reuses every record whose block did not change.
+        
+        Returns: Snapshot dictionary (see snapshot())
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        quest_stat = _file_stat(self.files["quest"])
+        item_stat = _file_stat(self.files["item"])
+        quests = load_quests(self.files["quest"])
+        items = load_items(self.files["item"])
+
+        with self._lock:
+            self._stats = {"quest": quest_stat, "item": item_stat}
+            self._blocks = {"quest": {}, "item": {}}
+            self._last_poll = time.monotonic()
+            return self._publish(quests, items)
+
+    def snapshot(self):
+        """
+        Get the current catalog version
+        
+        Returns: Dictionary with 'version', 'quests' and 'items'
+        """
+        return self._snapshot
+
+    def poll(self, force=False):
+        """
+        Reload any data file that changed since the last check
+        
+        Args:
+            force: Check the files even if poll_interval has not elapsed
+        
+        Returns: True if a new version was published, False otherwise
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+                if a changed file is invalid. The previous version stays
+                active and the file is not retried until it changes again.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return False
+
+        with self._lock:
+            self._last_poll = now
+            current = self._snapshot
+            catalogs = {"quest": current["quests"], "item": current["items"]}
+            changed = False
+            error = None
+
+            for kind in ("quest", "item"):
+                stat = _file_stat(self.files[kind])
+                if stat == self._stats[kind]:
+                    continue
+
+                # Remember the stat first so a broken file is not re-parsed
+                # on every poll
+                self._stats[kind] = stat
+                try:
+                    catalogs[kind] = self._reload_kind(kind, catalogs[kind])
+                    changed = True
+                except DataError as e:
+                    error = e
+
+            if changed:
+                self._publish(catalogs["quest"], catalogs["item"])
+            if error is not None:
+                raise error
+            return changed
+
+    def _reload_kind(self, kind, previous):
+        """
+        Re-read one data file, parsing only blocks whose text changed
+        
+        A parsed record equal to the one previous holds for its id is
+        replaced by that object, so unchanged records keep their identity
+        even on the first reload after load(), before block hashes exist.
+        """
+        if kind == "quest":
+            parse_block, validate, id_field = parse_quest_block, validate_quest_data, "quest_id"
+        else:
+            parse_block, validate, id_field = parse_item_block, validate_item_data, "item_id"
+
+        old_blocks = self._blocks[kind]
+        new_blocks = {}
+        records = {}
+
+        for block_number, first_line, lines in _iter_blocks(self.files[kind], kind):
+            block_hash = hashlib.blake2b("\n".join(lines).encode("utf-8"),
+                                         digest_size=16).digest()
+            record = old_blocks.get(block_hash)
+            if record is None:
+                record = parse_block(lines, block_number, first_line)
+                try:
+                    validate(record)
+                except InvalidDataFormatError as e:
+                    raise InvalidDataFormatError(f"{e}{_location(block_number, first_line)}")
+                if previous.get(record[id_field]) == record:
+                    record = previous[record[id_field]]
+            new_blocks[block_hash] = record
+            records[record[id_field]] = record
+
+        self._blocks[kind] = new_blocks
+        return records
+
+    def _publish(self, quests, items):
+        """Swap in a new version (caller holds the lock)"""
+        self._snapshot = {
+            "version": self._snapshot["version"] + 1,
+            "quests": quests,
+            "items": items
+        }
+        return self._snapshot
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_quest_block(lines):
+def _cache_file(filename, kind):
+    """Cache path for a source file; compact catalogs get their own file"""
+    if kind.endswith("_compact"):
+        return f"{filename}.compact{CACHE_SUFFIX}"
+    return filename + CACHE_SUFFIX
+
+def _source_key(filename):
     """
-    Parse a block of lines into a quest dictionary
+    Build the cache key for a data file
     
+    Returns: Tuple of (mtime_ns, size, sha256 hex digest), or None if the
+             file cannot be read
+    """
+    try:
+        stat = os.stat(filename)
+        digest = hashlib.sha256()
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+
+def _file_stat(filename):
+    """Return (mtime_ns, size) for filename, or None if it is missing"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _find_shards(source, default_pattern, kind):
+    """Resolve a directory or glob pattern to a sorted list of shard files"""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, default_pattern)
+    else:
+        pattern = source
+
+    files = sorted(f for f in glob.glob(pattern) if os.path.isfile(f))
+    if not files:
+        raise MissingDataFileError(f"No {kind} shards found for: {source}")
+    return files
+
+def _load_shards(files, loader, id_field, max_workers):
+    """
+    Parse shard files (in parallel when there is more than one) and merge
+    
+    Raises: InvalidDataFormatError listing every duplicate id
+    """
+    if len(files) == 1 or max_workers == 1:
+        results = [loader(filename) for filename in files]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(loader, files))
+
+    merged = {}
+    source_of = {}
+    duplicates = []
+
+    for filename, records in zip(files, results):
+        for record_id, record in records.items():
+            if record_id in source_of:
+                duplicates.append(f"{record_id} ({source_of[record_id]}, {filename})")
+                continue
+            source_of[record_id] = filename
+            merged[record_id] = record
+
+    if duplicates:
+        shown = "; ".join(duplicates[:10])
+        if len(duplicates) > 10:
+            shown += f"; ... {len(duplicates) - 10} more"
+        raise InvalidDataFormatError(f"Duplicate {id_field} across shards: {shown}")
+
+    return merged
+
+def _iter_blocks(filename, kind):
+    """
+    Read a data file line by line and yield one block of lines at a time
+
+    Blocks are separated by blank lines. Lines are stripped and blank
+    lines are never included in a block, so line i of a block is line
+    first_line + i of the file.
+
     Args:
-        lines: List of strings representing one quest
+        filename: Path to the data file
+        kind: "quest" or "item" (used in error messages)
+
+    Yields: Tuple of (block_number, first_line, lines) for each block,
+            both numbers starting at 1
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Missing {kind} file: {filename}")
+
+    try:
+        f = open(filename, "r", encoding="utf-8")
+    except Exception:
+        raise CorruptedDataError(f"Could not read {kind}s file")
+
+    block_number = 0
+    with f:
+        block = []
+        first_line = 0
+        line_number = 0
+        try:
+            for line in f:
+                line_number += 1
+                line = line.strip()
+                if line:
+                    if not block:
+                        first_line = line_number
+                    block.append(line)
+                elif block:
+                    block_number += 1
+                    yield block_number, first_line, block
+                    block = []
+        except (OSError, UnicodeDecodeError):
+            raise CorruptedDataError(f"Could not read {kind}s file")
+
+        if block:
+            block_number += 1
+            yield block_number, first_line, block
+
+    if not block_number:
+        raise InvalidDataFormatError(f"{kind.capitalize()} file is empty")
+
+QUEST_REQUIRED = (
+    "quest_id",
+    "title",
+    "description",
+    "reward_xp",
+    "reward_gold",
+    "required_level",
+    "prerequisite"
+)
+
+ITEM_REQUIRED = (
+    "item_id",
+    "name",
+    "type",
+    "effect",
+    "cost",
+    "description"
+)
+
+def _quest_problems(quest_dict):
+    """
+    Check a parsed quest without raising
     
-    Returns: Dictionary with quest data
-    Raises: InvalidDataFormatError if parsing fails
+    Returns: List of (field, reason) tuples, empty if the quest is valid
     """
-    # TODO: Implement parsing logic
-    # Split each line on ": " to get key-value pairs
-    # Convert numeric strings to integers
-    # Handle parsing errors gracefully
+    problems = []
+
+    for field in QUEST_REQUIRED:
+        if field not in quest_dict:
+            problems.append((field, f"Missing quest field: {field}"))
+
+    # Check number fields
+    for num_field in ("reward_xp", "reward_gold", "required_level"):
+        if num_field in quest_dict and not isinstance(quest_dict[num_field], int):
+            problems.append((num_field, f"Invalid number for {num_field}"))
+
+    # Prerequisite lists must not contain blanks or NONE
+    prereq = quest_dict.get("prerequisite")
+    if isinstance(prereq, str) and ("," in prereq or "|" in prereq):
+        for clause in prerequisite_clauses(quest_dict):
+            if "" in clause or "NONE" in clause:
+                problems.append(("prerequisite", "Invalid prerequisite list"))
+                break
+
+    return problems
+
+def _item_problems(item_dict):
+    """
+    Check a parsed item without raising
+    
+    Returns: List of (field, reason) tuples, empty if the item is valid
+    """
+    problems = []
+
+    for field in ITEM_REQUIRED:
+        if field not in item_dict:
+            problems.append((field, f"Missing item field: {field}"))
+
+    # Valid types
+    if "type" in item_dict and item_dict["type"] not in ("weapon", "armor", "consumable"):
+        problems.append(("type", "Invalid item type"))
+
+    # Cost must be integer
+    if "cost" in item_dict and not isinstance(item_dict["cost"], int):
+        problems.append(("cost", "Invalid item cost"))
+
+    return problems
+
+def _collect_catalog(filename, kind):
+    """
+    Parse a whole data file in one pass, collecting every error
+    
+    Valid blocks go through the same fast parser as the strict loaders;
+    only blocks that fail are diagnosed line by line.
     
+    Returns: Tuple (records, errors). errors is a list of dictionaries
+             with 'file', 'block', 'line', 'field' and 'reason'.
+    Raises: MissingDataFileError, InvalidDataFormatError (empty file),
+            CorruptedDataError
+    """
+    if kind == "quest":
+        fields, id_field, check = QUEST_FIELDS, "quest_id", _quest_problems
+    else:
+        fields, id_field, check = ITEM_FIELDS, "item_id", _item_problems
+
+    records = {}
+    errors = []
 
-    quest = {}
+    for block_number, first_line, lines in _iter_blocks(filename, kind):
+        record = _parse_block_fast(lines, fields)
+        if record is None:
+            record, problems = _diagnose_block(lines, fields, kind, first_line)
+        else:
+            problems = []
+
+        reported = set(field for _, field, _ in problems)
+        for field, reason in check(record):
+            if field not in reported:
+                problems.append((first_line, field, reason))
+
+        if problems:
+            for line, field, reason in problems:
+                errors.append({
+                    "file": filename,
+                    "block": block_number,
+                    "line": line,
+                    "field": field,
+                    "reason": reason
+                })
+            continue
+
+        records[record[id_field]] = record
+
+    return records, errors
+
+def prerequisite_clauses(quest):
+    """
+    Split a quest's prerequisite into requirement clauses
+
+    The prerequisite text is a comma-separated list of clauses that must
+    all be met (AND); each clause lists alternatives separated by "|"
+    (OR). "NONE" means no requirement. A quest file can also give several
+    PREREQUISITE lines, which the parser joins with ", ".
+
+    Example: "goblin_hunter, orc_menace | treasure_hunter" returns
+             (("goblin_hunter",), ("orc_menace", "treasure_hunter"))
+
+    Returns: Tuple of clauses, each a tuple of quest ids
+    """
+    text = quest["prerequisite"]
+    if "," not in text and "|" not in text:
+        return () if text == "NONE" else ((text,),)
+
+    return tuple(
+        tuple(intern(quest_id.strip()) for quest_id in clause.split("|"))
+        for clause in text.split(",")
+    )
+
+def _parse_effect(value):
+    """Convert an EFFECT value "stat:amount" into {stat: amount}"""
+    if ":" not in value:
+        raise ValueError("Invalid item effect format")
+    stat, amount = value.split(":", 1)
+    return {intern(stat.strip()): int(amount)}
+
+# Field tables for the block parsers: KEY -> (field name, converter).
+# Converters get the value with surrounding whitespace removed and raise
+# ValueError on bad input; None keeps the text as it is. Prerequisites,
+# item types and effect stat names repeat across many records and are
+# interned so they are stored once; ids are unique and are not.
+# The tables replace the old if/elif chains so both parsers and the
+# collect_errors diagnostics share one list of fields. They are not a
+# speedup: parsing costs about the same as before (see benchmarks.py).
+# A repeated key overwrites the earlier value, except for the fields in
+# JOINED_FIELDS, whose values are joined with the given separator.
+QUEST_FIELDS = {
+    "QUEST_ID": ("quest_id", None),
+    "TITLE": ("title", None),
+    "DESCRIPTION": ("description", None),
+    "REWARD_XP": ("reward_xp", int),
+    "REWARD_GOLD": ("reward_gold", int),
+    "REQUIRED_LEVEL": ("required_level", int),
+    "PREREQUISITE": ("prerequisite", intern)
+}
+
+ITEM_FIELDS = {
+    "ITEM_ID": ("item_id", None),
+    "NAME": ("name", None),
+    "TYPE": ("type", intern),
+    "EFFECT": ("effect", _parse_effect),
+    "COST": ("cost", int),
+    "DESCRIPTION": ("description", None)
+}
+
+JOINED_FIELDS = {"prerequisite": ", "}
+
+def _parse_block(lines, fields, kind, block_number, first_line):
+    """
+    Slow path of parse_quest_block and parse_item_block, for blocks that
+    _parse_block_fast gave up on
+    
+    Raises: InvalidDataFormatError naming the block and line on failure
+    """
+    record, problems = _diagnose_block(lines, fields, kind, first_line)
+    if problems:
+        line, field, reason = problems[0]
+        raise InvalidDataFormatError(reason + _location(block_number, line))
+
+    return record
+
+def _parse_block_fast(lines, fields):
+    """
+    Parse a well-formed block
+    
+    Anything unusual (bad separator, padded key, bad number, a repeated
+    key) returns None so the caller can fall back to _diagnose_block.
+    Running every block through _diagnose_block instead would make
+    loading about 40% slower than the old if/elif parsers; this loop
+    keeps it level with them.
+    """
+    record = {}
 
     try:
         for line in lines:
-            if ": " not in line:
-                raise InvalidDataFormatError("Quest line missing ':' separator")
-
-            key, value = line.split(": ", 1)
-            key = key.strip()
+            key, _, value = line.partition(": ")
+            field, convert = fields[key]
             value = value.strip()
+            record[field] = value if convert is None else convert(value)
+    except (KeyError, ValueError):
+        return None
+
+    # Fewer fields than lines means a key was repeated
+    if len(record) != len(lines):
+        return None
 
-            if key == "QUEST_ID":
-                quest["quest_id"] = value
-            elif key == "TITLE":
-                quest["title"] = value
-            elif key == "DESCRIPTION":
-                quest["description"] = value
-            elif key == "REWARD_XP":
-                quest["reward_xp"] = int(value)
-            elif key == "REWARD_GOLD":
-                quest["reward_gold"] = int(value)
-            elif key == "REQUIRED_LEVEL":
-                quest["required_level"] = int(value)
-            elif key == "PREREQUISITE":
-                quest["prerequisite"] = value
+    return record
+
+def _diagnose_block(lines, fields, kind, first_line):
+    """
+    Line-by-line parse that records every problem instead of raising
+    
+    Returns: Tuple (record, problems) where problems is a list of
+             (line_number, field, reason) tuples
+    """
+    record = {}
+    problems = []
+
+    for offset, line in enumerate(lines):
+        line_number = (first_line or 1) + offset
+        key, sep, value = line.partition(": ")
+        if not sep:
+            problems.append((line_number, None,
+                             f"{kind.capitalize()} line missing ':' separator"))
+            continue
+
+        key = key.strip()
+        value = value.strip()
+        if key not in fields:
+            problems.append((line_number, key, f"Unknown {kind} field: {key}"))
+            continue
+
+        field, convert = fields[key]
+        try:
+            converted = value if convert is None else convert(value)
+            if field in record and field in JOINED_FIELDS:
+                converted = intern(record[field] + JOINED_FIELDS[field] + converted)
+            record[field] = converted
+        except ValueError:
+            if convert is _parse_effect and ":" not in value:
+                reason = "Invalid item effect format"
             else:
-                raise InvalidDataFormatError(f"Unknown quest field: {key}")
+                reason = f"Invalid number in {kind} block"
+            problems.append((line_number, field, reason))
+
+    return record, problems
 
-    except ValueError:
-        raise InvalidDataFormatError("Invalid number in quest block")
+def _location(block_number, line):
+    """Describe where a parse error happened, e.g. ' (block 3, line 17)'"""
+    if block_number is None:
+        return f" (line {line})"
+    return f" (block {block_number}, line {line})"
+
+def parse_quest_block(lines, block_number=None, first_line=None):
+    """
+    Parse a block of lines into a quest dictionary
+    
+    A quest may list several PREREQUISITE lines (all required) and
+    alternatives within a line separated by "|" (any one required); they
+    are kept as one prerequisite string, see prerequisite_clauses().
+    
+    Args:
+        lines: List of strings representing one quest
+        block_number: Position of the block in its file (for error messages)
+        first_line: File line number of lines[0] (for error messages)
+    
+    Returns: Dictionary with quest data
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    # TODO: Implement parsing logic
+    # Split each line on ": " to get key-value pairs
+    # Convert numeric strings to integers
+    # Handle parsing errors gracefully
+    
 
+    quest = _parse_block_fast(lines, QUEST_FIELDS)
+    if quest is None:
+        quest = _parse_block(lines, QUEST_FIELDS, "quest", block_number, first_line)
     return quest
 
-def parse_item_block(lines):
+def parse_item_block(lines, block_number=None, first_line=None):
     """
     Parse a block of lines into an item dictionary
     
     Args:
         lines: List of strings representing one item
+        block_number: Position of the block in its file (for error messages)
+        first_line: File line number of lines[0] (for error messages)
     
     Returns: Dictionary with item data
     Raises: InvalidDataFormatError if parsing fails
@@ -292,39 +1137,9 @@ def parse_item_block(lines):
     # TODO: Implement parsing logic
     
 
-    item = {}
-
-    try:
-        for line in lines:
-            if ": " not in line:
-                raise InvalidDataFormatError("Item line missing ':' separator")
-
-            key, value = line.split(": ", 1)
-            key = key.strip()
-            value = value.strip()
-
-            if key == "ITEM_ID":
-                item["item_id"] = value
-            elif key == "NAME":
-                item["name"] = value
-            elif key == "TYPE":
-                item["type"] = value
-            elif key == "EFFECT":
-                # Format: stat:value
-                if ":" not in value:
-                    raise InvalidDataFormatError("Invalid item effect format")
-                stat, amount = value.split(":", 1)
-                item["effect"] = {stat: int(amount)}
-            elif key == "COST":
-                item["cost"] = int(value)
-            elif key == "DESCRIPTION":
-                item["description"] = value
-            else:
-                raise InvalidDataFormatError(f"Unknown item field: {key}")
-
-    except ValueError:
-        raise InvalidDataFormatError("Invalid number in item block")
-
+    item = _parse_block_fast(lines, ITEM_FIELDS)
+    if item is None:
+        item = _parse_block(lines, ITEM_FIELDS, "item", block_number, first_line)
     return item
 
 # ============================================================================
@@ -9,6 +9,7 @@ AI Usage: Implemented with ChatGPT assistance
 This module handles inventory management, item usage, and equipment.
 """
 
+from collections.abc import Mapping
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -410,7 +411,8 @@ def parse_item_effect(effect_string):
     Parse item effect string into stat name and value
     
     Args:
-        effect_string: String in format "stat_name:value"
+        effect_string: String in format "stat_name:value", or the
+                       {stat_name: value} mapping game_data produces
     
     Returns: Tuple of (stat_name, value)
     Example: "health:20" → ("health", 20)
@@ -422,6 +424,9 @@ def parse_item_effect(effect_string):
 
     """Convert 'stat:value' → ('stat', int(value))"""
     try:
+        if isinstance(effect_string, Mapping):
+            ((stat, value),) = effect_string.items()
+            return stat, int(value)
         stat, value = effect_string.split(":")
         return stat, int(value)
     except:
@@ -16,6 +16,8 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import quest_catalog
+import save_scheduler
 from custom_exceptions import *
 
 # ============================================================================
@@ -28,6 +30,16 @@ all_quests = {}
 all_items = {}
 game_running = False
 
+# Watches the data files so content can change without a restart
+content_reloader = None
+catalog_version = 0
+
+# Coalesces the per-action saves into background writes (created in main)
+scheduler = None
+
+# Characters shown per page in the load menu
+LOAD_PAGE_SIZE = 10
+
 # ============================================================================
 # MAIN MENU
 # ============================================================================
@@ -132,25 +144,37 @@ def load_game():
     pass
 
     print("\n=== LOAD GAME ===")
-    saves = character_manager.list_saved_characters()
+    # Summaries come from the save manifest, so no save file is opened here
+    saves = character_manager.list_character_summaries()
     if not saves:
         print("No saved characters found.")
         return
 
-    print("Saved characters:")
-    for idx, s in enumerate(saves, start=1):
-        print(f"{idx}) {s}")
-
+    page = 0
+    pages = (len(saves) + LOAD_PAGE_SIZE - 1) // LOAD_PAGE_SIZE
     while True:
-        choice = input(f"Select character (1-{len(saves)}) or 'b' to go back: ").strip()
-        if choice.lower() == "b":
+        start = page * LOAD_PAGE_SIZE
+        print(f"Saved characters (page {page + 1} of {pages}):")
+        for idx, summary in enumerate(saves[start:start + LOAD_PAGE_SIZE], start=start + 1):
+            if summary["level"] is None:
+                # Unreadable save, or no manifest to read the level from
+                print(f"{idx}) {summary['name']}")
+            else:
+                print(f"{idx}) {summary['name']} - Level {summary['level']} {summary['class']}")
+
+        choice = input(f"Select character (1-{len(saves)}), 'n'/'p' for next/previous page "
+                       f"or 'b' to go back: ").strip().lower()
+        if choice == "b":
             return
+        if choice in ("n", "p"):
+            page = min(max(page + (1 if choice == "n" else -1), 0), pages - 1)
+            continue
         if not choice.isdigit():
             print("Please enter a number.")
             continue
         idx = int(choice)
         if 1 <= idx <= len(saves):
-            sel = saves[idx - 1]
+            sel = saves[idx - 1]["name"]
             break
         print("Invalid choice.")
 
@@ -206,6 +230,7 @@ def game_loop():
     game_running = True
 
     while game_running:
+        refresh_game_data()
         try:
             choice = game_menu()
             # Map choices to actions
@@ -230,9 +255,10 @@ def game_loop():
             handle_character_death()
         except Exception as e:
             print(f"An error occurred: {e}")
-        # Save after each loop iteration to persist progress
+        # Queue a save after each loop iteration; the scheduler only writes
+        # when the character changed, at most once per interval
         try:
-            save_game()
+            request_save()
         except Exception:
             # non-fatal if saving fails
             pass
@@ -610,12 +636,27 @@ def save_game():
         return
 
     try:
-        # Save using character_manager (it writes the expected fields)
-        character_manager.save_character(current_character)
+        if scheduler is not None:
+            # Write now, along with anything already queued
+            scheduler.request(current_character)
+            scheduler.flush()
+        else:
+            # Save using character_manager (it writes the expected fields)
+            character_manager.save_character(current_character)
     except Exception as e:
         # Let the caller decide; here we print a warning
         print(f"Warning: failed to save game: {e}")
 
+def request_save():
+    """Queue a background save of the current character"""
+    if not current_character:
+        return
+
+    if scheduler is not None:
+        scheduler.request(current_character)
+    else:
+        character_manager.save_character(current_character)
+
 def load_game_data():
     """Load all quest and item data from files"""
     global all_quests, all_items
@@ -627,9 +668,14 @@ def load_game_data():
     # If files missing, create defaults with game_data.create_default_data_files()
     pass
 
+    global content_reloader, catalog_version
+
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        content_reloader = game_data.ContentReloader()
+        snapshot = content_reloader.load()
+        all_quests = quest_catalog.QuestCatalog(snapshot["quests"], snapshot["version"])
+        catalog_version = snapshot["version"]
+        all_items = snapshot["items"]
     except MissingDataFileError:
         # Re-raise so main can handle creating default files
         raise
@@ -645,6 +691,36 @@ def load_game_data():
     return True
 
 
+def refresh_game_data():
+    """
+    Pick up any changes to the quest and item files
+    
+    Called between game actions, so each action runs against one
+    consistent version of the catalogs.
+    """
+    global all_quests, all_items, catalog_version
+
+    if content_reloader is None:
+        return
+
+    try:
+        content_reloader.poll()
+    except DataError as e:
+        # Keep playing on the previous version
+        print(f"Warning: could not reload game data: {e}")
+
+    snapshot = content_reloader.snapshot()
+    if snapshot["version"] != catalog_version:
+        # Only try each version once, even if its quests are rejected
+        catalog_version = snapshot["version"]
+        try:
+            all_quests = quest_catalog.QuestCatalog(snapshot["quests"], snapshot["version"])
+        except DataError as e:
+            print(f"Warning: could not reload quests: {e}")
+    all_items = snapshot["items"]
+    if current_character is not None:
+        current_character["item_data"] = all_items
+
 def handle_character_death():
     """Handle character death"""
     global current_character, game_running
@@ -660,6 +736,8 @@ def handle_character_death():
         return
 
     print("\n=== YOU DIED ===")
+    # Persist the death right away rather than waiting for the scheduler
+    save_game()
     # Offer revive: cost 50 gold (simple rule)
     revive_cost = 50
     gold = int(current_character.get("gold", 0))
@@ -713,6 +791,21 @@ def display_welcome():
 
 def main():
     """Main game execution function"""
+    global scheduler
+
+    scheduler = save_scheduler.SaveScheduler(journal=True)
+    scheduler.install_signal_handlers()
+    try:
+        run_game()
+    finally:
+        try:
+            scheduler.close()
+        except Exception as e:
+            print(f"Warning: failed to save game: {e}")
+        scheduler = None
+
+def run_game():
+    """Load game data and run the main menu until the player quits"""
     
     # Display welcome message
     display_welcome()
@@ -0,0 +1,270 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Analytics Module
+
+This module builds fleet-wide quest funnel numbers from every save file.
+Saves are read with character_manager.load_character in a process pool,
+a chunk of file names at a time, and only per-quest counters come back
+from the workers, so memory stays bounded however many saves there are.
+
+For each quest the report counts the characters that:
+    available: could accept it now (level and prerequisites met) but have
+               not, i.e. players stalled in front of it
+    active:    have accepted it and not completed it yet
+    completed: have completed it
+
+Save files only record active and completed quests, so acceptance is
+reported as active + completed and abandonment cannot be counted; the
+report says so rather than guessing.
+
+Usage:
+    python quest_analytics.py --saves data/save_games --output report.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import game_data
+import character_manager
+from quest_catalog import QuestCatalog
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+SAVE_SUFFIX = "_save.txt"
+
+# Per-quest counter columns, in report order
+FIELDS = ("available", "active", "completed")
+
+# Unreadable saves named in the report (the rest are only counted)
+MAX_ERROR_SAMPLES = 10
+
+# Catalog loaded once per worker process by _init_worker
+_catalog = None
+
+# ============================================================================
+# ANALYTICS
+# ============================================================================
+
+def analyze_saves(save_directory="data/save_games", quest_file="data/quests.txt",
+                  max_workers=None, chunk_size=500):
+    """
+    Aggregate quest funnel counters over every save in save_directory
+
+    Args:
+        save_directory: Directory of {name}_save.txt files
+        quest_file: Quest data file the saves are measured against
+        max_workers: Worker processes to use (None = one per CPU)
+        chunk_size: Saves handed to a worker at a time
+
+    At most two chunks per worker are in flight, so memory depends on
+    chunk_size and the catalog size, not on the number of saves.
+
+    Returns: Report dictionary (see build_report)
+    Raises: Anything game_data.load_quests raises for quest_file
+    """
+    catalog = QuestCatalog(game_data.load_quests(quest_file))
+    totals = _empty_totals(catalog)
+    max_workers = max_workers or os.cpu_count() or 1
+
+    chunks = _chunked(_iter_save_names(save_directory), max(1, chunk_size))
+
+    if max_workers == 1:
+        _init_worker(quest_file)
+        for chunk in chunks:
+            _merge(totals, _analyze_chunk(save_directory, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(quest_file,)) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_analyze_chunk, save_directory, chunk))
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _merge(totals, future.result())
+            for future in pending:
+                _merge(totals, future.result())
+
+    return build_report(catalog, totals)
+
+def build_report(catalog, totals):
+    """
+    Turn merged counters into the compact JSON-ready report
+
+    Report layout:
+        saves, unreadable, error_samples: save file counts
+        fields: names of the per-quest counter columns
+        quests: {quest_id: [available, active, completed]}
+        furthest_depth: {chain depth: characters whose deepest completed
+                         quest is at that depth ("none" = no quests done)}
+        unknown_quests: {quest_id: saves naming it} for ids not in the catalog
+        notes: caveats about what the saves can show
+
+    Returns: Report dictionary
+    """
+    return {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "saves": totals["saves"],
+        "unreadable": totals["unreadable"],
+        "error_samples": totals["error_samples"],
+        "fields": list(FIELDS),
+        "quests": {
+            quest_id: [totals[field][i] for field in FIELDS]
+            for i, quest_id in enumerate(catalog.ids)
+        },
+        "furthest_depth": {
+            "none" if depth is None else str(depth): count
+            for depth, count in sorted(totals["furthest_depth"].items(),
+                                       key=lambda item: -1 if item[0] is None else item[0])
+        },
+        "unknown_quests": dict(totals["unknown_quests"].most_common()),
+        "notes": [
+            "accepted = active + completed; abandoned quests are not recorded in saves"
+        ]
+    }
+
+def write_report(report, output=None):
+    """Write a report as compact JSON to output (or stdout)"""
+    text = json.dumps(report, separators=(",", ":"))
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+# ============================================================================
+# WORKER FUNCTIONS
+# ============================================================================
+
+def _init_worker(quest_file):
+    """Load the quest catalog once per worker process"""
+    global _catalog
+    _catalog = QuestCatalog(game_data.load_quests(quest_file))
+
+def _analyze_chunk(save_directory, names):
+    """
+    Count quest states for a chunk of saves
+
+    Returns: Dictionary of Counters keyed like _empty_totals (sparse, so
+             only quests that appear in the chunk are sent back)
+    """
+    catalog = _catalog
+    index = catalog.index
+    depth = catalog.graph.depth
+    counts = {field: Counter() for field in FIELDS}
+    furthest = Counter()
+    unknown = Counter()
+    unreadable = 0
+    samples = []
+
+    for name in names:
+        try:
+            character = character_manager.load_character(name, save_directory)
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            unreadable += 1
+            if len(samples) < MAX_ERROR_SAMPLES:
+                samples.append(f"{name}: {e}")
+            continue
+
+        for field in ("active", "completed"):
+            for quest_id in character[f"{field}_quests"]:
+                if quest_id in index:
+                    counts[field][index[quest_id]] += 1
+                else:
+                    unknown[quest_id] += 1
+
+        for quest in catalog.available_quests(character):
+            counts["available"][index[quest["quest_id"]]] += 1
+
+        furthest[max((depth[quest_id] for quest_id in character["completed_quests"]
+                      if quest_id in depth), default=None)] += 1
+
+    return {
+        "saves": len(names),
+        "unreadable": unreadable,
+        "error_samples": samples,
+        "furthest_depth": furthest,
+        "unknown_quests": unknown,
+        **counts
+    }
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _empty_totals(catalog):
+    """Running totals; per-quest counters are dense lists over the catalog"""
+    totals = {field: [0] * len(catalog.ids) for field in FIELDS}
+    totals.update({
+        "saves": 0,
+        "unreadable": 0,
+        "error_samples": [],
+        "furthest_depth": Counter(),
+        "unknown_quests": Counter()
+    })
+    return totals
+
+def _merge(totals, chunk):
+    """Add one chunk's counters into the running totals"""
+    for field in FIELDS:
+        column = totals[field]
+        for i, count in chunk[field].items():
+            column[i] += count
+
+    totals["saves"] += chunk["saves"]
+    totals["unreadable"] += chunk["unreadable"]
+    room = MAX_ERROR_SAMPLES - len(totals["error_samples"])
+    totals["error_samples"].extend(chunk["error_samples"][:room])
+    totals["furthest_depth"].update(chunk["furthest_depth"])
+    totals["unknown_quests"].update(chunk["unknown_quests"])
+
+def _iter_save_names(save_directory):
+    """Yield character names from save file names without listing them all"""
+    if not os.path.isdir(save_directory):
+        return
+    with os.scandir(save_directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(SAVE_SUFFIX) and entry.is_file():
+                yield entry.name[:-len(SAVE_SUFFIX)]
+
+def _chunked(iterable, size):
+    """Yield lists of up to size items"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    """Parse command line options, run the analytics and emit JSON"""
+    parser = argparse.ArgumentParser(description="Quest funnel analytics over save files")
+    parser.add_argument("--saves", default="data/save_games", help="save file directory")
+    parser.add_argument("--quests", default="data/quests.txt", help="quest data file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="saves handed to a worker at a time")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = analyze_saves(args.saves, args.quests, args.workers, args.chunk_size)
+    write_report(report, args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,682 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Quest Catalog Module
+
+This module wraps the quest dictionary from game_data in a read-only
+catalog that also keeps column arrays of the numeric quest fields, so
+quest_handler can answer catalog-wide queries with vectorised operations
+instead of looping over every quest dictionary.
+
+NumPy is used when it is installed; otherwise the columns fall back to
+the standard library array module and plain loops.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from custom_exceptions import InvalidDataFormatError, QuestNotFoundError
+from game_data import prerequisite_clauses
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Prerequisite column codes
+NO_PREREQUISITE = -1
+COMPOUND_PREREQUISITE = -2
+
+# Runtime character key holding the character's QuestTracker (not saved)
+TRACKER_KEY = "quest_tracker"
+
+# ============================================================================
+# QUEST CATALOG
+# ============================================================================
+
+class QuestCatalog(Mapping):
+    """
+    Read-only {quest_id: quest_data} mapping with columnar indexes
+
+    Columns (one entry per quest, in catalog order):
+        required_level, reward_xp, reward_gold: integer arrays
+        prerequisite: index of the prerequisite quest, NO_PREREQUISITE for
+                      "NONE", or COMPOUND_PREREQUISITE for anything else
+                      (several prerequisites, alternatives, or a quest
+                      that is not in the catalog)
+
+    Completed quests are passed around as bitsets: an int whose bit i is
+    set when quest i (in catalog order) is completed. Compound
+    prerequisites are stored as one bit mask per clause, so checking them
+    takes a few bitwise operations.
+
+    The prerequisite graph (see QuestGraph) is built with the catalog, so
+    a prerequisite cycle is reported when the catalog is loaded.
+
+    The wrapped dictionary must not be modified after the catalog is
+    built; build a new catalog (with a new version) instead.
+
+    Raises: InvalidDataFormatError if the prerequisites contain a cycle
+    """
+
+    def __init__(self, quests, version=0):
+        self._quests = quests
+        self.version = version
+        self.graph = QuestGraph(quests)
+        self.ids = list(quests)
+        self._values = list(quests.values())
+        self.index = {quest_id: i for i, quest_id in enumerate(self.ids)}
+
+        levels = []
+        xp = []
+        gold = []
+        prereqs = []
+        # Compound prerequisites: {index: ((mask, unknown_ids), ...)} with
+        # one entry per clause. Ids that are not in the catalog can still
+        # be satisfied by a completed_quests entry, so they are kept by id.
+        self._requirements = {}
+        # Reverse indexes used by QuestTracker
+        self.dependents = [[] for _ in self.ids]
+        self.unknown_dependents = {}
+
+        index = self.index
+        for i, quest_id in enumerate(self.ids):
+            quest = quests[quest_id]
+            levels.append(quest["required_level"])
+            xp.append(quest["reward_xp"])
+            gold.append(quest["reward_gold"])
+
+            clauses = prerequisite_clauses(quest)
+            if not clauses:
+                prereqs.append(NO_PREREQUISITE)
+                continue
+            if len(clauses) == 1 and len(clauses[0]) == 1 and clauses[0][0] in index:
+                prereqs.append(index[clauses[0][0]])
+                self.dependents[index[clauses[0][0]]].append(i)
+                continue
+
+            prereqs.append(COMPOUND_PREREQUISITE)
+            requirement = []
+            for clause in clauses:
+                mask = 0
+                unknown = []
+                for prereq in clause:
+                    if prereq in index:
+                        mask |= 1 << index[prereq]
+                        if i not in self.dependents[index[prereq]]:
+                            self.dependents[index[prereq]].append(i)
+                    else:
+                        unknown.append(prereq)
+                        self.unknown_dependents.setdefault(prereq, []).append(i)
+                requirement.append((mask, tuple(unknown)))
+            self._requirements[i] = tuple(requirement)
+
+        self.required_level = _int_column(levels)
+        self.reward_xp = _int_column(xp)
+        self.reward_gold = _int_column(gold)
+        self.prerequisite = _int_column(prereqs)
+
+        # Level index: quest indices sorted by required_level (ties keep
+        # catalog order) and the matching sorted levels for bisect
+        if numpy is not None:
+            self.level_order = numpy.argsort(self.required_level, kind="stable")
+        else:
+            self.level_order = array("q", sorted(range(len(levels)), key=levels.__getitem__))
+        self._level_keys = array("q", (levels[i] for i in self.level_order))
+        self._root_xp_order = None
+
+    # ---- mapping interface ----
+
+    def __getitem__(self, quest_id):
+        return self._quests[quest_id]
+
+    def __contains__(self, quest_id):
+        return quest_id in self._quests
+
+    def __iter__(self):
+        return iter(self._quests)
+
+    def __len__(self):
+        return len(self._quests)
+
+    # ---- queries ----
+
+    def quests_by_level(self, min_level, max_level):
+        """
+        Get all quests with min_level <= required_level <= max_level
+
+        Uses the level index, so the cost is O(log n + k log k) for k
+        results (they are sorted back into catalog order).
+
+        Returns: List of quest data in catalog order, like the dictionary
+                 path of quest_handler.get_quests_by_level
+        """
+        indices = self.level_range(min_level, max_level)
+        if numpy is not None:
+            return self._select(numpy.sort(indices))
+        return self._select(sorted(indices))
+
+    def level_range(self, min_level, max_level):
+        """
+        Dense indices of the quests with min_level <= required_level <= max_level
+
+        A min_level of None means no lower bound.
+
+        Returns: Slice of level_order (sorted by required_level)
+        """
+        start = 0 if min_level is None else bisect_left(self._level_keys, min_level)
+        end = bisect_right(self._level_keys, max_level)
+        return self.level_order[start:end]
+
+    def root_quests_by_xp(self):
+        """
+        Quests that do not require another catalog quest, grouped by
+        required_level with the highest reward_xp first
+
+        Built on first use and kept for the life of the catalog.
+
+        Returns: List of (level, [indices]) tuples in level order
+        """
+        if self._root_xp_order is None:
+            xp = list(self.reward_xp)
+            groups = []
+            for i in self.level_order:
+                i = int(i)
+                prereq = self.prerequisite[i]
+                if prereq >= 0:
+                    continue
+                if prereq == COMPOUND_PREREQUISITE and any(
+                        mask for mask, _ in self._requirements[i]):
+                    continue
+                level = int(self.required_level[i])
+                if not groups or groups[-1][0] != level:
+                    groups.append((level, []))
+                groups[-1][1].append(i)
+            for _, group in groups:
+                group.sort(key=lambda i: -xp[i])
+            self._root_xp_order = groups
+        return self._root_xp_order
+
+    def completed_bits(self, quest_ids):
+        """
+        Bitset of the catalog quests in quest_ids (ids not in the catalog
+        are skipped)
+
+        Returns: int with bit i set when quest i is in quest_ids
+        """
+        return _bitset(self._indices(quest_ids), len(self.ids))
+
+    def available_quests(self, character):
+        """
+        Get quests the character can accept right now
+
+        Available = meets level req + prerequisite done + not completed +
+                    not active (same rules as quest_handler.accept_quest)
+
+        Returns: List of quest data in catalog order
+        """
+        return self._select(self._available_indices(character))
+
+    def _available_indices(self, character):
+        """Dense indices of the quests available_quests would return"""
+        level = character["level"]
+        completed_ids = character["completed_quests"]
+        completed = self._indices(completed_ids)
+        active = self._indices(character["active_quests"])
+        # Quests above the character's level are never looked at
+        candidates = self.level_order[:bisect_right(self._level_keys, level)]
+
+        if numpy is not None:
+            done = numpy.zeros(len(self.ids) + 1, dtype=bool)
+            done[completed] = True
+            taken = done.copy()
+            taken[active] = True
+
+            # Negative prerequisite codes index the padding slot at the end
+            # (always False) instead of wrapping around to a real quest
+            prereq = self.prerequisite[candidates]
+            prereq_done = done[numpy.where(prereq >= 0, prereq, -1)]
+            mask = ~taken[candidates] & ((prereq == NO_PREREQUISITE) | prereq_done)
+
+            if self._requirements:
+                completed_bits = _bitset(completed, len(self.ids))
+                completed_set = set(completed_ids)
+                for position in numpy.flatnonzero(prereq == COMPOUND_PREREQUISITE):
+                    i = int(candidates[position])
+                    if not taken[i]:
+                        mask[position] = self.requirements_met(i, completed_bits, completed_set)
+
+            return numpy.sort(candidates[mask]).tolist()
+
+        done = set(completed)
+        taken = done.union(active)
+        if self._requirements:
+            completed_bits = _bitset(completed, len(self.ids))
+            completed_set = set(completed_ids)
+        selected = []
+        for i in candidates:
+            if i in taken:
+                continue
+            prereq = self.prerequisite[i]
+            if prereq == COMPOUND_PREREQUISITE:
+                if not self.requirements_met(i, completed_bits, completed_set):
+                    continue
+            elif prereq != NO_PREREQUISITE and prereq not in done:
+                continue
+            selected.append(i)
+        selected.sort()
+        return selected
+
+    def requirements_met(self, i, completed_bits, completed_ids):
+        """
+        Check whether quest i's prerequisites are met
+
+        Args:
+            i: Dense index of the quest
+            completed_bits: Bitset of completed quest indices
+            completed_ids: Set of completed quest ids (for prerequisites
+                           that are not in the catalog)
+
+        Returns: True if every clause has at least one completed quest
+        """
+        prereq = int(self.prerequisite[i])
+        if prereq == NO_PREREQUISITE:
+            return True
+        if prereq != COMPOUND_PREREQUISITE:
+            return bool(completed_bits >> prereq & 1)
+
+        for mask, unknown in self._requirements[i]:
+            if completed_bits & mask:
+                continue
+            if not any(quest_id in completed_ids for quest_id in unknown):
+                return False
+        return True
+
+    def total_rewards(self, quest_ids):
+        """
+        Sum reward_xp and reward_gold over quest_ids
+
+        Ids not in the catalog are skipped; repeated ids count each time.
+
+        Returns: Tuple (total_xp, total_gold)
+        """
+        indices = self._indices(quest_ids)
+
+        if numpy is not None:
+            return (int(self.reward_xp[indices].sum()),
+                    int(self.reward_gold[indices].sum()))
+
+        return (sum(self.reward_xp[i] for i in indices),
+                sum(self.reward_gold[i] for i in indices))
+
+    def tracker(self, character):
+        """
+        Get the character's QuestTracker for this catalog
+
+        The tracker is kept on the character under TRACKER_KEY and is
+        rebuilt if it belongs to another catalog version.
+
+        Returns: QuestTracker
+        """
+        tracker = character.get(TRACKER_KEY)
+        if tracker is None or tracker.catalog is not self:
+            tracker = QuestTracker(self, character)
+            character[TRACKER_KEY] = tracker
+        return tracker
+
+    # ---- helpers ----
+
+    def _indices(self, quest_ids):
+        """Dense indices for the quest ids that are in the catalog"""
+        index = self.index
+        indices = [index[quest_id] for quest_id in quest_ids if quest_id in index]
+        if numpy is not None:
+            return numpy.array(indices, dtype=numpy.intp)
+        return indices
+
+    def _select(self, indices):
+        """Quest data for a sequence of dense indices"""
+        if numpy is not None and isinstance(indices, numpy.ndarray):
+            indices = indices.tolist()
+        values = self._values
+        return [values[i] for i in indices]
+
+# ============================================================================
+# PREREQUISITE GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Prerequisite DAG for a set of quests
+
+    Built once per catalog version. Holds:
+        order: quest ids in topological order (prerequisites first)
+        position: {quest_id: index in order}
+        depth: {quest_id: longest number of prerequisite steps above it}
+        dependents: {quest_id: [quest ids that require it]}
+
+    Every quest named in a prerequisite (including each alternative of an
+    "a | b" clause) is an edge. Prerequisites that are not in the quest set
+    are not edges; quests that depend on one (directly or through an
+    ancestor) are listed in missing with the id that could not be found.
+
+    Raises: InvalidDataFormatError if the prerequisites contain a cycle
+    """
+
+    def __init__(self, quests):
+        parents = {}
+        dependents = {quest_id: [] for quest_id in quests}
+        indegree = {}
+        missing = {}
+
+        for quest_id, quest in quests.items():
+            known = []
+            for clause in prerequisite_clauses(quest):
+                for prereq in clause:
+                    if prereq in quests:
+                        if prereq not in known:
+                            known.append(prereq)
+                            dependents[prereq].append(quest_id)
+                    elif quest_id not in missing:
+                        missing[quest_id] = prereq
+            if known:
+                parents[quest_id] = tuple(known)
+            indegree[quest_id] = len(known)
+
+        # Kahn's algorithm; depth is final once a quest is queued
+        order = [quest_id for quest_id, count in indegree.items() if count == 0]
+        depth = dict.fromkeys(order, 0)
+
+        position = 0
+        while position < len(order):
+            quest_id = order[position]
+            position += 1
+            for child in dependents[quest_id]:
+                depth[child] = max(depth.get(child, 0), depth[quest_id] + 1)
+                if quest_id in missing and child not in missing:
+                    missing[child] = missing[quest_id]
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    order.append(child)
+
+        if len(order) != len(quests):
+            settled = set(order)
+            raise InvalidDataFormatError(
+                f"Quest prerequisite cycle: {_find_cycle(parents, settled)}"
+            )
+
+        self.order = order
+        self.depth = depth
+        self.dependents = dependents
+        self.missing = missing
+        self._parents = parents
+        self.position = {quest_id: i for i, quest_id in enumerate(order)}
+        self._chains = {}
+
+    def chain(self, quest_id):
+        """
+        Get the prerequisite chain for a quest
+
+        For a quest with one prerequisite per step this is the path from
+        the earliest prerequisite down to the quest. When a quest has
+        several prerequisites (or alternatives), the chain holds every
+        quest above it, in topological order.
+
+        Chains are built once per quest from the nearest ancestor whose
+        chain is already known, then served from memory.
+
+        Returns: Tuple of quest ids [earliest_prereq, ..., quest_id]
+        Raises: QuestNotFoundError if the quest, or a prerequisite in its
+                chain, does not exist
+        """
+        chain = self._chains.get(quest_id)
+        if chain is not None:
+            return chain
+
+        if quest_id not in self.depth:
+            raise QuestNotFoundError(f"Quest '{quest_id}' does not exist.")
+        if quest_id in self.missing:
+            raise QuestNotFoundError(
+                f"Quest '{self.missing[quest_id]}' in chain does not exist."
+            )
+
+        # Walk up single-parent links to the first ancestor with a known
+        # chain, a root, or a quest with several parents
+        pending = []
+        current = quest_id
+        while current is not None and current not in self._chains:
+            parents = self._parents.get(current, ())
+            if len(parents) > 1:
+                self._chains[current] = self._merged_chain(current, parents)
+                break
+            pending.append(current)
+            current = parents[0] if parents else None
+
+        chain = self._chains[current] if current is not None else ()
+        for ancestor in reversed(pending):
+            chain = chain + (ancestor,)
+            self._chains[ancestor] = chain
+
+        return chain
+
+    def _merged_chain(self, quest_id, parents):
+        """Chain for a quest with several parents (all ancestors, in order)"""
+        ancestors = set()
+        stack = list(parents)
+        while stack:
+            current = stack.pop()
+            if current in ancestors:
+                continue
+            known = self._chains.get(current)
+            if known is not None:
+                ancestors.update(known)
+            else:
+                ancestors.add(current)
+                stack.extend(self._parents.get(current, ()))
+
+        return tuple(sorted(ancestors, key=self.position.__getitem__)) + (quest_id,)
+
+# ============================================================================
+# AVAILABILITY TRACKING
+# ============================================================================
+
+class QuestTracker:
+    """
+    Incrementally maintained set of quests a character can accept
+
+    quest_handler reports accepted, completed and abandoned quests, and
+    only the quests those changes can affect are re-checked: the quest
+    itself, or the quests that depend on a completed one. Level-ups are
+    picked up when the tracker is next read, by checking the quests the
+    level index lists between the old and new level.
+
+    The tracker also keeps running totals of the XP and gold rewards of
+    the character's completed quests, updated as quests are completed.
+
+    The tracker remembers which QuestLog objects it was built from and
+    their version counters. If a list is replaced or edited behind the
+    tracker's back, is a plain list (which has no counter), or the level
+    goes down, the tracker rebuilds itself from the character on the next
+    read.
+    """
+
+    def __init__(self, catalog, character):
+        self.catalog = catalog
+        self._rebuild(character)
+
+    def available(self, character):
+        """
+        Get quests the character can accept right now
+
+        Returns: List of quest data in catalog order
+        """
+        self._sync(character)
+        return self.catalog._select(sorted(self._available))
+
+    def rewards(self, character):
+        """
+        Get the XP and gold earned from the character's completed quests
+
+        Returns: Tuple (total_xp, total_gold)
+        """
+        self._sync(character)
+        return self._reward_xp, self._reward_gold
+
+    def can_accept(self, character, quest_id):
+        """
+        Check whether the character can accept quest_id right now
+
+        Returns: True if the quest is in the available set
+        """
+        self._sync(character)
+        return self.catalog.index.get(quest_id) in self._available
+
+    # ---- updates from quest_handler ----
+
+    def accepted(self, character, quest_id):
+        """Record that quest_id was added to active_quests"""
+        if self._expect(character, 1, 0):
+            i = self.catalog.index.get(quest_id)
+            if i is not None:
+                self._active.add(i)
+                self._available.discard(i)
+
+    def completed(self, character, quest_id):
+        """Record that quest_id moved from active_quests to completed_quests"""
+        if not self._expect(character, 1, 1):
+            return
+        if quest_id in self._completed_ids:
+            # Already counted (completed twice via a direct edit): rebuild
+            self._versions = None
+            return
+        catalog = self.catalog
+        self._completed_ids.add(quest_id)
+        i = catalog.index.get(quest_id)
+        if i is not None:
+            self._active.discard(i)
+            self._completed_bits |= 1 << i
+            self._available.discard(i)
+            self._reward_xp += int(catalog.reward_xp[i])
+            self._reward_gold += int(catalog.reward_gold[i])
+            dependents = catalog.dependents[i]
+        else:
+            dependents = catalog.unknown_dependents.get(quest_id, ())
+        for child in dependents:
+            self._check(child)
+
+    def abandoned(self, character, quest_id):
+        """Record that quest_id was removed from active_quests"""
+        if self._expect(character, 1, 0):
+            i = self.catalog.index.get(quest_id)
+            if i is not None:
+                self._active.discard(i)
+                self._check(i)
+
+    # ---- internals ----
+
+    def _rebuild(self, character):
+        """Recompute everything from the character's quest lists"""
+        catalog = self.catalog
+        self._level = character["level"]
+        self._lists, self._versions = _list_state(character)
+        self._completed_ids = set(character["completed_quests"])
+        index = catalog.index
+        self._completed_bits = catalog.completed_bits(self._completed_ids)
+        self._active = {index[quest_id] for quest_id in character["active_quests"]
+                        if quest_id in index}
+        self._available = set(catalog._available_indices(character))
+        self._reward_xp, self._reward_gold = catalog.total_rewards(character["completed_quests"])
+
+    def _sync(self, character):
+        """Catch up with level changes and untracked list edits"""
+        lists, versions = _list_state(character)
+        if (versions is None or versions != self._versions
+                or not _same_lists(lists, self._lists)
+                or character["level"] < self._level):
+            self._rebuild(character)
+            return
+
+        level = character["level"]
+        if level > self._level:
+            old_level = self._level
+            self._level = level
+            for i in self.catalog.level_range(old_level + 1, level):
+                self._check(int(i))
+
+    def _expect(self, character, active_edits, completed_edits):
+        """
+        Check that a reported change is the only edit made to the lists
+
+        active_edits / completed_edits are the number of mutating calls the
+        change made on each QuestLog.
+
+        Returns: True if the tracker can apply the change incrementally;
+                 otherwise it is left to rebuild on the next read
+        """
+        lists, versions = _list_state(character)
+        expected = (versions is not None and self._versions is not None
+                    and _same_lists(lists, self._lists)
+                    and versions == (self._versions[0] + active_edits,
+                                     self._versions[1] + completed_edits))
+        self._versions = versions if expected else None
+        return expected
+
+    def _check(self, i):
+        """Add quest i to the available set if it can be accepted"""
+        catalog = self.catalog
+        if i in self._active or self._completed_bits >> i & 1:
+            return
+        if catalog.required_level[i] > self._level:
+            return
+        if catalog.requirements_met(i, self._completed_bits, self._completed_ids):
+            self._available.add(i)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _int_column(values):
+    """Build an integer column (NumPy array if available)"""
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.int64)
+    return array("q", values)
+
+def _bitset(indices, size):
+    """Build an int with bit i set for each i in indices"""
+    bits = bytearray((size + 7) // 8)
+    for i in indices:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+def _list_state(character):
+    """
+    The character's (active, completed) quest lists and their versions
+
+    Returns: (lists, versions); versions is None if either list has no
+             version counter (e.g. a plain list), so edits cannot be seen
+    """
+    lists = (character["active_quests"], character["completed_quests"])
+    versions = tuple(getattr(quest_ids, "version", None) for quest_ids in lists)
+    if None in versions:
+        versions = None
+    return lists, versions
+
+def _same_lists(lists, other):
+    """True if both pairs hold the very same list objects"""
+    return lists[0] is other[0] and lists[1] is other[1]
+
+def _find_cycle(parents, settled):
+    """Describe one prerequisite cycle among the quests not in settled"""
+    start = next(quest_id for quest_id in parents if quest_id not in settled)
+
+    # Follow unsettled prerequisites until a quest repeats; every unsettled
+    # quest has at least one, since it is on or below a cycle
+    seen = {}
+    path = []
+    current = start
+    while current not in seen:
+        seen[current] = len(path)
+        path.append(current)
+        current = next(parent for parent in parents[current] if parent not in settled)
+
+    cycle = path[seen[current]:] + [current]
+    return " -> ".join(cycle)
@@ -9,13 +9,17 @@ AI Usage: Completed with assistance from ChatGPT
 This module handles quest management, dependencies, and completion.
 """
 
+import heapq
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
     QuestAlreadyCompletedError,
     QuestNotActiveError,
-    InsufficientLevelError
+    InsufficientLevelError,
+    InvalidDataFormatError
 )
+from game_data import prerequisite_clauses
+from quest_catalog import QuestCatalog, QuestGraph, TRACKER_KEY
 
 # ============================================================================
 # QUEST MANAGEMENT
@@ -32,7 +36,7 @@ def accept_quest(character, quest_id, quest_data_dict):
     
     Requirements to accept quest:
     - Character level >= quest required_level
-    - Prerequisite quest completed (if any)
+    - Prerequisite quests completed (if any; one of each "a | b" choice)
     - Quest not already completed
     - Quest not already active
     
@@ -78,14 +82,19 @@ def accept_quest(character, quest_id, quest_data_dict):
         )
 
     # --- Prerequisite requirement ---
-    prereq = quest["prerequisite"]
-    if prereq != "NONE" and prereq not in character["completed_quests"]:
+    clause = _unmet_prerequisite(quest, character["completed_quests"])
+    if clause is not None:
         raise QuestRequirementsNotMetError(
-            f"Must complete prerequisite quest '{prereq}' first."
+            f"Must complete prerequisite quest {' or '.join(map(repr, clause))} first."
         )
 
     # --- Accept quest ---
     character["active_quests"].append(quest_id)
+
+    tracker = character.get(TRACKER_KEY)
+    if tracker is not None:
+        tracker.accepted(character, quest_id)
+
     return True
 
 def complete_quest(character, quest_id, quest_data_dict):
@@ -134,6 +143,10 @@ def complete_quest(character, quest_id, quest_data_dict):
     character["active_quests"].remove(quest_id)
     character["completed_quests"].append(quest_id)
 
+    tracker = character.get(TRACKER_KEY)
+    if tracker is not None:
+        tracker.completed(character, quest_id)
+
     # --- Apply rewards ---
     xp_reward = quest["reward_xp"]
     gold_reward = quest["reward_gold"]
@@ -161,6 +174,11 @@ def abandon_quest(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active.")
 
     character["active_quests"].remove(quest_id)
+
+    tracker = character.get(TRACKER_KEY)
+    if tracker is not None:
+        tracker.abandoned(character, quest_id)
+
     return True
 
 
@@ -213,6 +231,10 @@ def get_available_quests(character, quest_data_dict):
     This does NOT raise errors — simply returns valid ones.
     """
 
+    if isinstance(quest_data_dict, QuestCatalog):
+        # Kept up to date by accept/complete/abandon_quest
+        return quest_data_dict.tracker(character).available(character)
+
     available = []
 
     for qid, quest in quest_data_dict.items():
@@ -229,8 +251,7 @@ def get_available_quests(character, quest_data_dict):
             continue
 
         # Prerequisite
-        prereq = quest["prerequisite"]
-        if prereq != "NONE" and prereq not in character["completed_quests"]:
+        if _unmet_prerequisite(quest, character["completed_quests"]) is not None:
             continue
 
         available.append(quest)
@@ -284,6 +305,10 @@ def can_accept_quest(character, quest_id, quest_data_dict):
     if quest_id not in quest_data_dict:
         return False
 
+    # The tracker checks prerequisites against a completed-quest bitset
+    if isinstance(quest_data_dict, QuestCatalog):
+        return quest_data_dict.tracker(character).can_accept(character, quest_id)
+
     quest = quest_data_dict[quest_id]
 
     if quest_id in character["completed_quests"]:
@@ -295,8 +320,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
     if character["level"] < quest["required_level"]:
         return False
 
-    prereq = quest["prerequisite"]
-    if prereq != "NONE" and prereq not in character["completed_quests"]:
+    if _unmet_prerequisite(quest, character["completed_quests"]) is not None:
         return False
 
     return True
@@ -310,6 +334,7 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
              Returns ["quest_a", "quest_b", "quest_c"]
     
     Raises: QuestNotFoundError if quest doesn't exist
+            InvalidDataFormatError if the chain runs into a cycle
     """
     # TODO: Implement prerequisite chain tracing
     # Follow prerequisite links backwards
@@ -324,24 +349,49 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     if quest_id not in quest_data_dict:
         raise QuestNotFoundError(f"Quest '{quest_id}' does not exist.")
 
+    if isinstance(quest_data_dict, QuestCatalog):
+        return list(quest_data_dict.graph.chain(quest_id))
+
     chain = []
+    seen = {}
     current = quest_id
 
     while True:
         if current not in quest_data_dict:
             raise QuestNotFoundError(f"Quest '{current}' in chain does not exist.")
 
+        # A cycle would otherwise loop forever; report it as QuestGraph does
+        if current in seen:
+            cycle = chain[seen[current]:] + [current]
+            raise InvalidDataFormatError(f"Quest prerequisite cycle: {' -> '.join(cycle)}")
+        seen[current] = len(chain)
+
         chain.append(current)
 
-        prereq = quest_data_dict[current]["prerequisite"]
-        if prereq == "NONE":
+        clauses = prerequisite_clauses(quest_data_dict[current])
+        if not clauses:
             break
 
-        current = prereq
+        # Several prerequisites: the chain is every quest above this one
+        if len(clauses) > 1 or len(clauses[0]) > 1:
+            return list(QuestGraph(quest_data_dict).chain(quest_id))
+
+        current = clauses[0][0]
 
     chain.reverse()
     return chain
 
+def _unmet_prerequisite(quest, completed_quests):
+    """
+    Find the first prerequisite clause with no completed quest
+
+    Returns: Tuple of alternative quest ids, or None if all are met
+    """
+    for clause in prerequisite_clauses(quest):
+        if not any(prereq in completed_quests for prereq in clause):
+            return clause
+    return None
+
 # ============================================================================
 # QUEST STATISTICS
 # ============================================================================
@@ -384,6 +434,11 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
     Returns: {'total_xp': X, 'total_gold': Y}
     """
 
+    # The tracker keeps running totals, updated by complete_quest
+    if isinstance(quest_data_dict, QuestCatalog):
+        total_xp, total_gold = quest_data_dict.tracker(character).rewards(character)
+        return {"total_xp": total_xp, "total_gold": total_gold}
+
     total_xp = 0
     total_gold = 0
 
@@ -407,6 +462,9 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     """
     Return all quests whose required_level is between min_level and max_level.
     """
+    if isinstance(quest_data_dict, QuestCatalog):
+        return quest_data_dict.quests_by_level(min_level, max_level)
+
     return [
         quest
         for quest in quest_data_dict.values()
@@ -414,6 +472,197 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     ]
 
 
+# ============================================================================
+# ROUTE PLANNING
+# ============================================================================
+
+def plan_quest_route(character, quest_data_dict, target_level=None, target_quest=None):
+    """
+    Plan a short list of quests that reaches a target level and/or quest
+    
+    Quest XP is applied with the character_manager.gain_experience curve
+    (level * 100 XP to go from level to level + 1, leftover XP carries
+    over). Active quests count as not yet completed.
+    
+    The route is built greedily: quests needed to unlock target_quest are
+    done as soon as they can be accepted, and when none can be, the
+    highest-XP quest available is done to level up. Candidates are read
+    lazily from QuestCatalog.root_quests_by_xp() and the prerequisite
+    graph, and quests at or above the highest level the route needs are
+    never considered as level-up fillers. The result is near-optimal
+    rather than guaranteed shortest.
+    
+    Pass a QuestCatalog for large quest sets; a plain dictionary is
+    wrapped in a catalog first.
+    
+    Args:
+        character: Character dictionary
+        quest_data_dict: Dictionary (or QuestCatalog) of all quest data
+        target_level: Level to reach (optional)
+        target_quest: Quest to complete (optional)
+    
+    Returns: List of quest IDs in the order to complete them ([] if the
+             targets are already met)
+    Raises:
+        ValueError if neither target is given
+        QuestNotFoundError if target_quest does not exist
+        QuestRequirementsNotMetError if no route reaches the targets
+    """
+    if target_level is None and target_quest is None:
+        raise ValueError("plan_quest_route needs a target_level or target_quest")
+
+    catalog = quest_data_dict
+    if not isinstance(catalog, QuestCatalog):
+        catalog = QuestCatalog(quest_data_dict)
+    if target_quest is not None and target_quest not in catalog:
+        raise QuestNotFoundError(f"Quest '{target_quest}' does not exist.")
+
+    level = character["level"]
+    xp = character.get("experience", 0)
+    completed_ids = set(character["completed_quests"])
+    completed_bits = catalog.completed_bits(completed_ids)
+
+    required = set()
+    if target_quest is not None and target_quest not in completed_ids:
+        required = _route_requirements(catalog, target_quest, completed_ids)
+
+    # Filler quests are only needed below this level
+    needed_level = max([target_level or 0] +
+                       [int(catalog.required_level[i]) for i in required])
+
+    # Fillers are quests without a prerequisite, read one level at a time
+    # from the catalog's XP order (the heap entry remembers its level
+    # bucket), plus quests unlocked by completed prerequisites (bucket -1).
+    # Unlocked quests above the character's level wait in a level heap.
+    buckets = catalog.root_quests_by_xp()
+    next_position = [0] * len(buckets)
+    opened = 0
+    required_heap = []
+    filler_heap = []
+    waiting = []
+    queued = set()
+
+    def can_accept(i):
+        return (i not in queued
+                and not completed_bits >> i & 1
+                and catalog.requirements_met(i, completed_bits, completed_ids))
+
+    def refill(bucket):
+        """Queue the best quest still waiting in a level bucket"""
+        quests = buckets[bucket][1]
+        position = next_position[bucket]
+        while position < len(quests):
+            i = quests[position]
+            position += 1
+            if i not in required and can_accept(i):
+                queued.add(i)
+                heapq.heappush(filler_heap, (-int(catalog.reward_xp[i]), i, bucket))
+                break
+        next_position[bucket] = position
+
+    def unlock(i):
+        """Queue a filler whose prerequisites may have just been met"""
+        quest_level = int(catalog.required_level[i])
+        if i in required or quest_level >= needed_level or not can_accept(i):
+            return
+        queued.add(i)
+        if quest_level > level:
+            heapq.heappush(waiting, (quest_level, i))
+        else:
+            heapq.heappush(filler_heap, (-int(catalog.reward_xp[i]), i, -1))
+
+    for quest_id in completed_ids:
+        if quest_id in catalog.index:
+            for child in catalog.dependents[catalog.index[quest_id]]:
+                unlock(child)
+
+    route = []
+    remaining = len(required)
+    while True:
+        # Bring in what the character's level now allows
+        while (opened < len(buckets) and buckets[opened][0] <= level
+               and buckets[opened][0] < needed_level):
+            refill(opened)
+            opened += 1
+        while waiting and waiting[0][0] <= level:
+            _, i = heapq.heappop(waiting)
+            heapq.heappush(filler_heap, (-int(catalog.reward_xp[i]), i, -1))
+        for i in required:
+            if catalog.required_level[i] <= level and can_accept(i):
+                queued.add(i)
+                heapq.heappush(required_heap, (catalog.graph.position[catalog.ids[i]], i))
+
+        if not remaining and level >= needed_level:
+            return route
+
+        if required_heap:
+            _, i = heapq.heappop(required_heap)
+            remaining -= 1
+        elif filler_heap:
+            _, i, bucket = heapq.heappop(filler_heap)
+            if bucket >= 0:
+                refill(bucket)
+        else:
+            raise QuestRequirementsNotMetError("No quest route reaches the target.")
+
+        route.append(catalog.ids[i])
+        completed_ids.add(catalog.ids[i])
+        completed_bits |= 1 << i
+
+        # Same curve as character_manager.gain_experience
+        xp += int(catalog.reward_xp[i])
+        while xp >= level * 100:
+            xp -= level * 100
+            level += 1
+
+        for child in catalog.dependents[i]:
+            unlock(child)
+
+def _route_requirements(catalog, target_quest, completed_ids):
+    """
+    Smallest set of quests that must be completed to finish target_quest
+    
+    Each quest's requirement set is worked out once, in topological
+    order. For an "a | b" choice the alternative whose set needs the
+    lowest level is taken (the smaller set on a tie), since levels are
+    what make a route long. Shared ancestors are not credited, so with OR
+    choices the set can be larger than the true minimum.
+    
+    Returns: Set of dense catalog indices, including target_quest
+    Raises: QuestRequirementsNotMetError if target_quest cannot be unlocked
+    """
+    # Every uncompleted quest above the target, through all alternatives
+    ancestors = {target_quest}
+    stack = [target_quest]
+    while stack:
+        for clause in prerequisite_clauses(catalog[stack.pop()]):
+            for prereq in clause:
+                if prereq in catalog and prereq not in completed_ids and prereq not in ancestors:
+                    ancestors.add(prereq)
+                    stack.append(prereq)
+
+    # needs[quest_id] = (highest required level, set of quest ids)
+    needs = {}
+    for quest_id in sorted(ancestors, key=catalog.graph.position.__getitem__):
+        top_level = catalog[quest_id]["required_level"]
+        need = {quest_id}
+        for clause in prerequisite_clauses(catalog[quest_id]):
+            if any(prereq in completed_ids for prereq in clause):
+                continue
+            options = [needs[prereq] for prereq in clause if needs.get(prereq) is not None]
+            if not options:
+                need = None
+                break
+            option_level, option = min(options, key=lambda o: (o[0], len(o[1])))
+            top_level = max(top_level, option_level)
+            need |= option
+        needs[quest_id] = None if need is None else (top_level, need)
+
+    if needs[target_quest] is None:
+        raise QuestRequirementsNotMetError(f"Quest '{target_quest}' cannot be unlocked.")
+
+    return {catalog.index[quest_id] for quest_id in needs[target_quest][1]}
+
 # ============================================================================
 # DISPLAY FUNCTIONS
 # ============================================================================
@@ -487,10 +736,13 @@ def validate_quest_prerequisites(quest_data_dict):
     """
     Validate that all quest prerequisites exist
     
-    Checks that every prerequisite (that's not "NONE") refers to a real quest
+    Checks that every prerequisite (that's not "NONE"), including each
+    alternative of an "a | b" choice, refers to a real quest and that the
+    prerequisites do not form a cycle
     
     Returns: True if all valid
     Raises: QuestNotFoundError if invalid prerequisite found
+            InvalidDataFormatError if prerequisites form a cycle
     """
     # TODO: Implement prerequisite validation
     # Check each quest's prerequisite
@@ -502,11 +754,16 @@ def validate_quest_prerequisites(quest_data_dict):
     """
 
     for qid, quest in quest_data_dict.items():
-        prereq = quest["prerequisite"]
-        if prereq != "NONE" and prereq not in quest_data_dict:
-            raise QuestNotFoundError(
-                f"Quest '{qid}' has invalid prerequisite '{prereq}'."
-            )
+        for clause in prerequisite_clauses(quest):
+            for prereq in clause:
+                if prereq not in quest_data_dict:
+                    raise QuestNotFoundError(
+                        f"Quest '{qid}' has invalid prerequisite '{prereq}'."
+                    )
+
+    # A catalog checked for cycles when it was built
+    if not isinstance(quest_data_dict, QuestCatalog):
+        QuestGraph(quest_data_dict)
 
     return True
 
@@ -0,0 +1,246 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Scheduler Module
+
+This module provides write-behind saving for the game loop. The game asks
+for a save after every action; the scheduler snapshots the character's
+save text on the calling thread, drops the request if nothing changed
+since the last one, and lets a worker thread write the latest snapshot
+at most once per interval. Quitting, dying or a termination signal
+flushes anything still pending.
+
+With a storage backend (see save_storage) the pending characters are
+handed to its save_many in one batch, e.g. a single SQLite transaction.
+With journal=True each write appends only what changed to the
+character's save journal (see character_manager.journal_character).
+"""
+
+import signal
+import threading
+import time
+
+import character_manager
+
+# ============================================================================
+# SAVE SCHEDULER
+# ============================================================================
+
+class SaveScheduler:
+    """
+    Coalesces save requests into periodic background writes
+
+    Each character has a version counter that goes up whenever a request
+    carries different save text from the previous one; the worker writes
+    only the newest pending version. Counters (see stats()):
+        saves_requested: calls to request()
+        saves_changed:   requests whose state differed from the last one
+        saves_written:   saves actually written
+        bytes_written:   bytes in those saves (journal batches, if journaling)
+        save_errors:     failed writes (the snapshot is retried later)
+    """
+
+    def __init__(self, save_directory="data/save_games", interval=5.0, fsync=True,
+                 backend=None, journal=False):
+        self.save_directory = save_directory
+        self.interval = interval
+        self.fsync = fsync
+        self.backend = backend
+        self.journal = journal
+        self.last_error = None
+        self.versions = {}
+
+        self._pending = {}
+        self._last_text = {}
+        self._counters = dict.fromkeys(
+            ("saves_requested", "saves_changed", "saves_written",
+             "bytes_written", "save_errors"), 0)
+        self._condition = threading.Condition()
+        # Held while snapshots are taken and written, so an older
+        # snapshot can never be written after a newer one
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="save-scheduler",
+                                        daemon=True)
+        self._thread.start()
+
+    def request(self, character):
+        """
+        Ask for the character to be saved
+
+        The save text is built now, on the calling thread, so later changes
+        to the character do not leak into this snapshot.
+
+        Returns: True if the state changed since the last request
+        """
+        name = character["name"]
+        text = character_manager.format_save_data(character)
+
+        with self._condition:
+            self._counters["saves_requested"] += 1
+            if self._last_text.get(name) == text:
+                return False
+            self._last_text[name] = text
+            self.versions[name] = self.versions.get(name, 0) + 1
+            self._counters["saves_changed"] += 1
+            snapshot = _snapshot(character) if self.backend or self.journal else None
+            self._pending[name] = (text, snapshot)
+            self._condition.notify()
+        return True
+
+    def flush(self):
+        """
+        Write every pending snapshot now, on the calling thread
+
+        Raises: The first write error (other snapshots are still written)
+        """
+        errors = self._write_pending()
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        """Flush pending saves and stop the worker thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self.flush()
+
+    def stats(self):
+        """
+        Get the scheduler counters
+
+        Returns: Dictionary of counter name -> value
+        """
+        with self._condition:
+            return dict(self._counters, pending=len(self._pending))
+
+    def install_signal_handlers(self, signals=None):
+        """
+        Make termination signals unwind the program so pending saves are flushed
+
+        Must be called from the main thread. The handler itself never
+        writes: the main thread may be inside flush() holding the write
+        lock when the signal arrives. It runs the previous handler, or
+        raises SystemExit (code 128 + signal) so the caller's
+        "finally: scheduler.close()" writes the pending saves on the way out.
+
+        Args:
+            signals: Signal numbers to handle (default: SIGTERM, and SIGHUP
+                     where the platform has it)
+        """
+        if signals is None:
+            signals = [signal.SIGTERM]
+            if hasattr(signal, "SIGHUP"):
+                signals.append(signal.SIGHUP)
+
+        for signum in signals:
+            previous = signal.getsignal(signum)
+            signal.signal(signum, self._signal_handler(previous))
+
+    # ---- internals ----
+
+    def _signal_handler(self, previous):
+        def handler(signum, frame):
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                raise SystemExit(128 + signum)
+        return handler
+
+    def _run(self):
+        """Worker thread: write pending snapshots at most once per interval"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+
+                # Let more changes collect before writing
+                deadline = time.monotonic() + self.interval
+                while not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if self._closed:
+                    return
+
+            self._write_pending()
+
+    def _write_pending(self):
+        """
+        Write and clear the pending snapshots
+
+        Returns: List of exceptions from failed writes
+        """
+        errors = []
+        with self._write_lock:
+            with self._condition:
+                pending = self._pending
+                self._pending = {}
+
+            if self.backend is not None:
+                batches = [pending] if pending else []
+            else:
+                batches = [{name: entry} for name, entry in pending.items()]
+
+            written = 0
+            try:
+                for batch in batches:
+                    try:
+                        size = self._write(batch)
+                    except Exception as e:
+                        errors.append(e)
+                        with self._condition:
+                            self.last_error = e
+                            self._counters["save_errors"] += 1
+                        self._requeue([batch])
+                        written += 1
+                        continue
+
+                    written += 1
+                    with self._condition:
+                        self._counters["saves_written"] += len(batch)
+                        self._counters["bytes_written"] += size
+            except BaseException:
+                # Interrupted, e.g. SystemExit from a signal handler: keep
+                # every batch not yet written for close() to retry
+                self._requeue(batches[written:])
+                raise
+
+        return errors
+
+    def _requeue(self, batches):
+        """Put unwritten batches back unless a newer snapshot replaced them"""
+        with self._condition:
+            for batch in batches:
+                for name, entry in batch.items():
+                    self._pending.setdefault(name, entry)
+
+    def _write(self, batch):
+        """
+        Write one batch of {name: (text, snapshot)}
+
+        Returns: Bytes written (the size of the save text for backends)
+        """
+        if self.backend is not None:
+            self.backend.save_many([snapshot for _, snapshot in batch.values()])
+            return sum(len(text.encode("utf-8")) for text, _ in batch.values())
+
+        (name, (text, snapshot)), = batch.items()
+        if self.journal:
+            return character_manager.journal_character(snapshot, self.save_directory, self.fsync)
+        return character_manager.write_save_data(name, text, self.save_directory, self.fsync)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _snapshot(character):
+    """Copy of the character whose lists later game actions cannot change"""
+    snapshot = dict(character)
+    for field in ("inventory", "active_quests", "completed_quests"):
+        if field in snapshot:
+            snapshot[field] = snapshot[field].copy()
+    return snapshot
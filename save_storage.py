@@ -0,0 +1,331 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Storage Module
+
+This module puts character storage behind a small backend interface so
+saves can live somewhere other than one text file per character. Every
+backend has the same methods:
+
+    save(character)              -> True
+    save_many(characters)        -> number saved
+    load(character_name)         -> character dictionary
+    list_names()                 -> list of character names
+    list_summaries()             -> name / class / level / modified / size
+                                    dictionaries (see
+                                    character_manager.list_character_summaries)
+    delete(character_name)       -> True
+    close()
+
+character_manager.save_character / load_character / list_saved_characters /
+delete_character take an optional backend and hand the call to it.
+
+Backends:
+    TextSaveBackend:   the {name}_save.txt files in a directory (the default)
+    SQLiteSaveBackend: one SQLite database in WAL mode; one row per
+                       character, batched writes in a single transaction
+
+Usage (migration):
+    python save_storage.py --from text:data/save_games --to sqlite:data/saves.db
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+import threading
+
+import character_manager
+from character_manager import QuestLog
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+# Bumped when the SQLite table layout changes (stored in PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+# Stat columns, in table order
+NUMERIC_FIELDS = ("level", "health", "max_health", "strength", "magic",
+                  "experience", "gold")
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+COLUMNS = ("name", "class") + NUMERIC_FIELDS + LIST_FIELDS
+
+# ============================================================================
+# TEXT BACKEND
+# ============================================================================
+
+class TextSaveBackend:
+    """One {name}_save.txt file per character (character_manager's format)"""
+
+    def __init__(self, save_directory="data/save_games", fsync=True):
+        self.save_directory = save_directory
+        self.fsync = fsync
+
+    def save(self, character):
+        return character_manager.save_character(character, self.save_directory, self.fsync)
+
+    def save_many(self, characters):
+        return character_manager.save_characters(characters, self.save_directory, self.fsync)
+
+    def load(self, character_name):
+        return character_manager.load_character(character_name, self.save_directory)
+
+    def list_names(self):
+        return character_manager.list_saved_characters(self.save_directory)
+
+    def list_summaries(self):
+        return character_manager.list_character_summaries(self.save_directory)
+
+    def delete(self, character_name):
+        return character_manager.delete_character(character_name, self.save_directory)
+
+    def close(self):
+        pass
+
+    def __repr__(self):
+        return f"TextSaveBackend({self.save_directory!r})"
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS characters (
+        name TEXT PRIMARY KEY,
+        class TEXT NOT NULL,
+        level INTEGER NOT NULL,
+        health INTEGER NOT NULL,
+        max_health INTEGER NOT NULL,
+        strength INTEGER NOT NULL,
+        magic INTEGER NOT NULL,
+        experience INTEGER NOT NULL,
+        gold INTEGER NOT NULL,
+        inventory TEXT NOT NULL,
+        active_quests TEXT NOT NULL,
+        completed_quests TEXT NOT NULL
+    )
+"""
+
+# Constant statement text, so sqlite3's statement cache prepares each once
+_UPSERT = (f"INSERT OR REPLACE INTO characters ({', '.join(COLUMNS)}) "
+           f"VALUES ({', '.join('?' * len(COLUMNS))})")
+_SELECT = f"SELECT {', '.join(COLUMNS)} FROM characters WHERE name = ?"
+_SELECT_NAMES = "SELECT name FROM characters ORDER BY name"
+_SELECT_SUMMARIES = "SELECT name, class, level FROM characters ORDER BY name"
+_DELETE = "DELETE FROM characters WHERE name = ?"
+
+class SQLiteSaveBackend:
+    """
+    All characters in one SQLite database file
+
+    The database runs in WAL mode, so reads do not block the writer, with
+    synchronous=NORMAL (FULL when fsync is True, so each commit is on disk
+    before save returns). save_many writes every character in one
+    transaction with executemany. Lists are stored comma-separated, as in
+    the text saves.
+
+    The connection may be shared with a background thread (see
+    save_scheduler); a lock serialises access to it.
+    """
+
+    def __init__(self, path="data/saves.db", fsync=True):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(f"PRAGMA synchronous={'FULL' if fsync else 'NORMAL'}")
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise SaveFileCorruptedError(
+                    f"Save database {path} has schema version {version}, "
+                    f"newer than supported ({SCHEMA_VERSION})")
+            with self._connection:
+                self._connection.execute(_CREATE_TABLE)
+                self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.DatabaseError as e:
+            self._connection.close()
+            raise SaveFileCorruptedError(f"Could not open save database {path}: {e}")
+        except BaseException:
+            self._connection.close()
+            raise
+
+    def save(self, character):
+        self.save_many([character])
+        return True
+
+    def save_many(self, characters):
+        rows = [_character_row(character) for character in characters]
+        with self._lock, self._connection:
+            self._connection.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def load(self, character_name):
+        try:
+            with self._lock:
+                row = self._connection.execute(_SELECT, (character_name,)).fetchone()
+        except sqlite3.DatabaseError as e:
+            raise SaveFileCorruptedError(f"Could not read save for: {character_name} ({e})")
+
+        if row is None:
+            raise CharacterNotFoundError(f"No save for: {character_name}")
+        return _row_character(row)
+
+    def list_names(self):
+        with self._lock:
+            return [name for (name,) in self._connection.execute(_SELECT_NAMES)]
+
+    def list_summaries(self):
+        # Rows do not record when or how big they were saved
+        with self._lock:
+            rows = self._connection.execute(_SELECT_SUMMARIES).fetchall()
+        return [{"name": name, "class": character_class, "level": level,
+                 "modified": None, "size": None}
+                for name, character_class, level in rows]
+
+    def delete(self, character_name):
+        with self._lock, self._connection:
+            deleted = self._connection.execute(_DELETE, (character_name,)).rowcount
+        if not deleted:
+            raise CharacterNotFoundError(f"No save found for: {character_name}")
+        return True
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __repr__(self):
+        return f"SQLiteSaveBackend({self.path!r})"
+
+# ============================================================================
+# BACKEND SELECTION AND MIGRATION
+# ============================================================================
+
+def open_backend(spec, fsync=True, create=True):
+    """
+    Open a backend from a "kind:location" string
+
+    Examples: "text:data/save_games", "sqlite:data/saves.db"
+
+    Args:
+        spec: "kind:location" string
+        fsync: Passed to the backend
+        create: If False, the directory or database must already exist
+                (a migration source should not be created empty)
+
+    Returns: Backend instance
+    Raises: ValueError for an unknown kind, FileNotFoundError if create is
+            False and the location does not exist, SaveFileCorruptedError
+            if a database cannot be opened
+    """
+    kind, _, location = spec.partition(":")
+    if kind == "text":
+        location = location or "data/save_games"
+        backend_class = TextSaveBackend
+    elif kind == "sqlite":
+        location = location or "data/saves.db"
+        backend_class = SQLiteSaveBackend
+    else:
+        raise ValueError(f"Unknown save backend '{kind}' (expected text or sqlite)")
+
+    if not create and not os.path.exists(location):
+        raise FileNotFoundError(f"No saves at {location}")
+    return backend_class(location, fsync)
+
+def migrate(source, destination, batch_size=500):
+    """
+    Copy every character from one backend to another
+
+    Characters are written in batches of batch_size (one transaction or
+    one group fsync per batch). Saves that cannot be loaded are skipped
+    and reported rather than stopping the migration.
+
+    Returns: (number migrated, list of (name, error message) skipped)
+    """
+    migrated = 0
+    skipped = []
+    batch = []
+
+    for name in source.list_names():
+        try:
+            batch.append(source.load(name))
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as e:
+            skipped.append((name, str(e)))
+            continue
+        if len(batch) >= batch_size:
+            migrated += destination.save_many(batch)
+            batch = []
+
+    if batch:
+        migrated += destination.save_many(batch)
+
+    return migrated, skipped
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _character_row(character):
+    """Character dictionary -> row tuple in COLUMNS order"""
+    return (
+        (character["name"], character["class"])
+        + tuple(int(character[field]) for field in NUMERIC_FIELDS)
+        + tuple(",".join(character.get(field, [])) for field in LIST_FIELDS)
+    )
+
+def _row_character(row):
+    """Row tuple -> validated character dictionary"""
+    character = dict(zip(COLUMNS, row))
+    character["inventory"] = [x for x in character["inventory"].split(",") if x]
+    for field in ("active_quests", "completed_quests"):
+        character[field] = QuestLog(x for x in character[field].split(",") if x)
+
+    character_manager.validate_character_data(character)
+    return character
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+
+def main(argv=None):
+    """Migrate saves between backends from the command line"""
+    parser = argparse.ArgumentParser(description="Copy character saves between storage backends")
+    parser.add_argument("--from", dest="source", default="text:data/save_games",
+                        help="source backend, e.g. text:data/save_games")
+    parser.add_argument("--to", dest="destination", default="sqlite:data/saves.db",
+                        help="destination backend, e.g. sqlite:data/saves.db")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="characters written per transaction")
+    args = parser.parse_args(argv)
+
+    try:
+        source = open_backend(args.source, create=False)
+    except (ValueError, OSError, SaveFileCorruptedError) as e:
+        print(f"Cannot read {args.source}: {e}", file=sys.stderr)
+        return 2
+    try:
+        destination = open_backend(args.destination)
+    except (ValueError, OSError, SaveFileCorruptedError) as e:
+        source.close()
+        print(f"Cannot write {args.destination}: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        migrated, skipped = migrate(source, destination, max(1, args.batch_size))
+    finally:
+        source.close()
+        destination.close()
+
+    print(f"Migrated {migrated} character(s) from {args.source} to {args.destination}")
+    for name, error in skipped:
+        print(f"Skipped {name}: {error}")
+    # 0: everything copied, 1: some saves skipped, 2: a backend could not be opened
+    return 1 if skipped else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Test Atomic Saves
+Tests that save files are replaced atomically and temp files cleaned up
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def make_characters(count, gold):
+    characters = []
+    for i in range(count):
+        char = character_manager.create_character(f"Atomic{i}", "Warrior")
+        char["gold"] = gold
+        characters.append(char)
+    return characters
+
+def temp_files(save_dir):
+    return [name for name in os.listdir(save_dir) if name.endswith(".tmp")]
+
+def saved_gold(save_dir, count):
+    return [character_manager.load_character(f"Atomic{i}", save_dir)["gold"]
+            for i in range(count)]
+
+# ============================================================================
+# SINGLE SAVE TESTS
+# ============================================================================
+
+def test_failed_rename_keeps_old_save(tmp_path, monkeypatch):
+    """A save that fails before the rename leaves the old save and no temp file"""
+    save_dir = str(tmp_path)
+    char, = make_characters(1, 100)
+    character_manager.save_character(char, save_dir, fsync=False)
+
+    def fail_replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    char["gold"] = 999
+    with pytest.raises(OSError):
+        character_manager.save_character(char, save_dir, fsync=False)
+    monkeypatch.undo()
+
+    assert saved_gold(save_dir, 1) == [100]
+    assert temp_files(save_dir) == []
+
+def test_save_flushes_file_and_directory(tmp_path, monkeypatch):
+    """fsync=True flushes the new save and the directory entry"""
+    save_dir = str(tmp_path)
+    synced = []
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        synced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    char, = make_characters(1, 100)
+    character_manager.save_character(char, save_dir)
+    assert len(synced) == 2
+
+    synced.clear()
+    character_manager.save_character(char, save_dir, fsync=False)
+    assert synced == []
+
+# ============================================================================
+# GROUP SAVE TESTS
+# ============================================================================
+
+def test_group_save_uses_one_directory_fsync(tmp_path, monkeypatch):
+    """save_characters flushes each file and the directory once"""
+    save_dir = str(tmp_path)
+    synced = []
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        synced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+    assert character_manager.save_characters(make_characters(5, 100), save_dir) == 5
+    assert len(synced) == 5 + 1
+    assert saved_gold(save_dir, 5) == [100] * 5
+
+def test_group_save_failure_cleans_up(tmp_path, monkeypatch):
+    """Saves renamed before a failure stay, the rest keep their old save"""
+    save_dir = str(tmp_path)
+    character_manager.save_characters(make_characters(4, 100), save_dir, fsync=False)
+
+    real_replace = os.replace
+    calls = []
+
+    def fail_third_replace(source, destination):
+        calls.append(destination)
+        if len(calls) == 3:
+            raise OSError("disk full")
+        real_replace(source, destination)
+
+    monkeypatch.setattr(os, "replace", fail_third_replace)
+    with pytest.raises(OSError):
+        character_manager.save_characters(make_characters(4, 200), save_dir, fsync=False)
+    monkeypatch.undo()
+
+    assert saved_gold(save_dir, 4) == [200, 200, 100, 100]
+    assert temp_files(save_dir) == []
+
+def test_group_save_fsync_failure_writes_nothing(tmp_path, monkeypatch):
+    """If flushing the temp files fails, no save is replaced"""
+    save_dir = str(tmp_path)
+    character_manager.save_characters(make_characters(3, 100), save_dir, fsync=False)
+
+    def fail_fsync(filename):
+        raise OSError("I/O error")
+
+    monkeypatch.setattr(character_manager, "_fsync_file", fail_fsync)
+    with pytest.raises(OSError):
+        character_manager.save_characters(make_characters(3, 200), save_dir)
+    monkeypatch.undo()
+
+    assert saved_gold(save_dir, 3) == [100] * 3
+    assert temp_files(save_dir) == []
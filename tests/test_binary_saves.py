@@ -0,0 +1,121 @@
+"""
+Test Binary Saves
+Tests the binary save format and format detection on load
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import InvalidSaveDataError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def sample_character(name="BinaryTest"):
+    char = character_manager.create_character(name, "Rogue")
+    char["level"] = 7
+    char["experience"] = 1234
+    char["gold"] = 2**31 - 1
+    char["inventory"] = ["dagger", "potion", "potion", "cloak"]
+    char["active_quests"].extend(["orc_menace", "treasure_hunter"])
+    char["completed_quests"].extend(["first_steps", "goblin_hunter"])
+    return char
+
+def as_text_fields(character):
+    """Compare characters by what the text format would save"""
+    return character_manager.format_save_data(character)
+
+# ============================================================================
+# BINARY FORMAT TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("inventory", [[], ["a", "b", "c"], ["potion"] * 3, ["é", "ü"]])
+def test_binary_round_trip(inventory):
+    """encode/decode keeps every saved field, with or without repeats"""
+    char = sample_character()
+    char["inventory"] = inventory
+    data = character_manager.encode_binary_save(char)
+    assert data.startswith(character_manager.BINARY_MAGIC)
+
+    decoded = character_manager.decode_binary_save(data)
+    assert as_text_fields(decoded) == as_text_fields(char)
+    assert decoded["inventory"] == inventory
+
+def test_load_detects_either_format(tmp_path):
+    """load_character reads binary and text saves alike"""
+    save_dir = str(tmp_path)
+    char = sample_character()
+    character_manager.save_character(char, save_dir, fsync=False, binary=True)
+    with open(os.path.join(save_dir, "BinaryTest_save.txt"), "rb") as f:
+        assert f.read(4) == character_manager.BINARY_MAGIC
+    loaded = character_manager.load_character("BinaryTest", save_dir)
+    assert as_text_fields(loaded) == as_text_fields(char)
+
+    character_manager.save_character(char, save_dir, fsync=False)
+    with open(os.path.join(save_dir, "BinaryTest_save.txt"), "rb") as f:
+        assert f.read(5) == b"NAME:"
+    loaded = character_manager.load_character("BinaryTest", save_dir)
+    assert as_text_fields(loaded) == as_text_fields(char)
+
+def test_values_outside_the_format_are_rejected():
+    """Stats beyond int32 and NUL characters cannot be written"""
+    char = sample_character()
+    char["gold"] = 2**31
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.encode_binary_save(char)
+
+    char = sample_character()
+    char["inventory"] = ["bad\0item"]
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.encode_binary_save(char)
+
+def test_damaged_binary_saves_are_rejected():
+    """Truncated, resized or wrong-version data raises InvalidSaveDataError"""
+    data = character_manager.encode_binary_save(sample_character())
+    version_offset = len(character_manager.BINARY_MAGIC)
+    damaged = [
+        data[:10],
+        data[:-1],
+        data + b"x",
+        data[:version_offset] + b"\x63\x00" + data[version_offset + 2:],
+    ]
+    for raw in damaged:
+        with pytest.raises(InvalidSaveDataError):
+            character_manager.parse_save_data(raw, "BinaryTest")
+
+def test_switching_formats_keeps_one_save_file(tmp_path):
+    """Both formats share {name}_save.txt; listings and deletes see either"""
+    save_dir = str(tmp_path)
+    char = sample_character()
+    character_manager.save_character(char, save_dir, fsync=False)
+    character_manager.list_character_summaries(save_dir)
+
+    character_manager.save_character(char, save_dir, fsync=False, binary=True)
+    assert sorted(name for name in os.listdir(save_dir) if "_save" in name) == [
+        "BinaryTest_save.txt"]
+    summary, = character_manager.list_character_summaries(save_dir)
+    assert (summary["class"], summary["level"]) == ("Rogue", 7)
+
+    character_manager.rebuild_manifest(save_dir)
+    summary, = character_manager.list_character_summaries(save_dir)
+    assert (summary["class"], summary["level"]) == ("Rogue", 7)
+
+    assert character_manager.delete_character("BinaryTest", save_dir)
+    assert character_manager.list_saved_characters(save_dir) == []
+
+def test_inventory_repeats_use_references():
+    """Only a repeated inventory item switches on the reference table"""
+    char = sample_character()
+    width_offset = character_manager._BINARY_HEADER.size - 1
+
+    char["inventory"] = ["dagger", "cloak"]
+    assert character_manager.encode_binary_save(char)[width_offset] == 0
+    char["inventory"] = ["potion"] * 300
+    data = character_manager.encode_binary_save(char)
+    assert data[width_offset] == 1
+    assert character_manager.decode_binary_save(data)["inventory"] == ["potion"] * 300
@@ -0,0 +1,140 @@
+"""
+Test Character Manager
+Tests character progression and the quest log container
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from character_manager import QuestLog
+
+# ============================================================================
+# EXPERIENCE TESTS
+# ============================================================================
+
+def level_up_loop(character, xp_amount):
+    """gain_experience as it was before level-ups were computed in closed form"""
+    character["experience"] = character.get("experience", 0) + int(xp_amount)
+    while character["experience"] >= character["level"] * 100:
+        character["experience"] -= character["level"] * 100
+        character["level"] += 1
+        character["max_health"] = int(character.get("max_health", 0) + 10)
+        character["strength"] = int(character.get("strength", 0) + 2)
+        character["magic"] = int(character.get("magic", 0) + 2)
+        character["health"] = int(character["max_health"])
+    return character
+
+def assert_same_progress(level, experience, xp_amount):
+    char = character_manager.create_character("XPTest", "Mage")
+    char["level"] = level
+    char["experience"] = experience
+    char["health"] = 1
+    expected = level_up_loop(dict(char), xp_amount)
+    assert character_manager.gain_experience(char, xp_amount) == expected
+
+@pytest.mark.parametrize("level, experience, xp_amount", [
+    (1, 0, 0), (1, 0, 99), (1, 0, 100), (1, 0, 299), (1, 0, 300),
+    (1, 50, 250), (5, 0, 500), (5, 499, 1), (3, 0, -50), (1, 0, 10**9),
+    (40, 12345, 987654), (1, 250, 0),
+])
+def test_gain_experience_matches_loop(level, experience, xp_amount):
+    """Edge cases: exact thresholds, no XP, negative XP, huge XP"""
+    assert_same_progress(level, experience, xp_amount)
+
+def test_gain_experience_matches_loop_random():
+    """Random levels and XP amounts give the same result as the loop"""
+    rng = random.Random(19)
+    for _ in range(500):
+        level = rng.randint(1, 200)
+        experience = rng.randint(0, level * 100 - 1)
+        xp_amount = rng.choice([rng.randint(0, 1000), rng.randint(0, 10**6),
+                                rng.randint(0, 10**8)])
+        assert_same_progress(level, experience, xp_amount)
+
+def test_gain_experience_sequence_matches_loop():
+    """Many small gains end in the same state as the loop"""
+    rng = random.Random(7)
+    char = character_manager.create_character("XPTest", "Warrior")
+    expected = dict(char)
+    for _ in range(300):
+        xp_amount = rng.randint(0, 400)
+        character_manager.gain_experience(char, xp_amount)
+        level_up_loop(expected, xp_amount)
+    assert char == expected
+
+# ============================================================================
+# QUEST LOG TESTS
+# ============================================================================
+
+def test_quest_log_behaves_like_list():
+    """QuestLog supports the list operations the game uses, in order"""
+    log = QuestLog(["first_steps", "goblin_hunter"])
+    plain = ["first_steps", "goblin_hunter"]
+
+    for quest_log in (log, plain):
+        quest_log.append("orc_menace")
+        quest_log.remove("goblin_hunter")
+        quest_log.extend(["dragon_slayer", "treasure_hunter"])
+
+    assert log == plain
+    assert plain == log
+    assert list(log) == plain
+    assert len(log) == len(plain)
+    assert ",".join(log) == ",".join(plain)
+    assert [log[i] for i in range(len(log))] == plain
+    assert log[-1] == plain[-1] and log[1:3] == plain[1:3]
+    assert list(reversed(log)) == list(reversed(plain))
+    assert log.index("dragon_slayer") == plain.index("dragon_slayer")
+    assert "orc_menace" in log and "goblin_hunter" not in log
+    assert log.count("orc_menace") == 1 and log.count("goblin_hunter") == 0
+    assert repr(log) == f"QuestLog({plain!r})"
+    assert not QuestLog() and QuestLog() == []
+
+def test_quest_log_errors_and_duplicates():
+    """Missing ids raise ValueError like a list; duplicates are ignored"""
+    log = QuestLog(["first_steps"])
+    with pytest.raises(ValueError):
+        log.remove("missing")
+    with pytest.raises(ValueError):
+        log.index("missing")
+    with pytest.raises(IndexError):
+        log[5]
+
+    log.append("first_steps")
+    assert log == ["first_steps"]
+    log.discard("missing")
+    log.discard("first_steps")
+    assert log == []
+
+def test_quest_log_copy_and_version():
+    """copy() is independent; every mutating call bumps version"""
+    log = QuestLog(["a", "b"])
+    copy = log.copy()
+    copy.append("c")
+    assert log == ["a", "b"] and copy == ["a", "b", "c"]
+
+    version = log.version
+    log.append("c")
+    log.remove("a")
+    log.discard("z")
+    log.extend([])
+    log.clear()
+    assert log.version == version + 5
+    assert log == []
+
+def test_quest_log_survives_save_and_load(tmp_path):
+    """Quest lists round-trip through a save as QuestLogs in the same order"""
+    char = character_manager.create_character("QuestLogTest", "Cleric")
+    char["active_quests"].extend(["orc_menace", "first_steps"])
+    char["completed_quests"].extend(["goblin_hunter"])
+    character_manager.save_character(char, str(tmp_path), fsync=False)
+
+    loaded = character_manager.load_character("QuestLogTest", str(tmp_path))
+    assert isinstance(loaded["active_quests"], QuestLog)
+    assert loaded["active_quests"] == ["orc_menace", "first_steps"]
+    assert loaded["completed_quests"] == ["goblin_hunter"]
@@ -0,0 +1,145 @@
+"""
+Test Content Reloader
+Tests hot reloading of quest and item files while the game runs
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+QUEST_BLOCK = """QUEST_ID: {quest_id}
+TITLE: Quest {quest_id}
+DESCRIPTION: About {quest_id}
+REWARD_XP: {xp}
+REWARD_GOLD: 10
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+"""
+
+ITEM_BLOCK = """ITEM_ID: potion
+NAME: Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Heals
+"""
+
+def write_quests(filename, xp_by_id, replace=None):
+    """Write one block per quest; replace=(old, new) edits the text"""
+    text = "\n".join(QUEST_BLOCK.format(quest_id=q, xp=xp) for q, xp in xp_by_id.items())
+    if replace:
+        text = text.replace(*replace)
+
+    # Step the mtime so the change is seen even on a coarse clock
+    old_mtime = os.stat(filename).st_mtime_ns if os.path.exists(filename) else 0
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(filename, ns=(old_mtime + 10**9, old_mtime + 10**9))
+
+@pytest.fixture
+def reloader(tmp_path):
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+    write_quests(quest_file, {"a": 10, "b": 20, "c": 30})
+    with open(item_file, "w", encoding="utf-8") as f:
+        f.write(ITEM_BLOCK)
+
+    reloader = game_data.ContentReloader(quest_file, item_file, poll_interval=3600)
+    reloader.load()
+    return reloader
+
+@pytest.fixture
+def parsed_blocks(monkeypatch):
+    """Quest ids parsed by parse_quest_block"""
+    parsed = []
+    real_parse = game_data.parse_quest_block
+
+    def counting_parse(lines, *args):
+        quest = real_parse(lines, *args)
+        parsed.append(quest.get("quest_id"))
+        return quest
+
+    monkeypatch.setattr(game_data, "parse_quest_block", counting_parse)
+    return parsed
+
+# ============================================================================
+# RELOAD TESTS
+# ============================================================================
+
+def test_edit_replaces_only_the_changed_record(reloader, parsed_blocks):
+    """Unchanged records keep their identity, the edited one is new"""
+    first = reloader.snapshot()
+    quest_file = reloader.files["quest"]
+
+    write_quests(quest_file, {"a": 10, "b": 25, "c": 30})
+    assert reloader.poll(force=True)
+    second = reloader.snapshot()
+    assert second["quests"]["a"] is first["quests"]["a"]
+    assert second["quests"]["c"] is first["quests"]["c"]
+    assert second["quests"]["b"] is not first["quests"]["b"]
+    assert second["quests"]["b"]["reward_xp"] == 25
+    assert second["items"] is first["items"]
+
+    # Block hashes are known now, so only the edited block is parsed
+    parsed_blocks.clear()
+    write_quests(quest_file, {"a": 10, "b": 25, "c": 35})
+    assert reloader.poll(force=True)
+    third = reloader.snapshot()
+    assert parsed_blocks == ["c"]
+    assert third["quests"]["b"] is second["quests"]["b"]
+    assert third["quests"]["c"]["reward_xp"] == 35
+
+def test_old_snapshot_is_not_modified(reloader):
+    """A snapshot taken before a reload keeps its version and records"""
+    first = reloader.snapshot()
+    version = first["version"]
+
+    write_quests(reloader.files["quest"], {"a": 10, "b": 20, "d": 40})
+    assert reloader.poll(force=True)
+
+    assert first["version"] == version
+    assert sorted(first["quests"]) == ["a", "b", "c"]
+    assert reloader.snapshot()["version"] == version + 1
+    assert sorted(reloader.snapshot()["quests"]) == ["a", "b", "d"]
+
+def test_unchanged_files_are_not_reloaded(reloader):
+    """poll() does nothing while the files are unchanged or not yet due"""
+    first = reloader.snapshot()
+    assert not reloader.poll(force=True)
+
+    write_quests(reloader.files["quest"], {"a": 11, "b": 20, "c": 30})
+    assert not reloader.poll()
+    assert reloader.snapshot() is first
+
+# ============================================================================
+# BROKEN EDIT TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("replace, message", [
+    (("REWARD_XP: 20", "REWARD_XP: lots"), r"Invalid number .*\(block 2, line 12\)"),
+    (("TITLE: Quest b\n", ""), r"Missing quest field: title \(block 2, line 9\)"),
+])
+def test_broken_edit_keeps_previous_version(reloader, replace, message):
+    """A bad edit raises with its location and the old snapshot stays live"""
+    first = reloader.snapshot()
+    quest_file = reloader.files["quest"]
+
+    write_quests(quest_file, {"a": 10, "b": 20, "c": 30}, replace=replace)
+    with pytest.raises(InvalidDataFormatError, match=message):
+        reloader.poll(force=True)
+    assert reloader.snapshot() is first
+
+    # Not retried until the file changes again; the fixed file is picked up
+    assert not reloader.poll(force=True)
+    write_quests(quest_file, {"a": 10, "b": 21, "c": 30})
+    assert reloader.poll(force=True)
+    assert reloader.snapshot()["quests"]["b"]["reward_xp"] == 21
@@ -0,0 +1,351 @@
+"""
+Test Game Data
+Tests the quest and item block parsers and loaders
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmarks
+import character_manager
+import game_data
+import inventory_system
+import quest_handler
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+# ============================================================================
+# BLOCK PARSER TESTS
+# ============================================================================
+
+def test_padded_keys_and_values_are_stripped():
+    """Whitespace around keys and values is ignored, as in the old parser"""
+    assert game_data.parse_quest_block(["PREREQUISITE: NONE "]) == {"prerequisite": "NONE"}
+    assert game_data.parse_quest_block(["  QUEST_ID: x"]) == {"quest_id": "x"}
+    assert game_data.parse_item_block(["NAME :  Sword ", "EFFECT:  strength : 5 "]) == {
+        "name": "Sword", "effect": {"strength": 5}}
+
+def test_parse_errors_name_block_and_line():
+    """Errors report the block number and file line"""
+    with pytest.raises(InvalidDataFormatError, match=r"Unknown quest field: FOO \(block 3, line 12\)"):
+        game_data.parse_quest_block(["QUEST_ID: x", "FOO: 1"], 3, 11)
+    with pytest.raises(InvalidDataFormatError, match="Invalid number"):
+        game_data.parse_quest_block(["REWARD_XP: lots"])
+
+def test_parsers_match_reference_parsers(tmp_path):
+    """The table-driven parsers give the same records as the if/elif ones"""
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+    benchmarks.generate_quests_file(quest_file, 200, 4)
+    benchmarks.generate_items_file(item_file, 200)
+
+    for lines in benchmarks.read_blocks(quest_file):
+        assert game_data.parse_quest_block(lines) == benchmarks.reference_parse_quest_block(lines)
+    for lines in benchmarks.read_blocks(item_file):
+        assert game_data.parse_item_block(lines) == benchmarks.reference_parse_item_block(lines)
+
+# ============================================================================
+# COLLECT ERRORS TESTS
+# ============================================================================
+
+QUEST_BLOCK = """QUEST_ID: {quest_id}
+TITLE: Quest {quest_id}
+DESCRIPTION: About {quest_id}
+REWARD_XP: {xp}
+REWARD_GOLD: 10
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+"""
+
+def test_collect_errors_reports_every_bad_block(tmp_path):
+    """Bad blocks are skipped and each problem is reported with its location"""
+    filename = str(tmp_path / "quests.txt")
+    blocks = [
+        QUEST_BLOCK.format(quest_id="good_one", xp=50),
+        QUEST_BLOCK.format(quest_id="bad_number", xp="fifty"),
+        QUEST_BLOCK.format(quest_id="unknown_field", xp=5).replace("TITLE:", "TITEL:"),
+        QUEST_BLOCK.format(quest_id="good_two", xp=70),
+    ]
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("\n".join(blocks))
+
+    quests, errors = game_data.load_quests(filename, use_cache=False, collect_errors=True)
+    assert list(quests) == ["good_one", "good_two"]
+    assert errors == [
+        {"file": filename, "block": 2, "line": 12, "field": "reward_xp",
+         "reason": "Invalid number in quest block"},
+        {"file": filename, "block": 3, "line": 18, "field": "TITEL",
+         "reason": "Unknown quest field: TITEL"},
+        {"file": filename, "block": 3, "line": 17, "field": "title",
+         "reason": "Missing quest field: title"},
+    ]
+
+    # Without collect_errors the first problem is raised with its location
+    with pytest.raises(InvalidDataFormatError, match=r"\(block 2, line 12\)"):
+        game_data.load_quests(filename, use_cache=False)
+
+def test_collect_errors_on_clean_file(tmp_path):
+    """A clean file gives the same quests as a normal load and no errors"""
+    filename = str(tmp_path / "quests.txt")
+    benchmarks.generate_quests_file(filename, 30, 3)
+
+    quests, errors = game_data.load_quests(filename, use_cache=False, collect_errors=True)
+    assert errors == []
+    assert quests == game_data.load_quests(filename, use_cache=False)
+
+# ============================================================================
+# CATALOG CACHE TESTS
+# ============================================================================
+
+@pytest.fixture
+def parse_counter(monkeypatch):
+    """Count how often load_quests parses the source file"""
+    calls = []
+    real_iter_quests = game_data.iter_quests
+
+    def counting_iter_quests(*args, **kwargs):
+        calls.append(args)
+        return real_iter_quests(*args, **kwargs)
+
+    monkeypatch.setattr(game_data, "iter_quests", counting_iter_quests)
+    return calls
+
+def write_quests(filename, *quest_ids, xp=50):
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write("\n".join(QUEST_BLOCK.format(quest_id=q, xp=xp) for q in quest_ids))
+
+def test_cache_is_used_while_source_is_unchanged(tmp_path, parse_counter):
+    """A second load reads the compiled cache instead of the source"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, "alpha", "beta")
+
+    first = game_data.load_quests(filename)
+    assert os.path.exists(filename + game_data.CACHE_SUFFIX)
+    assert game_data.load_quests(filename) == first
+    assert len(parse_counter) == 1
+
+def test_cache_invalidated_by_mtime(tmp_path, parse_counter):
+    """Touching the source file forces a re-parse"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, "alpha")
+    game_data.load_quests(filename)
+
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    game_data.load_quests(filename)
+    assert len(parse_counter) == 2
+
+def test_cache_invalidated_by_size(tmp_path, parse_counter):
+    """A source file that grew is re-parsed"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, "alpha")
+    game_data.load_quests(filename)
+    st = os.stat(filename)
+
+    write_quests(filename, "alpha", "beta")
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert list(game_data.load_quests(filename)) == ["alpha", "beta"]
+    assert len(parse_counter) == 2
+
+def test_cache_invalidated_by_content_hash(tmp_path, parse_counter):
+    """Same size and mtime but different bytes is still a re-parse"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, "alpha", xp=50)
+    game_data.load_quests(filename)
+    st = os.stat(filename)
+
+    write_quests(filename, "alpha", xp=90)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert os.path.getsize(filename) == st.st_size
+    assert game_data.load_quests(filename)["alpha"]["reward_xp"] == 90
+    assert len(parse_counter) == 2
+
+def test_unreadable_cache_falls_back_to_source(tmp_path, parse_counter):
+    """A damaged cache file is ignored and replaced"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, "alpha")
+    expected = game_data.load_quests(filename)
+
+    with open(filename + game_data.CACHE_SUFFIX, "wb") as f:
+        f.write(b"not a pickle")
+    assert game_data.load_quests(filename) == expected
+    assert game_data.load_quests(filename) == expected
+    assert len(parse_counter) == 2
+
+# ============================================================================
+# ITEM CATALOG TESTS
+# ============================================================================
+
+@pytest.fixture
+def item_file(tmp_path):
+    filename = str(tmp_path / "items.txt")
+    benchmarks.generate_items_file(filename, 50)
+    return filename
+
+def test_item_catalog_matches_load_items(item_file):
+    """The lazy catalog holds the same items, in the same order"""
+    items = game_data.load_items(item_file, use_cache=False)
+    with game_data.ItemCatalog(item_file) as catalog:
+        assert list(catalog) == list(items)
+        assert len(catalog) == len(items)
+        assert dict(catalog.items()) == items
+        assert "item_0" in catalog and "missing" not in catalog
+
+def test_item_catalog_cache_is_bounded(item_file):
+    """Only the most recently used max_cached items stay parsed"""
+    with game_data.ItemCatalog(item_file, max_cached=4) as catalog:
+        for i in range(10):
+            catalog[f"item_{i}"]
+        assert list(catalog._cache) == ["item_6", "item_7", "item_8", "item_9"]
+
+        # A hit moves the item to the most recent end
+        first = catalog["item_6"]
+        catalog["item_0"]
+        assert list(catalog._cache) == ["item_8", "item_9", "item_6", "item_0"]
+        assert catalog["item_6"] is first
+
+def test_item_catalog_missing_id(item_file):
+    """Unknown ids raise KeyError like a dictionary"""
+    with game_data.ItemCatalog(item_file) as catalog:
+        with pytest.raises(KeyError):
+            catalog["no_such_item"]
+        assert catalog.get("no_such_item") is None
+
+@pytest.mark.parametrize("text", ["", "\n\n   \n"])
+def test_item_catalog_empty_file(tmp_path, text):
+    """An empty or blank file is an InvalidDataFormatError, as in load_items"""
+    filename = str(tmp_path / "items.txt")
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(text)
+    with pytest.raises(InvalidDataFormatError, match="empty"):
+        game_data.ItemCatalog(filename)
+
+def test_item_catalog_close(item_file):
+    """Leaving the with block closes the map and drops the cache"""
+    with game_data.ItemCatalog(item_file) as catalog:
+        catalog["item_1"]
+    assert catalog._map.closed
+    assert not catalog._cache
+    with pytest.raises(ValueError):
+        catalog["item_2"]
+
+    # Closing twice is harmless
+    catalog.close()
+
+# ============================================================================
+# SHARD TESTS
+# ============================================================================
+
+def write_shards(directory, blocks, count, prefix):
+    """Deal blocks round-robin into count shard files"""
+    for shard in range(count):
+        with open(os.path.join(directory, f"{prefix}_{shard:02d}.txt"), "w",
+                  encoding="utf-8") as f:
+            f.write("\n\n".join("\n".join(lines) for lines in blocks[shard::count]))
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_quest_shards_merge(tmp_path, max_workers):
+    """Shards load to the same quests as the single file, serially or pooled"""
+    whole = str(tmp_path / "all_quests.txt")
+    benchmarks.generate_quests_file(whole, 90, 3)
+    shard_dir = tmp_path / "shards"
+    shard_dir.mkdir()
+    write_shards(str(shard_dir), benchmarks.read_blocks(whole), 3, "quests")
+
+    quests = game_data.load_quest_shards(str(shard_dir), max_workers=max_workers)
+    assert quests == game_data.load_quests(whole, use_cache=False)
+
+    # A glob pattern picks a subset of the shards
+    pattern = str(shard_dir / "quests_0[01].txt")
+    assert len(game_data.load_quest_shards(pattern, max_workers=max_workers)) == 60
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_item_shards_merge(tmp_path, max_workers):
+    """Item shards merge the same way"""
+    whole = str(tmp_path / "all_items.txt")
+    benchmarks.generate_items_file(whole, 40)
+    write_shards(str(tmp_path), benchmarks.read_blocks(whole), 4, "items")
+
+    items = game_data.load_item_shards(str(tmp_path), max_workers=max_workers)
+    assert items == game_data.load_items(whole, use_cache=False)
+
+def test_duplicate_ids_across_shards(tmp_path):
+    """An id in two shards is an error naming the id and both files"""
+    first = str(tmp_path / "quests_a.txt")
+    second = str(tmp_path / "quests_b.txt")
+    write_quests(first, "alpha", "beta")
+    write_quests(second, "beta", "gamma")
+
+    with pytest.raises(InvalidDataFormatError) as excinfo:
+        game_data.load_quest_shards(str(tmp_path), max_workers=2)
+    assert str(excinfo.value) == (
+        f"Duplicate quest_id across shards: beta ({first}, {second})")
+
+def test_no_shards(tmp_path):
+    """A directory without shards raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_quest_shards(str(tmp_path))
+
+# ============================================================================
+# COMPACT RECORD TESTS
+# ============================================================================
+
+def test_records_equal_their_dicts(tmp_path):
+    """Compact records compare and read like the dictionaries they replace"""
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+    benchmarks.generate_quests_file(quest_file, 30, 3)
+    benchmarks.generate_items_file(item_file, 30)
+
+    quests = game_data.load_quests(quest_file, use_cache=False)
+    records = game_data.load_quests(quest_file, use_cache=False, compact=True)
+    assert records == quests
+    record = records["quest_0"]
+    assert isinstance(record, game_data.QuestRecord)
+    assert not hasattr(record, "__dict__")
+    assert record.to_dict() == quests["quest_0"]
+    assert record.get("missing") is None and "title" in record
+
+    items = game_data.load_items(item_file, use_cache=False)
+    item_records = game_data.load_items(item_file, use_cache=False, compact=True)
+    assert item_records == items
+    assert item_records["item_0"]["effect"] == items["item_0"]["effect"]
+
+def test_compact_records_survive_the_cache(tmp_path, parse_counter):
+    """Records pickle through the compiled cache, kept apart from dict caches"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, "alpha", "beta")
+
+    first = game_data.load_quests(filename, compact=True)
+    cached = game_data.load_quests(filename, compact=True)
+    assert len(parse_counter) == 1
+    assert isinstance(cached["alpha"], game_data.QuestRecord)
+    assert cached == first
+
+    plain = game_data.load_quests(filename)
+    assert type(plain["alpha"]) is dict and plain == cached
+
+def test_records_work_with_game_logic():
+    """Quests and items as records go through quest_handler and inventory_system"""
+    quests = game_data.load_quests("data/quests.txt", use_cache=False, compact=True)
+    items = game_data.load_items("data/items.txt", use_cache=False, compact=True)
+
+    char = character_manager.create_character("RecordTest", "Warrior")
+    available = quest_handler.get_available_quests(char, quests)
+    assert [quest["quest_id"] for quest in available] == ["first_steps"]
+    quest_handler.accept_quest(char, "first_steps", quests)
+    assert quest_handler.complete_quest(char, "first_steps", quests) == {"xp": 50, "gold": 25}
+
+    effect = items["health_potion"]["effect"]
+    assert inventory_system.parse_item_effect(effect) == ("health", 20)
+
+def test_records_use_less_memory(tmp_path):
+    """benchmarks.retained_bytes shows the compact catalogs are smaller"""
+    filename = str(tmp_path / "quests.txt")
+    benchmarks.generate_quests_file(filename, 2000, 5)
+    as_dicts = benchmarks.retained_bytes(lambda: game_data.load_quests(filename, use_cache=False))
+    as_records = benchmarks.retained_bytes(
+        lambda: game_data.load_quests(filename, use_cache=False, compact=True))
+    assert as_records < as_dicts
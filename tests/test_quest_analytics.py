@@ -0,0 +1,108 @@
+"""
+Test Quest Analytics
+Tests the quest funnel counters built from a directory of saves
+"""
+
+import pytest
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_analytics
+
+QUEST_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          "data", "quests.txt")
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def make_character(name, level, completed=(), active=()):
+    char = character_manager.create_character(name, "Warrior")
+    char["level"] = level
+    char["completed_quests"].extend(completed)
+    char["active_quests"].extend(active)
+    return char
+
+@pytest.fixture
+def save_dir(tmp_path):
+    """Four readable saves against data/quests.txt, plus two broken ones"""
+    save_dir = str(tmp_path)
+    character_manager.save_characters([
+        make_character("Fresh", 1),
+        make_character("Started", 2, ["first_steps"], ["goblin_hunter"]),
+        make_character("Hunter", 3, ["first_steps", "goblin_hunter", "equipment_upgrade"]),
+        make_character("Looter", 3, ["first_steps", "equipment_upgrade", "retired_quest"],
+                       ["treasure_hunter"]),
+    ], save_dir, fsync=False)
+
+    with open(os.path.join(save_dir, "Garbled_save.txt"), "w", encoding="utf-8") as f:
+        f.write("this is not a save\n")
+    with open(os.path.join(save_dir, "Binary_save.txt"), "wb") as f:
+        f.write(b"\xff\xfe\x00 not utf-8")
+    return save_dir
+
+def without_timestamp(report):
+    report = dict(report)
+    del report["generated"]
+    return report
+
+# ============================================================================
+# ANALYTICS TESTS
+# ============================================================================
+
+def test_counts_quest_states(save_dir):
+    """available/active/completed and the depth histogram match the saves"""
+    report = quest_analytics.analyze_saves(save_dir, QUEST_FILE, max_workers=1)
+
+    assert report["fields"] == ["available", "active", "completed"]
+    assert report["quests"] == {
+        "first_steps": [1, 0, 3],
+        "goblin_hunter": [1, 1, 1],
+        "equipment_upgrade": [1, 0, 2],
+        "orc_menace": [1, 0, 0],
+        "dragon_slayer": [0, 0, 0],
+        "treasure_hunter": [1, 1, 0],
+        "master_adventurer": [0, 0, 0],
+    }
+    assert report["furthest_depth"] == {"none": 1, "0": 1, "1": 2}
+    assert report["unknown_quests"] == {"retired_quest": 1}
+
+def test_broken_saves_are_counted_not_fatal(save_dir):
+    """Corrupt and undecodable saves are skipped, counted and sampled"""
+    report = quest_analytics.analyze_saves(save_dir, QUEST_FILE, max_workers=1)
+
+    assert report["saves"] == 6
+    assert report["unreadable"] == 2
+    assert sorted(sample.split(":")[0] for sample in report["error_samples"]) == [
+        "Binary", "Garbled"]
+
+def test_pooled_matches_serial(save_dir):
+    """A process pool with small chunks gives the same report as one process"""
+    serial = quest_analytics.analyze_saves(save_dir, QUEST_FILE, max_workers=1)
+    pooled = quest_analytics.analyze_saves(save_dir, QUEST_FILE, max_workers=2, chunk_size=1)
+
+    pooled["error_samples"].sort()
+    serial["error_samples"].sort()
+    assert without_timestamp(pooled) == without_timestamp(serial)
+
+def test_empty_or_missing_directory(tmp_path):
+    """No saves gives zero counts rather than an error"""
+    report = quest_analytics.analyze_saves(str(tmp_path / "missing"), QUEST_FILE,
+                                           max_workers=1)
+    assert report["saves"] == 0
+    assert report["furthest_depth"] == {}
+    assert set(map(tuple, report["quests"].values())) == {(0, 0, 0)}
+
+def test_main_writes_report(save_dir, tmp_path):
+    """The command line writes the same counters as JSON"""
+    output = str(tmp_path / "report.json")
+    args = ["--saves", save_dir, "--quests", QUEST_FILE, "--workers", "1", "--output", output]
+    assert quest_analytics.main(args) == 0
+
+    with open(output, encoding="utf-8") as f:
+        report = json.load(f)
+    assert report["quests"]["first_steps"] == [1, 0, 3]
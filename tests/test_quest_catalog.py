@@ -0,0 +1,129 @@
+"""
+Test Quest Catalog
+Tests that QuestCatalog queries match the plain quest dictionary
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmarks
+import character_manager
+import game_data
+import quest_catalog
+import quest_handler
+from custom_exceptions import QuestRequirementsNotMetError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def quest_ids(quests):
+    return [quest["quest_id"] for quest in quests]
+
+def write_quests(filename, quests):
+    """Write (quest_id, required_level, reward_xp, [prerequisite lines]) tuples"""
+    with open(filename, "w", encoding="utf-8") as f:
+        for quest_id, level, xp, prerequisites in quests:
+            f.write(f"QUEST_ID: {quest_id}\nTITLE: {quest_id}\nDESCRIPTION: {quest_id}\n"
+                    f"REWARD_XP: {xp}\nREWARD_GOLD: 5\nREQUIRED_LEVEL: {level}\n")
+            for prerequisite in prerequisites or ["NONE"]:
+                f.write(f"PREREQUISITE: {prerequisite}\n")
+            f.write("\n")
+
+@pytest.fixture(params=[True, False], ids=["numpy", "no-numpy"])
+def use_numpy(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(quest_catalog, "numpy", None)
+    return request.param
+
+# ============================================================================
+# LEVEL INDEX TESTS
+# ============================================================================
+
+def test_quests_by_level_keeps_catalog_order(tmp_path, use_numpy):
+    """The level index returns the same quests in the same order as a scan"""
+    filename = str(tmp_path / "quests.txt")
+    benchmarks.generate_quests_file(filename, 60, 5)
+    quests = game_data.load_quests(filename, use_cache=False)
+    catalog = quest_catalog.QuestCatalog(quests)
+
+    for min_level, max_level in ((1, 5), (2, 3), (4, 4), (3, 1), (0, 99)):
+        assert (quest_ids(quest_handler.get_quests_by_level(catalog, min_level, max_level))
+                == quest_ids(quest_handler.get_quests_by_level(quests, min_level, max_level)))
+
+# ============================================================================
+# PREREQUISITE TESTS
+# ============================================================================
+
+# c needs a AND (b OR x); x is not in the file, but completing it still counts.
+# d needs c, e needs a AND b given as one comma-separated line.
+COMPOUND_QUESTS = [
+    ("a", 1, 10, []),
+    ("b", 1, 10, []),
+    ("c", 1, 10, ["a", "b | x"]),
+    ("d", 1, 10, ["c"]),
+    ("e", 1, 10, ["a, b"]),
+]
+
+def test_prerequisite_clauses():
+    """Commas are AND, | is OR, several PREREQUISITE lines are joined"""
+    assert game_data.prerequisite_clauses({"prerequisite": "NONE"}) == ()
+    assert game_data.prerequisite_clauses({"prerequisite": "a"}) == (("a",),)
+    assert game_data.prerequisite_clauses({"prerequisite": "a, b | x"}) == (("a",), ("b", "x"))
+
+    quest = game_data.parse_quest_block(["PREREQUISITE: a", "PREREQUISITE: b | x"])
+    assert quest["prerequisite"] == "a, b | x"
+
+def test_compound_prerequisites_on_both_paths(tmp_path, use_numpy):
+    """Every combination of completed quests gives the same answers"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, COMPOUND_QUESTS)
+    quests = game_data.load_quests(filename, use_cache=False)
+    catalog = quest_catalog.QuestCatalog(quests)
+
+    expected = {
+        (): ["a", "b"],
+        ("a",): ["b"],
+        ("b",): ["a"],
+        ("x",): ["a", "b"],
+        ("a", "b"): ["c", "e"],
+        ("a", "x"): ["b", "c"],
+        ("b", "x"): ["a"],
+        ("a", "b", "x"): ["c", "e"],
+    }
+    for completed, available in expected.items():
+        char = character_manager.create_character("PrereqTest", "Warrior")
+        char["completed_quests"].extend(completed)
+        for quest_data in (quests, catalog):
+            assert quest_ids(quest_handler.get_available_quests(char, quest_data)) == available
+            for quest_id in ("c", "d", "e"):
+                assert (quest_handler.can_accept_quest(char, quest_id, quest_data)
+                        == (quest_id in available))
+
+def test_accept_names_the_unmet_clause(tmp_path):
+    """accept_quest reports the first prerequisite clause that is not met"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, COMPOUND_QUESTS)
+    quests = game_data.load_quests(filename, use_cache=False)
+
+    char = character_manager.create_character("PrereqTest", "Warrior")
+    char["completed_quests"].append("a")
+    with pytest.raises(QuestRequirementsNotMetError, match="'b' or 'x'"):
+        quest_handler.accept_quest(char, "c", quests)
+
+    char["completed_quests"].append("x")
+    assert quest_handler.accept_quest(char, "c", quests)
+
+def test_invalid_prerequisite_lists_are_reported(tmp_path):
+    """Blank alternatives or NONE inside a list are load errors"""
+    filename = str(tmp_path / "quests.txt")
+    write_quests(filename, [("a", 1, 10, []), ("b", 1, 10, ["a, NONE"]),
+                            ("c", 1, 10, ["a |"])])
+
+    quests, errors = game_data.load_quests(filename, use_cache=False, collect_errors=True)
+    assert list(quests) == ["a"]
+    assert [(e["block"], e["reason"]) for e in errors] == [
+        (2, "Invalid prerequisite list"), (3, "Invalid prerequisite list")]
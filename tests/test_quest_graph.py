@@ -0,0 +1,107 @@
+"""
+Test Quest Graph
+Tests prerequisite cycle detection and prerequisite chains
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quest_catalog
+import quest_handler
+from custom_exceptions import InvalidDataFormatError, QuestNotFoundError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def make_quests(prerequisites):
+    """{quest_id: prerequisite text} -> quest dictionary"""
+    return {
+        quest_id: {"quest_id": quest_id, "title": quest_id, "description": "",
+                   "reward_xp": 10, "reward_gold": 5, "required_level": 1,
+                   "prerequisite": prerequisite}
+        for quest_id, prerequisite in prerequisites.items()
+    }
+
+# a needs c, c needs b, b needs a; d hangs below the cycle
+CYCLE = {"a": "c", "b": "a", "c": "b", "d": "a", "e": "NONE"}
+
+# ============================================================================
+# CYCLE TESTS
+# ============================================================================
+
+def test_catalog_reports_cycle_path():
+    """Building a catalog over a cycle names every quest on it"""
+    with pytest.raises(InvalidDataFormatError, match="cycle: a -> c -> b -> a$"):
+        quest_catalog.QuestCatalog(make_quests(CYCLE))
+
+def test_self_prerequisite_is_a_cycle():
+    """A quest that requires itself is reported too"""
+    with pytest.raises(InvalidDataFormatError, match="cycle: x -> x$"):
+        quest_catalog.QuestCatalog(make_quests({"x": "x", "y": "NONE"}))
+
+def test_cycle_through_an_or_branch():
+    """Alternatives are edges, so a cycle through one is still found"""
+    quests = make_quests({"a": "NONE", "b": "a | c", "c": "b"})
+    with pytest.raises(InvalidDataFormatError, match="cycle: b -> c -> b$"):
+        quest_catalog.QuestCatalog(quests)
+
+def test_dict_chain_reports_cycle_path():
+    """The plain-dictionary chain raises the same error as the catalog"""
+    quests = make_quests(CYCLE)
+    with pytest.raises(InvalidDataFormatError, match="cycle: a -> c -> b -> a$"):
+        quest_handler.get_quest_prerequisite_chain("a", quests)
+    with pytest.raises(InvalidDataFormatError, match="cycle: a -> c -> b -> a$"):
+        quest_handler.get_quest_prerequisite_chain("d", quests)
+    assert quest_handler.get_quest_prerequisite_chain("e", quests) == ["e"]
+
+def test_validate_reports_cycle():
+    """validate_quest_prerequisites checks for cycles as well as missing ids"""
+    with pytest.raises(InvalidDataFormatError):
+        quest_handler.validate_quest_prerequisites(make_quests(CYCLE))
+
+# ============================================================================
+# CHAIN TESTS
+# ============================================================================
+
+def test_chains_match_on_both_paths():
+    """Catalog and dictionary chains agree for single and merged chains"""
+    quests = make_quests({"a": "NONE", "b": "a", "c": "b", "x": "NONE",
+                          "d": "c, x", "e": "d", "f": "b | x"})
+    catalog = quest_catalog.QuestCatalog(quests)
+
+    # Merged chains list every ancestor in topological order
+    expected = {"a": ["a"], "c": ["a", "b", "c"], "e": ["a", "x", "b", "c", "d", "e"],
+                "f": ["a", "x", "b", "f"]}
+    for quest_id, chain in expected.items():
+        assert quest_handler.get_quest_prerequisite_chain(quest_id, catalog) == chain
+        assert quest_handler.get_quest_prerequisite_chain(quest_id, quests) == chain
+
+def test_chains_are_memoised():
+    """A chain is built once and reused by the quests below it"""
+    quests = make_quests({"a": "NONE", "b": "a", "c": "b", "d": "c"})
+    graph = quest_catalog.QuestCatalog(quests).graph
+
+    chain = graph.chain("c")
+    assert chain == ("a", "b", "c")
+    assert graph.chain("c") is chain
+    assert graph.chain("b") == ("a", "b")
+
+    # d extends the stored chain for c instead of walking back to a
+    assert graph.chain("d") == chain + ("d",)
+    assert set(graph._chains) == {"a", "b", "c", "d"}
+
+def test_missing_prerequisite_in_chain():
+    """A missing prerequisite, even in an OR branch, is QuestNotFoundError"""
+    quests = make_quests({"a": "NONE", "b": "a | ghost", "c": "b"})
+    catalog = quest_catalog.QuestCatalog(quests)
+
+    for quest_data in (catalog, quests):
+        with pytest.raises(QuestNotFoundError, match="'ghost'"):
+            quest_handler.get_quest_prerequisite_chain("c", quest_data)
+        with pytest.raises(QuestNotFoundError, match="'nowhere'"):
+            quest_handler.get_quest_prerequisite_chain("nowhere", quest_data)
+    assert catalog.graph.missing == {"b": "ghost", "c": "ghost"}
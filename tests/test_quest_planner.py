@@ -0,0 +1,154 @@
+"""
+Test Quest Planner
+Tests that planned quest routes can be played and reach their targets
+"""
+
+import pytest
+import sys
+import os
+import itertools
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_data
+import quest_catalog
+import quest_handler
+from custom_exceptions import (
+    InsufficientLevelError,
+    QuestNotFoundError,
+    QuestRequirementsNotMetError,
+)
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def play_route(route, character, quest_data):
+    """Accept and complete each quest, levelling up with gain_experience"""
+    for quest_id in route:
+        quest_handler.accept_quest(character, quest_id, quest_data)
+        rewards = quest_handler.complete_quest(character, quest_id, quest_data)
+        character["experience"] -= rewards["xp"]
+        character_manager.gain_experience(character, rewards["xp"])
+    return character
+
+def reaches_targets(character, target_level, target_quest):
+    if target_level is not None and character["level"] < target_level:
+        return False
+    return target_quest is None or target_quest in character["completed_quests"]
+
+def planner_character(level):
+    """A character who has already fought their way to a level"""
+    character = character_manager.create_character("Planner", "Warrior")
+    character["level"] = level
+    return character
+
+def random_quests(rng, count):
+    """Small catalog with single, AND and OR prerequisites"""
+    quests = {}
+    for i in range(count):
+        prerequisites = [f"q{j}" for j in rng.sample(range(i), min(i, rng.randint(0, 1)))]
+        if prerequisites and i > 1 and rng.random() < 0.3:
+            prerequisites[0] += f" | q{rng.randrange(i)}"
+        quests[f"q{i}"] = {
+            "quest_id": f"q{i}", "title": f"Quest {i}", "description": "",
+            "reward_xp": rng.choice([30, 60, 120, 250]), "reward_gold": 0,
+            "required_level": rng.randint(1, 3),
+            "prerequisite": ", ".join(prerequisites) or "NONE",
+        }
+    return quests
+
+def shortest_route_length(quests, target_level, target_quest, longest):
+    """Brute-force the shortest playable route, or None if none is short enough"""
+    for length in range(longest + 1):
+        for route in itertools.permutations(quests, length):
+            character = character_manager.create_character("Brute", "Mage")
+            try:
+                play_route(route, character, quests)
+            except (QuestRequirementsNotMetError, InsufficientLevelError):
+                continue
+            if reaches_targets(character, target_level, target_quest):
+                return length
+    return None
+
+# ============================================================================
+# ROUTE TESTS
+# ============================================================================
+
+# The shipped quests give too little XP to level from 1 on quests alone,
+# so each route starts from a character who has levelled in combat
+@pytest.mark.parametrize("start_level, target_level, target_quest", [
+    (2, 4, None), (5, None, "dragon_slayer"), (9, 10, "master_adventurer"),
+])
+@pytest.mark.parametrize("use_catalog", [False, True], ids=["dict", "catalog"])
+def test_route_reaches_targets(start_level, target_level, target_quest, use_catalog):
+    """Routes for the shipped quests can be played and meet their targets"""
+    quests = game_data.load_quests(use_cache=False)
+    quest_data = quest_catalog.QuestCatalog(quests) if use_catalog else quests
+
+    character = planner_character(start_level)
+    route = quest_handler.plan_quest_route(character, quest_data, target_level, target_quest)
+    assert len(route) == len(set(route))
+
+    play_route(route, character, quests)
+    assert reaches_targets(character, target_level, target_quest)
+
+def test_route_reaches_targets_random():
+    """On small random catalogs a route exists whenever one can be played"""
+    rng = random.Random(16)
+    for _ in range(40):
+        quests = random_quests(rng, 7)
+        target_level = rng.randint(2, 4)
+        target_quest = rng.choice([None, f"q{rng.randrange(7)}"])
+
+        character = planner_character(1)
+        try:
+            route = quest_handler.plan_quest_route(character, quests, target_level, target_quest)
+        except QuestRequirementsNotMetError:
+            route = None
+
+        if route is not None:
+            play_route(route, character, quests)
+            assert reaches_targets(character, target_level, target_quest)
+        if shortest_route_length(quests, target_level, target_quest, 4) is not None:
+            assert route is not None
+
+# ============================================================================
+# EDGE CASE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("start_level, target_level, target_quest", [
+    (1, 2, None), (5, 7, "treasure_hunter"), (3, None, "dragon_slayer"),
+])
+def test_unreachable_targets(start_level, target_level, target_quest):
+    """Targets beyond the XP the quests can give raise QuestRequirementsNotMetError"""
+    quests = game_data.load_quests(use_cache=False)
+    with pytest.raises(QuestRequirementsNotMetError):
+        quest_handler.plan_quest_route(planner_character(start_level), quests,
+                                       target_level, target_quest)
+
+def test_route_needs_a_target():
+    """Asking for a route with no target is a ValueError"""
+    quests = game_data.load_quests(use_cache=False)
+    character = planner_character(1)
+    with pytest.raises(ValueError):
+        quest_handler.plan_quest_route(character, quests)
+
+def test_route_to_unknown_quest():
+    """An unknown target quest raises QuestNotFoundError"""
+    quests = game_data.load_quests(use_cache=False)
+    character = planner_character(1)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.plan_quest_route(character, quests, target_quest="no_such_quest")
+
+def test_route_when_targets_already_met():
+    """A character who already meets the targets gets an empty route"""
+    quests = game_data.load_quests(use_cache=False)
+    character = planner_character(2)
+    route = quest_handler.plan_quest_route(character, quests, 3, "goblin_hunter")
+    play_route(route, character, quests)
+
+    assert quest_handler.plan_quest_route(character, quests, 3, "goblin_hunter") == []
+    assert quest_handler.plan_quest_route(character, quests, target_level=1) == []
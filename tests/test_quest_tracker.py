@@ -0,0 +1,120 @@
+"""
+Test Quest Tracker
+Tests that the incremental QuestTracker always agrees with a full scan
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmarks
+import character_manager
+import game_data
+import quest_catalog
+import quest_handler
+from character_manager import QuestLog
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def available_ids(character, quest_data):
+    return [quest["quest_id"] for quest in quest_handler.get_available_quests(character, quest_data)]
+
+def assert_matches_scan(character, quests, catalog):
+    """The tracked catalog path gives the same answers as the dict path"""
+    expected = available_ids(character, quests)
+    assert available_ids(character, catalog) == expected
+    for quest_id in quests:
+        assert (quest_handler.can_accept_quest(character, quest_id, catalog)
+                == quest_handler.can_accept_quest(character, quest_id, quests))
+    assert (quest_handler.get_total_quest_rewards_earned(character, catalog)
+            == quest_handler.get_total_quest_rewards_earned(character, quests))
+
+# ============================================================================
+# TRACKER TESTS
+# ============================================================================
+
+def test_replaced_list_of_same_length_rebuilds_tracker():
+    """Swapping in a different list with the same length is noticed"""
+    quests = game_data.load_quests(use_cache=False)
+    catalog = quest_catalog.QuestCatalog(quests)
+    char = character_manager.create_character("TrackerTest", "Warrior")
+    char["level"] = 3
+    char["completed_quests"] = QuestLog(["first_steps"])
+    assert_matches_scan(char, quests, catalog)
+
+    char["completed_quests"] = QuestLog(["goblin_hunter"])
+    assert_matches_scan(char, quests, catalog)
+
+def test_untracked_edits_rebuild_tracker():
+    """Edits made directly on the lists, plain or QuestLog, are noticed"""
+    quests = game_data.load_quests(use_cache=False)
+    catalog = quest_catalog.QuestCatalog(quests)
+    char = character_manager.create_character("TrackerTest", "Warrior")
+    char["level"] = 3
+    quest_handler.accept_quest(char, "first_steps", catalog)
+    assert_matches_scan(char, quests, catalog)
+
+    # Same length afterwards, but a different quest is active
+    char["active_quests"].remove("first_steps")
+    char["active_quests"].append("goblin_hunter")
+    assert_matches_scan(char, quests, catalog)
+
+    char["completed_quests"] = ["first_steps"]
+    assert_matches_scan(char, quests, catalog)
+    char["completed_quests"][0] = "goblin_hunter"
+    assert_matches_scan(char, quests, catalog)
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_tracker_matches_full_scan(tmp_path, monkeypatch, use_numpy):
+    """Random quest actions and direct edits never leave the tracker stale"""
+    if not use_numpy:
+        monkeypatch.setattr(quest_catalog, "numpy", None)
+    filename = str(tmp_path / "quests.txt")
+    benchmarks.generate_quests_file(filename, 300, 6, seed=1)
+    quests = game_data.load_quests(filename, use_cache=False)
+    catalog = quest_catalog.QuestCatalog(quests)
+    quest_ids = list(quests)
+
+    rng = random.Random(3)
+    char = character_manager.create_character("TrackerTest", "Warrior")
+    for step in range(400):
+        roll = rng.random()
+        if roll < 0.4:
+            available = available_ids(char, catalog)
+            if available:
+                quest_handler.accept_quest(char, rng.choice(available), catalog)
+        elif roll < 0.6 and char["active_quests"]:
+            quest_handler.complete_quest(char, rng.choice(list(char["active_quests"])), catalog)
+        elif roll < 0.7 and char["active_quests"]:
+            quest_handler.abandon_quest(char, rng.choice(list(char["active_quests"])))
+        elif roll < 0.8:
+            char["level"] += 1
+        elif roll < 0.83:
+            char["level"] = max(1, char["level"] - 2)
+        elif roll < 0.85:
+            char["completed_quests"].append(rng.choice(quest_ids))
+        elif roll < 0.86 and char["active_quests"]:
+            # Completed behind the tracker's back while still active
+            char["completed_quests"].append(rng.choice(list(char["active_quests"])))
+        elif roll < 0.89 and char["completed_quests"]:
+            # Replace one completed quest, keeping the length the same
+            replaced = list(char["completed_quests"])
+            replaced[rng.randrange(len(replaced))] = rng.choice(quest_ids)
+            char["completed_quests"] = QuestLog(replaced)
+        elif roll < 0.91:
+            char["completed_quests"] = list(char["completed_quests"])
+        elif roll < 0.93:
+            char["completed_quests"] = QuestLog(char["completed_quests"])
+
+        expected = available_ids(char, quests)
+        assert available_ids(char, catalog) == expected, step
+        assert (quest_handler.get_total_quest_rewards_earned(char, catalog)
+                == quest_handler.get_total_quest_rewards_earned(char, quests)), step
+        for quest_id in rng.sample(quest_ids, 5):
+            assert (quest_handler.can_accept_quest(char, quest_id, catalog)
+                    == quest_handler.can_accept_quest(char, quest_id, quests)), step
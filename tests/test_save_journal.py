@@ -0,0 +1,122 @@
+"""
+Test Save Journal
+Tests journaled saves and their replay by load_character
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import InvalidSaveDataError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+SAVED_FIELDS = ("name", "class", "level", "health", "max_health", "strength", "magic",
+                "experience", "gold", "inventory", "active_quests", "completed_quests")
+
+def saved_state(character):
+    return {field: character[field] if not hasattr(character[field], "copy")
+            else list(character[field]) for field in SAVED_FIELDS}
+
+def journal_path(save_dir, name):
+    return os.path.join(save_dir, f"{name}_journal.txt")
+
+# ============================================================================
+# JOURNAL TESTS
+# ============================================================================
+
+def test_replay_rebuilds_latest_state(tmp_path):
+    """Every journaled change is back after loading"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("JournalTest", "Warrior")
+    char["inventory"].extend(["sword", "potion", "potion"])
+    character_manager.journal_character(char, save_dir, fsync=False)
+    save_size = os.path.getsize(os.path.join(save_dir, "JournalTest_save.txt"))
+
+    char["gold"] = 250
+    char["inventory"].remove("potion")
+    char["inventory"].append("shield")
+    char["active_quests"].append("first_steps")
+    assert character_manager.journal_character(char, save_dir, fsync=False) > 0
+
+    char["active_quests"].remove("first_steps")
+    char["completed_quests"].append("first_steps")
+    char["inventory"] = ["shield", "sword"]
+    char["level"] = 3
+    character_manager.journal_character(char, save_dir, fsync=False)
+
+    # Nothing changed: nothing written
+    assert character_manager.journal_character(char, save_dir, fsync=False) == 0
+    # Only the journal grew
+    assert os.path.getsize(os.path.join(save_dir, "JournalTest_save.txt")) == save_size
+
+    loaded = character_manager.load_character("JournalTest", save_dir)
+    assert saved_state(loaded) == saved_state(char)
+
+def test_lines_after_last_commit_are_ignored(tmp_path):
+    """A torn tail from a crash mid-save does not change or break the load"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("TornTest", "Mage")
+    character_manager.journal_character(char, save_dir, fsync=False)
+    char["gold"] = 300
+    character_manager.journal_character(char, save_dir, fsync=False)
+
+    with open(journal_path(save_dir, "TornTest"), "a", encoding="utf-8") as f:
+        f.write("GOLD: 999\nITEM_ADDED: half_written\nnot a journal li")
+
+    loaded = character_manager.load_character("TornTest", save_dir)
+    assert loaded["gold"] == 300
+    assert loaded["inventory"] == []
+
+def test_malformed_committed_line_is_an_error(tmp_path):
+    """A damaged line inside a committed batch is reported"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("DamagedTest", "Rogue")
+    character_manager.journal_character(char, save_dir, fsync=False)
+
+    with open(journal_path(save_dir, "DamagedTest"), "a", encoding="utf-8") as f:
+        f.write("GOLD 5\nCOMMIT: 1\n")
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("DamagedTest", save_dir)
+
+def test_stale_base_is_ignored(tmp_path):
+    """A journal written against an older save file is not replayed"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("StaleTest", "Cleric")
+    character_manager.journal_character(char, save_dir, fsync=False)
+    char["gold"] = 400
+    character_manager.journal_character(char, save_dir, fsync=False)
+    with open(journal_path(save_dir, "StaleTest"), encoding="utf-8") as f:
+        old_journal = f.read()
+
+    # A full save replaces the save file; bring the old journal back
+    char["gold"] = 50
+    character_manager.save_character(char, save_dir, fsync=False)
+    assert not os.path.exists(journal_path(save_dir, "StaleTest"))
+    with open(journal_path(save_dir, "StaleTest"), "w", encoding="utf-8") as f:
+        f.write(old_journal)
+
+    assert character_manager.load_character("StaleTest", save_dir)["gold"] == 50
+
+def test_journal_compacts_into_save_file(tmp_path):
+    """Every compact_after batches the save file is rewritten in full"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("CompactTest", "Warrior")
+    character_manager.journal_character(char, save_dir, fsync=False, compact_after=3)
+
+    for gold in range(101, 106):
+        char["gold"] = gold
+        character_manager.journal_character(char, save_dir, fsync=False, compact_after=3)
+
+    # Three batches (101-103), a compaction (104), then one more batch
+    with open(journal_path(save_dir, "CompactTest"), encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0].startswith("BASE: ")
+    assert lines[1:] == ["GOLD: 105", "COMMIT: 1"]
+    assert character_manager.load_character("CompactTest", save_dir)["gold"] == 105
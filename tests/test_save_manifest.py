@@ -0,0 +1,151 @@
+"""
+Test Save Manifest
+Tests the save directory manifest behind list_character_summaries
+"""
+
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+# ============================================================================
+# MANIFEST TESTS
+# ============================================================================
+
+def test_append_during_rewrite_is_not_lost(tmp_path, monkeypatch):
+    """A save made while the manifest is being rewritten shows up afterwards"""
+    save_dir = str(tmp_path)
+    for name in ("First", "Second"):
+        character_manager.save_character(character_manager.create_character(name, "Mage"),
+                                         save_dir, fsync=False)
+
+    late = character_manager.create_character("Late", "Cleric")
+    saver = threading.Thread(target=character_manager.save_character,
+                             args=(late, save_dir), kwargs={"fsync": False})
+    real_write_atomic = character_manager._write_atomic
+
+    def write_with_concurrent_save(filename, text, fsync=True):
+        # Another thread saves while the new manifest is written
+        if not saver.is_alive() and filename.endswith(character_manager.MANIFEST_NAME):
+            saver.start()
+            saver.join(0.5)
+        return real_write_atomic(filename, text, fsync)
+
+    monkeypatch.setattr(character_manager, "_write_atomic", write_with_concurrent_save)
+    character_manager.rebuild_manifest(save_dir)
+    saver.join()
+    monkeypatch.undo()
+
+    # Read the manifest from disk, not this process's cached view of it
+    character_manager._manifests.clear()
+    names = [s["name"] for s in character_manager.list_character_summaries(save_dir)]
+    assert names == ["First", "Late", "Second"]
+
+def test_appends_during_compaction_are_not_lost(tmp_path):
+    """Saves from several threads while the manifest compacts all show up"""
+    save_dir = str(tmp_path)
+    names = [f"Racer{i}" for i in range(4)]
+
+    def save_levels(name):
+        char = character_manager.create_character(name, "Mage")
+        for level in range(1, 201):
+            char["level"] = level
+            character_manager.save_character(char, save_dir, fsync=False)
+            character_manager.list_character_summaries(save_dir)
+
+    savers = [threading.Thread(target=save_levels, args=(name,)) for name in names]
+    for thread in savers:
+        thread.start()
+    for thread in savers:
+        thread.join()
+
+    character_manager._manifests.clear()
+    summaries = character_manager.list_character_summaries(save_dir)
+    assert {s["name"]: s["level"] for s in summaries} == dict.fromkeys(names, 200)
+
+def test_summaries_fall_back_to_directory_listing(tmp_path, monkeypatch):
+    """Without a readable or writable manifest the directory is listed"""
+    save_dir = str(tmp_path)
+    character_manager.save_character(character_manager.create_character("NoManifest", "Rogue"),
+                                     save_dir, fsync=False)
+    character_manager._manifests.clear()
+
+    def read_only(save_directory):
+        raise PermissionError(f"Read-only directory: {save_directory}")
+
+    monkeypatch.setattr(character_manager, "rebuild_manifest", read_only)
+    summaries = character_manager.list_character_summaries(save_dir)
+    assert [(s["name"], s["class"], s["level"]) for s in summaries] == [("NoManifest", None, None)]
+    assert summaries[0]["size"] == os.path.getsize(os.path.join(save_dir, "NoManifest_save.txt"))
+
+def test_manifest_follows_saves_and_deletes(tmp_path):
+    """Summaries reflect each save and delete without rescanning"""
+    save_dir = str(tmp_path)
+    for name, cls in (("Alpha", "Mage"), ("Beta", "Warrior")):
+        character_manager.save_character(character_manager.create_character(name, cls),
+                                         save_dir, fsync=False)
+    names = [s["name"] for s in character_manager.list_character_summaries(save_dir)]
+    assert names == ["Alpha", "Beta"]
+    assert os.path.exists(os.path.join(save_dir, character_manager.MANIFEST_NAME))
+
+    gamma = character_manager.create_character("Gamma", "Cleric")
+    gamma["level"] = 9
+    character_manager.save_character(gamma, save_dir, fsync=False)
+    character_manager.delete_character("Alpha", save_dir)
+
+    summaries = character_manager.list_character_summaries(save_dir, sort_by="level",
+                                                           reverse=True)
+    rows = [(s["name"], s["class"], s["level"]) for s in summaries]
+    assert rows == [("Gamma", "Cleric", 9), ("Beta", "Warrior", 1)]
+    assert summaries[0]["size"] == os.path.getsize(os.path.join(save_dir, "Gamma_save.txt"))
+    assert character_manager.list_saved_characters(save_dir) == ["Beta", "Gamma"]
+
+    page = character_manager.list_character_summaries(save_dir, offset=1, limit=1)
+    assert [s["name"] for s in page] == ["Gamma"]
+
+def test_rebuild_matches_incremental_manifest(tmp_path):
+    """A rebuilt manifest lists the same characters as the appended one"""
+    save_dir = str(tmp_path)
+    for i in range(5):
+        char = character_manager.create_character(f"Hero{i}", "Rogue")
+        char["level"] = i + 1
+        character_manager.save_character(char, save_dir, fsync=False)
+    character_manager.list_character_summaries(save_dir)
+    character_manager.delete_character("Hero2", save_dir)
+    with open(os.path.join(save_dir, "Hero4_save.txt"), "w", encoding="utf-8") as f:
+        f.write("not a save")
+
+    character_manager._manifests.clear()
+    before = character_manager.list_character_summaries(save_dir)
+    assert character_manager.rebuild_manifest(save_dir) == 4
+    after = character_manager.list_character_summaries(save_dir)
+
+    def key(summaries):
+        return [(s["name"], s["class"], s["level"]) for s in summaries]
+
+    assert [s["name"] for s in after] == ["Hero0", "Hero1", "Hero3", "Hero4"]
+    # The unreadable save is listed without class or level after a rebuild
+    assert key(after)[-1] == ("Hero4", None, None)
+    assert key(after)[:3] == key(before)[:3]
+
+def test_journal_saves_keep_the_manifest_bounded(tmp_path):
+    """Many journal flushes without a listing do not grow the manifest forever"""
+    save_dir = str(tmp_path)
+    char = character_manager.create_character("Journaler", "Mage")
+    character_manager.journal_character(char, save_dir, fsync=False)
+    character_manager.list_character_summaries(save_dir)
+
+    for gold in range(1, 2001):
+        char["gold"] = gold
+        character_manager.journal_character(char, save_dir, fsync=False)
+
+    with open(os.path.join(save_dir, character_manager.MANIFEST_NAME), "rb") as f:
+        lines = f.read().count(b"\n")
+    assert lines < 64 + 2 + character_manager.MANIFEST_CHECK_APPENDS
+
+    summary, = character_manager.list_character_summaries(save_dir)
+    assert summary["name"] == "Journaler"
+    assert character_manager.load_character("Journaler", save_dir)["gold"] == 2000
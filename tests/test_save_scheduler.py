@@ -0,0 +1,89 @@
+"""
+Test Save Scheduler
+Tests write-behind saving, coalescing and signal handling
+"""
+
+import pytest
+import sys
+import os
+import signal
+import faulthandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_scheduler
+
+# ============================================================================
+# SCHEDULER TESTS
+# ============================================================================
+
+def test_unchanged_requests_are_coalesced(tmp_path):
+    """Only requests that change the character are queued and written"""
+    scheduler = save_scheduler.SaveScheduler(str(tmp_path), interval=60, fsync=False)
+    char = character_manager.create_character("CoalesceTest", "Warrior")
+
+    for i in range(50):
+        char["gold"] = 100 + i // 10
+        scheduler.request(char)
+    scheduler.close()
+
+    stats = scheduler.stats()
+    assert stats["saves_requested"] == 50
+    assert stats["saves_changed"] == 5
+    assert stats["saves_written"] == 1
+    assert stats["pending"] == 0
+    assert character_manager.load_character("CoalesceTest", str(tmp_path))["gold"] == 104
+
+def test_snapshot_taken_at_request_time(tmp_path):
+    """Changes made after request() do not leak into the queued save"""
+    scheduler = save_scheduler.SaveScheduler(str(tmp_path), interval=60, fsync=False,
+                                             journal=True)
+    char = character_manager.create_character("SnapshotTest", "Mage")
+    char["gold"] = 777
+    scheduler.request(char)
+    char["gold"] = 1
+    char["inventory"].append("late_item")
+    scheduler.flush()
+    scheduler.close()
+
+    loaded = character_manager.load_character("SnapshotTest", str(tmp_path))
+    assert loaded["gold"] == 777
+    assert loaded["inventory"] == []
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+def test_signal_during_flush_does_not_deadlock(tmp_path, monkeypatch):
+    """A signal that arrives while flush() holds the write lock unwinds cleanly"""
+    scheduler = save_scheduler.SaveScheduler(str(tmp_path), interval=60, fsync=False)
+    previous = signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    scheduler.install_signal_handlers([signal.SIGUSR1])
+
+    real_write = character_manager.write_save_data
+    calls = []
+
+    def write_and_signal(*args, **kwargs):
+        calls.append(args[0])
+        if len(calls) == 1:
+            os.kill(os.getpid(), signal.SIGUSR1)
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(character_manager, "write_save_data", write_and_signal)
+
+    # A deadlock would hang the test run; fail it instead
+    faulthandler.dump_traceback_later(30, exit=True)
+    try:
+        char = character_manager.create_character("SignalTest", "Rogue")
+        char["gold"] = 555
+        scheduler.request(char)
+        with pytest.raises(SystemExit) as exc:
+            scheduler.flush()
+        assert exc.value.code == 128 + signal.SIGUSR1
+
+        # The interrupted save is still pending and close() writes it
+        assert scheduler.stats()["pending"] == 1
+        scheduler.close()
+    finally:
+        faulthandler.cancel_dump_traceback_later()
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert character_manager.load_character("SignalTest", str(tmp_path))["gold"] == 555
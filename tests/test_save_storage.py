@@ -0,0 +1,202 @@
+"""
+Test Save Storage
+Tests the SQLite save backend, backend migration and the migration CLI
+"""
+
+import pytest
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_storage
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def make_character(name, character_class="Warrior", gold=100):
+    char = character_manager.create_character(name, character_class)
+    char["gold"] = gold
+    char["inventory"] = ["health_potion", "iron_sword"]
+    char["active_quests"].extend(["orc_menace"])
+    char["completed_quests"].extend(["first_steps", "goblin_hunter"])
+    return char
+
+def saved_text(character):
+    return character_manager.format_save_data(character)
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = save_storage.SQLiteSaveBackend(str(tmp_path / "saves.db"), fsync=False)
+    yield backend
+    backend.close()
+
+def read_save_files(save_dir):
+    files = {}
+    for name in sorted(os.listdir(save_dir)):
+        if name.endswith("_save.txt"):
+            with open(os.path.join(save_dir, name), "rb") as f:
+                files[name] = f.read()
+    return files
+
+# ============================================================================
+# SQLITE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_round_trip(backend):
+    """A saved character loads back with the same fields"""
+    char = make_character("Aria", "Mage", gold=321)
+    assert backend.save(char)
+
+    loaded = backend.load("Aria")
+    assert saved_text(loaded) == saved_text(char)
+    assert isinstance(loaded["completed_quests"], character_manager.QuestLog)
+
+    char["gold"] = 5
+    backend.save(char)
+    assert backend.load("Aria")["gold"] == 5
+    assert backend.list_names() == ["Aria"]
+
+def test_sqlite_through_character_manager(backend):
+    """character_manager hands save/load/list/delete to the backend"""
+    char = make_character("Bram")
+    character_manager.save_character(char, backend=backend)
+    loaded = character_manager.load_character("Bram", backend=backend)
+    assert saved_text(loaded) == saved_text(char)
+    assert character_manager.list_saved_characters(backend=backend) == ["Bram"]
+    assert character_manager.delete_character("Bram", backend=backend)
+    assert character_manager.list_saved_characters(backend=backend) == []
+
+def test_sqlite_save_many_is_one_transaction(backend):
+    """A row that fails to insert rolls back the whole batch"""
+    good = [make_character(f"Batch{i}") for i in range(3)]
+    assert backend.save_many(good) == 3
+
+    changed = [make_character(f"Batch{i}", gold=999) for i in range(3)]
+    broken = make_character("Broken")
+    broken["class"] = None
+    with pytest.raises(sqlite3.IntegrityError):
+        backend.save_many(changed[:2] + [broken] + changed[2:])
+
+    assert backend.list_names() == ["Batch0", "Batch1", "Batch2"]
+    assert [backend.load(f"Batch{i}")["gold"] for i in range(3)] == [100] * 3
+
+def test_sqlite_list_summaries_and_delete(backend):
+    """Summaries come from the table in name order; delete removes the row"""
+    backend.save_many([make_character("Zed", "Rogue"), make_character("Ann", "Cleric")])
+    zed = backend.load("Zed")
+    character_manager.gain_experience(zed, 250)
+    backend.save(zed)
+
+    assert backend.list_summaries() == [
+        {"name": "Ann", "class": "Cleric", "level": 1, "modified": None, "size": None},
+        {"name": "Zed", "class": "Rogue", "level": 2, "modified": None, "size": None},
+    ]
+
+    assert backend.delete("Ann")
+    assert backend.list_names() == ["Zed"]
+    with pytest.raises(CharacterNotFoundError):
+        backend.delete("Ann")
+    with pytest.raises(CharacterNotFoundError):
+        backend.load("Ann")
+
+def test_sqlite_schema_version_and_wal(tmp_path):
+    """The database is in WAL mode and stamped with SCHEMA_VERSION"""
+    path = str(tmp_path / "saves.db")
+    save_storage.SQLiteSaveBackend(path, fsync=False).close()
+
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == save_storage.SCHEMA_VERSION
+
+    # A database written by a newer version is refused, not rewritten
+    connection.execute(f"PRAGMA user_version={save_storage.SCHEMA_VERSION + 1}")
+    connection.close()
+    with pytest.raises(SaveFileCorruptedError, match="schema version"):
+        save_storage.SQLiteSaveBackend(path, fsync=False)
+
+def test_sqlite_rejects_a_file_that_is_not_a_database(tmp_path):
+    """Opening something that is not SQLite raises SaveFileCorruptedError"""
+    path = str(tmp_path / "saves.db")
+    with open(path, "wb") as f:
+        f.write(b"NAME: not a database\n" * 100)
+    with pytest.raises(SaveFileCorruptedError):
+        save_storage.SQLiteSaveBackend(path, fsync=False)
+
+# ============================================================================
+# MIGRATION TESTS
+# ============================================================================
+
+def test_migrate_text_to_sqlite_and_back(tmp_path):
+    """Saves migrated to SQLite and back are byte-identical"""
+    text_dir = str(tmp_path / "text")
+    copy_dir = str(tmp_path / "copy")
+    characters = [make_character(f"Hero{i}", "Mage", gold=i * 10) for i in range(7)]
+    characters[3]["inventory"] = []
+    characters[4]["active_quests"].clear()
+    character_manager.save_characters(characters, text_dir, fsync=False)
+
+    text = save_storage.TextSaveBackend(text_dir, fsync=False)
+    database = save_storage.SQLiteSaveBackend(str(tmp_path / "saves.db"), fsync=False)
+    copy = save_storage.TextSaveBackend(copy_dir, fsync=False)
+    try:
+        assert save_storage.migrate(text, database, batch_size=3) == (7, [])
+        assert save_storage.migrate(database, copy, batch_size=3) == (7, [])
+    finally:
+        database.close()
+
+    assert read_save_files(copy_dir) == read_save_files(text_dir)
+
+def test_migrate_skips_unreadable_saves(tmp_path):
+    """A corrupt text save is reported and the rest are still copied"""
+    text_dir = str(tmp_path / "text")
+    character_manager.save_characters([make_character("Good"), make_character("Bad")],
+                                      text_dir, fsync=False)
+    with open(os.path.join(text_dir, "Bad_save.txt"), "w", encoding="utf-8") as f:
+        f.write("NAME: Bad\nLEVEL: lots\n")
+
+    database = save_storage.SQLiteSaveBackend(str(tmp_path / "saves.db"), fsync=False)
+    try:
+        migrated, skipped = save_storage.migrate(save_storage.TextSaveBackend(text_dir), database)
+        assert migrated == 1
+        assert [name for name, error in skipped] == ["Bad"]
+        assert database.list_names() == ["Good"]
+    finally:
+        database.close()
+
+# ============================================================================
+# COMMAND LINE TESTS
+# ============================================================================
+
+def test_main_migrates(tmp_path, capsys):
+    """A clean migration exits 0, one with skipped saves exits 1"""
+    text_dir = str(tmp_path / "text")
+    database = str(tmp_path / "saves.db")
+    character_manager.save_characters([make_character("Cli")], text_dir, fsync=False)
+
+    assert save_storage.main(["--from", f"text:{text_dir}", "--to", f"sqlite:{database}"]) == 0
+    assert "Migrated 1 character(s)" in capsys.readouterr().out
+
+    with open(os.path.join(text_dir, "Cli_save.txt"), "w", encoding="utf-8") as f:
+        f.write("garbage")
+    assert save_storage.main(["--from", f"text:{text_dir}", "--to", f"sqlite:{database}"]) == 1
+    assert "Skipped Cli" in capsys.readouterr().out
+
+@pytest.mark.parametrize("source", ["ftp:somewhere", "text:{missing}", "sqlite:{missing}.db",
+                                    "sqlite:{not_db}"])
+def test_main_bad_source(tmp_path, capsys, source):
+    """An unknown, missing or unreadable source exits 2 without creating anything"""
+    not_db = tmp_path / "not_a.db"
+    not_db.write_bytes(b"x" * 4096)
+    spec = source.format(missing=tmp_path / "missing", not_db=not_db)
+    database = str(tmp_path / "out.db")
+
+    assert save_storage.main(["--from", spec, "--to", f"sqlite:{database}"]) == 2
+    assert "Cannot read" in capsys.readouterr().err
+    assert not os.path.exists(database)
+    assert not os.path.exists(tmp_path / "missing")
+    assert not os.path.exists(str(tmp_path / "missing") + ".db")